@@ -1,23 +1,81 @@
 # backtest/data_loader.py
+import os
+import numpy as np
 import pandas as pd
+from storage.candle_store import CandleStore, select_range
+from storage.csv_sidecar import load_csv_columns, parse_csv
+from storage.timeframes import resample_frame, timeframe_ms
 from utils.logger import logger
 
+REQUIRED_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
 class DataLoader:
-    def __init__(self, file_path, start_date, end_date):
+    def __init__(self, file_path, start_date, end_date, symbol='BTCUSDT', timeframe='1m', use_sidecar=True,
+                 memmap=False):
+        """
+        Args:
+            file_path (str): CSV file, or a CandleStore folder (see storage/convert_csv.py).
+            start_date (str): First bar to load.
+            end_date (str): Last bar to load (inclusive).
+            symbol (str): Symbol to read when file_path is a CandleStore.
+            timeframe (str): Bar size: 1m, 5m, 15m, 1h, 4h or 1d. A CandleStore serves its
+                pre-aggregated rollups; a CSV is aggregated after loading.
+            use_sidecar (bool): Cache the parsed CSV in a binary sidecar next to it (see storage/csv_sidecar.py).
+            memmap (bool): Back the OHLCV columns with read-only memory-mapped files (a store snapshot or
+                the CSV sidecar) instead of private copies; concurrent backtests then share one page-cached copy.
+        """
+        timeframe_ms(timeframe)
         self.file_path = file_path
         self.start_date = start_date
         self.end_date = end_date
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.use_sidecar = use_sidecar
+        self.memmap = memmap
     
     def load_data(self):
-        logger.info("Loading data from CSV file...")
-        df = pd.read_csv(self.file_path, parse_dates=['timestamp'], index_col='timestamp')
-        df = df.loc[self.start_date:self.end_date].copy()
-        df.rename(columns={'price': 'close'}, inplace=True)
+        if os.path.isdir(self.file_path):
+            df = self._load_store()
+        else:
+            df = self._load_csv()
         logger.info(f"Data loaded successfully with {len(df)} rows.")
         
-        required_columns = {'close', 'open', 'high', 'low', 'volume'}
+        required_columns = set(REQUIRED_COLUMNS)
         if not required_columns.issubset(df.columns):
             logger.error(f"Missing required columns: {required_columns - set(df.columns)}")
             raise ValueError("Missing required columns.")
         
         return df
+
+    def _load_csv(self):
+        """Parse the CSV with a typed schema (or reuse its sidecar) and binary-search the date range."""
+        logger.info("Loading data from CSV file...")
+        arrays = load_csv_columns(self.file_path) if self.use_sidecar or self.memmap else parse_csv(self.file_path)
+        arrays = select_range(arrays, self.start_date, self.end_date)
+        if self.timeframe != '1m':
+            return resample_frame(_to_frame(arrays, copy=True), self.timeframe)
+        return _to_frame(arrays, copy=not self.memmap)
+
+    def _load_store(self):
+        """Read only the day partitions overlapping the date range and only the required columns."""
+        logger.info(f"Loading {self.symbol} {self.timeframe} data from candle store {self.file_path}...")
+        store = CandleStore(self.file_path)
+        if self.memmap:
+            arrays = select_range(store.snapshot(self.symbol, self.timeframe), self.start_date, self.end_date)
+            return _to_frame({column: arrays[column] for column in ['timestamp', *REQUIRED_COLUMNS]}, copy=False)
+        return store.read_frame(self.symbol, self.start_date, self.end_date, columns=REQUIRED_COLUMNS, timeframe=self.timeframe)
+
+
+def _to_frame(arrays, copy):
+    """
+    DataFrame indexed by UTC timestamp from store-style column arrays.
+
+    With copy=False the columns stay views of the given arrays (e.g. read-only memmaps);
+    only the index is materialised.
+    """
+    index = pd.to_datetime(arrays['timestamp'], unit='ms', utc=True).rename('timestamp')
+    columns = {column: values for column, values in arrays.items() if column != 'timestamp'}
+    if copy:
+        columns = {column: np.array(values) for column, values in columns.items()}
+    return pd.DataFrame(columns, index=index, copy=False)
@@ -1,8 +1,367 @@
 # backtest/performance.py
+import numpy as np
+import pandas as pd
+
+from strategies.actions import ACTION_GO_LONG, ACTION_GO_SHORT
+from strategies.trade_ledger import TRADE_DTYPE
 from utils.logger import logger
 
+YEAR = pd.Timedelta(days=365)  # Crypto trades every day of the year
+BARS_PER_YEAR_1M = 365 * 24 * 60
+
+# Columns of curve_metrics, in order
+CURVE_METRICS = ['final_equity', 'total_return', 'annual_return', 'annual_volatility', 'sharpe_ratio',
+                 'sortino_ratio', 'max_drawdown', 'max_drawdown_bars', 'calmar_ratio']
+
+
+def bars_per_year(index):
+    """Number of bars in a year at the average bar spacing of a DatetimeIndex."""
+    if len(index) < 2:
+        return BARS_PER_YEAR_1M
+    spacing = (index[-1] - index[0]) / (len(index) - 1)
+    return YEAR / spacing if spacing > pd.Timedelta(0) else BARS_PER_YEAR_1M
+
+
+def equity_curve(close, trades, initial_capital, trade_fee=0.001):
+    """
+    Mark-to-market portfolio value and position of every bar, built from the trade ledger.
+
+    Between two trades the portfolio is linear in the price: cash + assets * entry while
+    flat or at the entry bar, plus the open position's profit net of fees
+    ((price - entry) * assets * (1 - 2 * trade_fee), sign flipped for shorts) exactly as the
+    strategy realizes it on close. The coefficients are computed per trade and spread over the
+    bars with one searchsorted, so the cost is O(bars) with no Python loop.
+
+    Args:
+        close (np.ndarray): Close price of every bar.
+        trades (np.ndarray): TRADE_DTYPE records (TradeLedger.records) in execution order.
+        initial_capital (float): Cash before the first trade.
+        trade_fee (float): Trading fee percentage.
+
+    Returns:
+        tuple: (equity, position) arrays with one value per bar (position 0, 1 or -1).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    trades = np.asarray(trades, dtype=TRADE_DTYPE)
+    action, price, assets = trades['action'], trades['price'], trades['assets']
+
+    side = np.where(action == ACTION_GO_LONG, 1, np.where(action == ACTION_GO_SHORT, -1, 0)).astype(np.int8)
+    is_entry = side != 0
+    # Entry price of the position each trade opens or closes (the latest entry at or before it)
+    last_entry = np.maximum.accumulate(np.where(is_entry, np.arange(len(trades)), -1))
+    entry = np.where(last_entry >= 0, price[np.maximum(last_entry, 0)], np.nan)
+    cash = np.where(is_entry, 0.0, entry * assets + trades['pnl'])
+    held = np.where(is_entry, assets, 0.0)
+
+    # Equity after trade k is intercept[k] + slope[k] * price; index 0 is the state before any trade
+    slope = held * side * (1 - 2 * trade_fee)
+    intercept = cash + held * price - slope * price
+    slope = np.concatenate([[0.0], slope])
+    intercept = np.concatenate([[float(initial_capital)], intercept])
+    position = np.concatenate([[0], side]).astype(np.int8)
+
+    after = np.searchsorted(trades['bar'], np.arange(len(close)), side='right')
+    return intercept[after] + slope[after] * close, position[after]
+
+
+def drawdowns(equity):
+    """
+    Drawdown of every bar from the running peak of the equity curve.
+
+    Returns:
+        tuple: (drawdown, max_drawdown, max_drawdown_bars), drawdown as a fraction (<= 0) and
+            max_drawdown_bars the longest stretch of bars spent below a previous peak.
+    """
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(peak > 0, equity / peak - 1, 0.0)
+    underwater = np.concatenate([[0], (drawdown < 0).view(np.int8), [0]])
+    edges = np.flatnonzero(np.diff(underwater))
+    longest = int((edges[1::2] - edges[::2]).max()) if len(edges) else 0
+    return drawdown, float(drawdown.min()) if len(drawdown) else 0.0, longest
+
+
+def rolling_volatility(returns, window, periods_per_year):
+    """
+    Annualized standard deviation of the last `window` returns at every bar (NaN before the first full window).
+
+    Uses running sums of the returns and their squares, O(n) for any window.
+    """
+    volatility = np.full(len(returns), np.nan)
+    if window < 2 or len(returns) < window:
+        return volatility
+    sums = np.concatenate([[0.0], np.cumsum(returns)])
+    squares = np.concatenate([[0.0], np.cumsum(returns * returns)])
+    mean = (sums[window:] - sums[:-window]) / window
+    variance = (squares[window:] - squares[:-window]) / window - mean * mean
+    volatility[window - 1:] = np.sqrt(np.maximum(variance, 0.0) * window / (window - 1) * periods_per_year)
+    return volatility
+
+
+def curve_metrics(equity, initial_capital=None, periods_per_year=BARS_PER_YEAR_1M, risk_free_rate=0.0):
+    """
+    Return and risk metrics of every row of a (curves x bars) equity matrix in one vectorized pass.
+
+    Args:
+        equity (np.ndarray): 2-D equity curves, one row per backtest, sampled at a fixed bar spacing.
+        initial_capital (float or np.ndarray, optional): Starting capital per row, defaults to the
+            first column.
+        periods_per_year (float): Samples per year (bars per year divided by the sampling interval).
+        risk_free_rate (float): Annual risk-free rate subtracted by the Sharpe and Sortino ratios.
+
+    Returns:
+        dict: One 1-D array per CURVE_METRICS name (max_drawdown_bars counts samples).
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    n_curves, n_samples = equity.shape
+    if initial_capital is None:
+        initial_capital = equity[:, 0] if n_samples else np.full(n_curves, np.nan)
+    initial_capital = np.broadcast_to(np.asarray(initial_capital, dtype=np.float64), (n_curves,))
+    final_equity = equity[:, -1] if n_samples else initial_capital
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        returns = equity[:, 1:] / equity[:, :-1] - 1
+        np.nan_to_num(returns, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        excess = returns - risk_free_rate / periods_per_year
+        if returns.shape[1]:
+            deviation = returns.std(axis=1)
+            downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2, axis=1))
+            mean_excess = excess.mean(axis=1)
+        else:
+            deviation = downside = mean_excess = np.zeros(n_curves)
+        del returns, excess
+
+        peak = np.maximum.accumulate(equity, axis=1)
+        drawdown = np.divide(equity, peak, out=np.ones_like(equity), where=peak > 0)
+        drawdown -= 1
+        del peak
+        max_drawdown = drawdown.min(axis=1) if n_samples else np.zeros(n_curves)
+        # Samples since the last one at a peak; its maximum is the longest stretch underwater
+        samples = np.arange(n_samples)
+        last_peak = np.maximum.accumulate(np.where(drawdown < 0, 0, samples), axis=1)
+        max_drawdown_bars = (samples - last_peak).max(axis=1) if n_samples else np.zeros(n_curves, dtype=np.int64)
+        del drawdown, last_peak
+
+        scale = np.sqrt(periods_per_year)
+        total_return = final_equity / initial_capital - 1
+        years = max(n_samples - 1, 0) / periods_per_year
+        annual_return = np.full(n_curves, np.nan)
+        if years > 0:
+            growing = total_return > -1
+            annual_return[growing] = (1 + total_return[growing]) ** (1 / years) - 1
+        return {
+            'final_equity': final_equity.copy(),
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'annual_volatility': deviation * scale,
+            'sharpe_ratio': np.where(deviation > 0, mean_excess / deviation * scale, np.nan),
+            'sortino_ratio': np.where(downside > 0, mean_excess / downside * scale, np.nan),
+            'max_drawdown': max_drawdown,
+            'max_drawdown_bars': max_drawdown_bars.astype(np.int64),
+            'calmar_ratio': np.where(max_drawdown < 0, annual_return / -max_drawdown, np.nan),
+        }
+
+
+def trade_statistics(trades):
+    """
+    Win rate, profit factor and holding time of the closed trades of a ledger.
+
+    Returns:
+        dict: Trade statistics (NaN where there are no closed trades).
+    """
+    trades = np.asarray(trades, dtype=TRADE_DTYPE)
+    action = trades['action']
+    is_entry = (action == ACTION_GO_LONG) | (action == ACTION_GO_SHORT)
+    last_entry = np.maximum.accumulate(np.where(is_entry, np.arange(len(trades)), -1))
+    closed = ~is_entry & (last_entry >= 0)
+    pnl = trades['pnl'][closed]
+    holding = trades['bar'][closed] - trades['bar'][last_entry[closed]]
+
+    wins, losses = pnl[pnl > 0], pnl[pnl <= 0]
+    gross_profit, gross_loss = float(wins.sum()), float(-losses.sum())
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = float('inf') if gross_profit > 0 else float('nan')
+    return {
+        'trades': int(len(trades)),
+        'closed_trades': int(len(pnl)),
+        'win_rate': len(wins) / len(pnl) if len(pnl) else float('nan'),
+        'average_win': float(wins.mean()) if len(wins) else float('nan'),
+        'average_loss': float(losses.mean()) if len(losses) else float('nan'),
+        'expectancy': float(pnl.mean()) if len(pnl) else float('nan'),
+        'best_trade': float(pnl.max()) if len(pnl) else float('nan'),
+        'worst_trade': float(pnl.min()) if len(pnl) else float('nan'),
+        'profit_factor': profit_factor,
+        'average_holding_bars': float(holding.mean()) if len(holding) else float('nan'),
+        'total_fees': float(trades['fee'].sum()),
+    }
+
+
+class PerformanceResult:
+    def __init__(self, equity, position, drawdown, rolling_volatility, metrics):
+        """
+        Equity curve and risk metrics of one backtest.
+
+        Args:
+            equity (np.ndarray): Mark-to-market portfolio value per bar.
+            position (np.ndarray): Position per bar (0: No, 1: Long, -1: Short).
+            drawdown (np.ndarray): Drawdown per bar from the running peak (fraction, <= 0).
+            rolling_volatility (np.ndarray): Annualized rolling volatility of the bar returns.
+            metrics (dict): Scalar metrics (returns, risk ratios, exposure, trade statistics).
+        """
+        self.equity = equity
+        self.position = position
+        self.drawdown = drawdown
+        self.rolling_volatility = rolling_volatility
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        # Scalar metrics read as attributes, e.g. result.sharpe_ratio
+        metrics = self.__dict__.get('metrics', {})
+        if name in metrics:
+            return metrics[name]
+        raise AttributeError(name)
+
+    def to_dict(self):
+        """Scalar metrics as a JSON-serializable dict."""
+        return dict(self.metrics)
+
+    def to_frame(self, index=None):
+        """Per-bar series (equity, position, drawdown, rolling_volatility) as a DataFrame."""
+        return pd.DataFrame({
+            'equity': self.equity,
+            'position': self.position,
+            'drawdown': self.drawdown,
+            'rolling_volatility': self.rolling_volatility,
+        }, index=index)
+
 
 class PerformanceMetrics:
+    @staticmethod
+    def calculate_risk_metrics(close, trades, initial_capital, trade_fee=0.001, periods_per_year=BARS_PER_YEAR_1M,
+                               volatility_window=1440, risk_free_rate=0.0):
+        """
+        Build the equity curve of a backtest and compute its risk metrics in a few vectorized passes.
+
+        Args:
+            close (np.ndarray): Close price of every bar.
+            trades (np.ndarray): TRADE_DTYPE records (TradeLedger.records).
+            initial_capital (float): Starting capital.
+            trade_fee (float): Trading fee percentage.
+            periods_per_year (float): Bars per year, used to annualize (see bars_per_year).
+            volatility_window (int): Bars per rolling volatility window.
+            risk_free_rate (float): Annual risk-free rate subtracted by the Sharpe and Sortino ratios.
+
+        Returns:
+            PerformanceResult: Per-bar series and scalar metrics.
+        """
+        equity, position = equity_curve(close, trades, initial_capital, trade_fee)
+        drawdown = drawdowns(equity)[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(equity) / equity[:-1]
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        volatility = np.concatenate([[np.nan], rolling_volatility(returns, volatility_window, periods_per_year)])
+
+        metrics = {'bars': int(len(equity))}
+        for name, values in curve_metrics(equity, initial_capital, periods_per_year, risk_free_rate).items():
+            metrics[name] = values[0].item()
+        metrics.update({
+            'benchmark_return': float(close[-1] / close[0] - 1) if len(close) else float('nan'),
+            'exposure': float(np.count_nonzero(position) / len(position)) if len(position) else 0.0,
+            'long_exposure': float(np.count_nonzero(position == 1) / len(position)) if len(position) else 0.0,
+            'short_exposure': float(np.count_nonzero(position == -1) / len(position)) if len(position) else 0.0,
+        })
+        metrics.update(trade_statistics(trades))
+        return PerformanceResult(equity, position, drawdown, volatility, metrics)
+
+    @staticmethod
+    def log_risk_metrics(result):
+        """Log the scalar metrics of a PerformanceResult."""
+        metrics = result.metrics
+        logger.info(
+            f"📈 Total Return: {metrics['total_return']:.2%}, Annualized: {metrics['annual_return']:.2%}, "
+            f"Benchmark: {metrics['benchmark_return']:.2%}"
+        )
+        logger.info(
+            f"📉 Max Drawdown: {metrics['max_drawdown']:.2%} (longest {metrics['max_drawdown_bars']} bars underwater), "
+            f"Annual Volatility: {metrics['annual_volatility']:.2%}"
+        )
+        logger.info(
+            f"⚖️ Sharpe: {metrics['sharpe_ratio']:.2f}, Sortino: {metrics['sortino_ratio']:.2f}, "
+            f"Calmar: {metrics['calmar_ratio']:.2f}"
+        )
+        logger.info(
+            f"🎯 Closed Trades: {metrics['closed_trades']}, Win Rate: {metrics['win_rate']:.2%}, "
+            f"Profit Factor: {metrics['profit_factor']:.2f}, Avg Holding: {metrics['average_holding_bars']:.0f} bars, "
+            f"Exposure: {metrics['exposure']:.2%}"
+        )
+
+    @staticmethod
+    def calculate_batch_metrics(equity, close=None, initial_capital=None, periods_per_year=BARS_PER_YEAR_1M,
+                                risk_free_rate=0.0, chunk_bytes=1024 ** 2):
+        """
+        Return, drawdown and risk metrics of many backtests at once, without logging per backtest.
+
+        The equity matrix is processed in chunks of rows so the temporary (rows x bars) arrays
+        stay within chunk_bytes, whatever the number of backtests (small chunks also stay in the CPU cache).
+
+        Args:
+            equity (np.ndarray): (backtests x bars) equity curves sampled at the same bars, e.g.
+                from run_batch(equity_every=...) or stacked PerformanceResult.equity arrays.
+            close (np.ndarray, optional): Close prices at those bars for the buy-and-hold benchmark.
+            initial_capital (float or np.ndarray, optional): Starting capital, defaults to the first column.
+            periods_per_year (float): Samples per year (bars per year divided by the sampling interval).
+            risk_free_rate (float): Annual risk-free rate of the Sharpe and Sortino ratios.
+            chunk_bytes (int): Memory budget of the temporary arrays.
+
+        Returns:
+            pd.DataFrame: One row of metrics per backtest, in the order of the equity rows.
+        """
+        equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+        n_curves, n_samples = equity.shape
+        if initial_capital is not None:
+            initial_capital = np.broadcast_to(np.asarray(initial_capital, dtype=np.float64), (n_curves,))
+        rows = max(1, int(chunk_bytes // (max(n_samples, 1) * 8 * 4)))  # About four temporaries per chunk
+
+        chunks = []
+        for start in range(0, n_curves, rows):
+            capital = None if initial_capital is None else initial_capital[start:start + rows]
+            chunks.append(curve_metrics(equity[start:start + rows], capital, periods_per_year, risk_free_rate))
+        metrics = pd.DataFrame({
+            name: np.concatenate([chunk[name] for chunk in chunks]) if chunks else np.empty(0)
+            for name in CURVE_METRICS
+        })
+        if close is not None and len(close):
+            metrics['benchmark_return'] = close[-1] / close[0] - 1
+            metrics['excess_return'] = metrics['total_return'] - metrics['benchmark_return']
+            metrics['outperformed'] = metrics['excess_return'] > 0
+        return metrics
+
+    @staticmethod
+    def calculate_virtual_balance(final_price, balance, current_position, entry_price, assets, trade_fee=0.001):
+        """
+        Mark an open position to the final price.
+
+        Uses the valuation of equity_curve (the position closed at final_price net of both
+        fees), so the virtual balance equals the last point of the equity curve.
+
+        Args:
+            final_price (float): Last close price.
+            balance (float): Realized cash balance.
+            current_position (int): Open position (0: No, 1: Long, -1: Short).
+            entry_price (float): Entry price of the open position, if any.
+            assets (float): Amount of assets held in the open position.
+            trade_fee (float): Trading fee percentage.
+
+        Returns:
+            tuple: (virtual_balance, unrealized_value), unrealized_value being the open position's P&L.
+        """
+        if current_position in (1, -1) and assets > 0:  # Open Long or Short Position
+            unrealized_value = current_position * (final_price - entry_price) * assets * (1 - 2 * trade_fee)
+            return balance + entry_price * assets + unrealized_value, unrealized_value
+        return balance, 0
+
     @staticmethod
     def calculate_performance(
         df, 
@@ -15,7 +374,11 @@ class PerformanceMetrics:
         long_profit, 
         long_loss, 
         short_profit, 
-        short_loss
+        short_loss,
+        trades=None,
+        trade_fee=0.001,
+        volatility_window=1440,
+        risk_free_rate=0.0
     ):
         """
         Calculate and display the strategy's performance metrics.
@@ -32,6 +395,15 @@ class PerformanceMetrics:
             long_loss (float): Total loss from long positions.
             short_profit (float): Total profit from short positions.
             short_loss (float): Total loss from short positions.
+            trades (np.ndarray, optional): TRADE_DTYPE records (TradeLedger.records) for the equity
+                curve and risk metrics; without them only the totals above are reported.
+            trade_fee (float): Trading fee percentage.
+            volatility_window (int): Bars per rolling volatility window.
+            risk_free_rate (float): Annual risk-free rate of the Sharpe and Sortino ratios.
+
+        Returns:
+            PerformanceResult: Equity curve and risk metrics, None when trades is not given
+                or there is no data.
         """
         if df.empty or 'close' not in df.columns:
             logger.warning("⚠️ DataFrame is empty or missing 'close' column. Skipping performance calculation.")
@@ -48,15 +420,13 @@ class PerformanceMetrics:
         buy_and_hold_return = final_price / initial_price
         benchmark_final = initial_capital * buy_and_hold_return
         
-        # Initialize virtual_balance to balance
-        virtual_balance = balance
-        unrealized_value = 0
-        
         # 🧮 Unrealized Value Calculation
+        virtual_balance, unrealized_value = PerformanceMetrics.calculate_virtual_balance(
+            final_price, balance, current_position, entry_price, assets, trade_fee
+        )
+
         if current_position == 1 and assets > 0:  # Open Long Position
-            unrealized_value = assets * final_price * (1 - 2 * 0.001)  # Adjust for trading fees
             unrealized_percentage = ((final_price - entry_price) / entry_price) * 100
-            virtual_balance = balance + unrealized_value
             logger.info(
                 f"🟢 Open Long Position Detected | Entry Price: ${entry_price:.2f}, "
                 f"Current Price: ${final_price:.2f}, Unrealized P&L: ${unrealized_value:.2f} "
@@ -64,9 +434,7 @@ class PerformanceMetrics:
             )
 
         elif current_position == -1 and assets > 0:  # Open Short Position
-            unrealized_value = (entry_price - final_price) * assets * (1 - 2 * 0.001)  # Adjust for trading fees
             margin_value = entry_price * assets  # Margin used for the short position
-            virtual_balance = margin_value + unrealized_value
             logger.info(
                 f"🔻 Open Short Position Detected | Entry Price: ${entry_price:.2f}, "
                 f"Current Price: ${final_price:.2f}, Unrealized P&L: ${unrealized_value:.2f}, "
@@ -74,7 +442,6 @@ class PerformanceMetrics:
             )
         
         else:
-            virtual_balance = balance  # Default to balance if no open position
             logger.info("⚪ No Open Position Detected | Virtual Balance equals realized balance.")
 
         # 📝 Comparison with Benchmark
@@ -105,4 +472,14 @@ class PerformanceMetrics:
         # 🏆 Overall Performance
         total_net_result = net_long_result + net_short_result
         logger.info(f"📈 Total Net Result (Long + Short): ${total_net_result:.2f}")
+
+        # 📉 Equity Curve and Risk Metrics
+        result = None
+        if trades is not None:
+            result = PerformanceMetrics.calculate_risk_metrics(
+                df['close'].to_numpy(dtype=np.float64), trades, initial_capital, trade_fee,
+                bars_per_year(df.index), volatility_window, risk_free_rate
+            )
+            PerformanceMetrics.log_risk_metrics(result)
         logger.info("✅ Performance metrics calculation completed successfully.")
+        return result
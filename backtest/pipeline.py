@@ -0,0 +1,149 @@
+# backtest/pipeline.py
+import os
+
+import numpy as np
+
+from backtest.data_loader import DataLoader
+from utils.logger import logger
+from utils.profiling import Profiler
+
+
+def strategy_config(config):
+    """
+    GenericStrategy parameters from a configuration dict (the names of config.py).
+
+    Returns:
+        dict: Keyword arguments of GenericStrategy, without data and indicator_cache.
+    """
+    return {
+        'initial_capital': config['INITIAL_CAPITAL'],
+        'trade_fee': config['TRADE_FEE'],
+        'profit_target': config['PROFIT_TARGET'],
+        'stop_loss': config['STOP_LOSS'],
+        'enable_stop_loss': config['ENABLE_STOP_LOSS'],
+        'short_window': config['SHORT_WINDOW'],
+        'long_window': config['LONG_WINDOW'],
+        'indicator_type': config['INDICATOR_TYPE'],
+        'enable_close_long_on_downtrend': config['ENABLE_CLOSE_LONG_ON_DOWNTREND'],
+        'enable_close_short_on_uptrend': config['ENABLE_CLOSE_SHORT_ON_UPTREND'],
+        'enable_profit_target': config['ENABLE_PROFIT_TARGET'],
+        'enable_longing': config['ENABLE_LONGING'],
+        'enable_shorting': config['ENABLE_SHORTING'],
+        'engine': config['ENGINE'],
+    }
+
+
+def load_data(config):
+    """Load the configured market data (DATA_PATH, SYMBOL, TIMEFRAME, START_DATE, END_DATE)."""
+    data_loader = DataLoader(
+        config['DATA_PATH'], config['START_DATE'], config['END_DATE'], symbol=config['SYMBOL'],
+        timeframe=config['TIMEFRAME'], memmap=config['MEMMAP_DATA']
+    )
+    return data_loader.load_data()
+
+
+def render_plots(df, trades, config, profiler=None):
+    """
+    Save the static and the interactive plot of a backtest.
+
+    matplotlib and plotly are imported here, so runs without plots never load them.
+
+    Args:
+        df (pd.DataFrame): Market data with FAST_IND and SLOW_IND.
+        trades (np.ndarray): Trade ledger records.
+        config (dict): Configuration (PLOT_DOWNSAMPLE, INTERACTIVE_PLOT_*).
+        profiler (Profiler, optional): Profiler that times both plots.
+    """
+    from visualization.interactive_plot import interactive_plot_results
+    from visualization.plot_results import plot_results
+
+    profiler = profiler or Profiler(enabled=False)
+    with profiler.span('plot', rows=len(df)):
+        plot_results(df, trades, downsample=config['PLOT_DOWNSAMPLE'])
+    with profiler.span('interactive_plot', rows=len(df)):
+        interactive_plot_results(df, trades, downsample=config['PLOT_DOWNSAMPLE'],
+                                 resolution=config['INTERACTIVE_PLOT_RESOLUTION'],
+                                 detail=config['INTERACTIVE_PLOT_DETAIL'])
+
+
+def run_backtest(config, plots=True, trades_file=None):
+    """
+    Load data, run the GenericStrategy, report its performance and optionally plot it.
+
+    Args:
+        config (dict): Configuration with the names of config.py.
+        plots (bool): Save the static and interactive plots.
+        trades_file (str, optional): Save the trade ledger records here (.npy) for a later plot command.
+
+    Returns:
+        tuple: (strategy, PerformanceResult)
+    """
+    logger.info("🚀 Starting the trading bot...")
+    profiler = Profiler(config['PROFILE_ENABLED'], config['PROFILE_CPROFILE_STAGES'],
+                        config['PROFILE_TRACEMALLOC'], config['PROFILE_OUTPUT_DIR'])
+
+    # 📊 Load Data
+    with profiler.span('load') as span:
+        df = load_data(config)
+        span.rows = len(df)
+
+    # The strategy modules load numba, imported once the data is in
+    from backtest.performance import PerformanceMetrics
+    from strategies.generic_strategy import GenericStrategy
+    from strategies.indicator_cache import IndicatorCache
+
+    # 🗄️ Indicator Cache
+    indicator_cache = None
+    if config['ENABLE_INDICATOR_CACHE']:
+        indicator_cache = IndicatorCache(config['INDICATOR_CACHE_DIR'], config['INDICATOR_CACHE_MEMORY_MB'] * 1024 ** 2)
+
+    # 🛠️ Run Generic Strategy (indicators are calculated when it is created)
+    with profiler.span('indicators', rows=len(df)):
+        strategy = GenericStrategy(data=df, indicator_cache=indicator_cache, **strategy_config(config))
+
+    with profiler.span('run', rows=len(df)):
+        strategy.run()
+    if indicator_cache is not None:
+        logger.info(f"🗄️ Indicator cache stats: {indicator_cache.stats()}")
+
+    # 📈 Performance Metrics
+    with profiler.span('performance', rows=len(df)):
+        performance = PerformanceMetrics.calculate_performance(
+            df=df,
+            initial_capital=config['INITIAL_CAPITAL'],
+            balance=strategy.balance,
+            current_position=strategy.current_position,
+            entry_price=strategy.entry_price,
+            assets=strategy.assets,
+            total_fees=strategy.total_fees,
+            long_profit=strategy.long_profit,
+            long_loss=strategy.long_loss,
+            short_profit=strategy.short_profit,
+            short_loss=strategy.short_loss,
+            trades=strategy.ledger.records,
+            trade_fee=config['TRADE_FEE'],
+            volatility_window=config['VOLATILITY_WINDOW'],
+            risk_free_rate=config['RISK_FREE_RATE']
+        )
+
+    if trades_file:
+        folder = os.path.dirname(trades_file)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        np.save(trades_file, strategy.ledger.records)
+        logger.info(f"💾 {len(strategy.ledger)} trades saved as {trades_file}")
+
+    # 📊 Plot Results
+    if plots:
+        render_plots(df, strategy.ledger.records, config, profiler)
+
+    if config['PROFILE_ENABLED']:
+        profiler.write_report(config['PROFILE_REPORT'], metadata={
+            'data_path': config['DATA_PATH'], 'symbol': config['SYMBOL'], 'timeframe': config['TIMEFRAME'],
+            'start_date': config['START_DATE'], 'end_date': config['END_DATE'], 'engine': config['ENGINE'],
+            'indicator_type': config['INDICATOR_TYPE'], 'short_window': config['SHORT_WINDOW'],
+            'long_window': config['LONG_WINDOW'], 'trades': len(strategy.ledger),
+            'performance': performance.to_dict() if performance is not None else None,
+        })
+    logger.info("✅ Trading bot execution completed.")
+    return strategy, performance
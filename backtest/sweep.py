@@ -0,0 +1,271 @@
+# backtest/sweep.py
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest.performance import PerformanceMetrics, bars_per_year
+from strategies.engine import run_batch
+from strategies.indicator_cache import IndicatorCache
+from strategies.indicators import calculate_indicators
+from utils.logger import logger
+
+# Close prices and indicator cache of each worker process (see _attach_shared_candles)
+_worker_shm = None
+_worker_close = None
+_worker_cache = None
+_worker_fingerprint = None
+
+EQUITY_CHUNK_BYTES = 256 * 1024 ** 2  # Sampled equity kept per worker batch
+# Risk metrics merged into the results when the equity is sampled (see ParameterSweep)
+SWEEP_METRICS = ['annual_return', 'annual_volatility', 'sharpe_ratio', 'sortino_ratio', 'max_drawdown',
+                 'max_drawdown_bars', 'calmar_ratio', 'excess_return']
+
+
+class SharedCandles:
+    """
+    Close prices copied once into a shared memory block that worker processes
+    attach to by name instead of receiving a pickled copy.
+    """
+
+    def __init__(self, close):
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        self.shape = close.shape
+        self._shm = shared_memory.SharedMemory(create=True, size=max(close.nbytes, 1))
+        self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+        self.array[:] = close
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def close(self):
+        """Release and unlink the shared memory block."""
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _attach_shared_candles(name, shape, fingerprint=None, cache_dir=None, cache_memory_bytes=0):
+    """Process pool initializer: map the shared close prices into this worker and open its indicator cache."""
+    global _worker_shm, _worker_close, _worker_cache, _worker_fingerprint
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_close = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    if fingerprint is not None:
+        _worker_cache = IndicatorCache(cache_dir, cache_memory_bytes)
+        _worker_fingerprint = fingerprint
+
+
+def _run_indicator_group(indicator_type, short_window, long_window, exit_params, base_config,
+                         equity_every=0, periods_per_year=None, risk_free_rate=0.0):
+    """
+    Worker task: calculate one indicator pair and run every exit configuration that shares it
+    in a single batched pass over the data.
+
+    Args:
+        indicator_type (str): Indicator type.
+        short_window (int): Fast indicator window.
+        long_window (int): Slow indicator window.
+        exit_params (list): (profit_target, stop_loss) tuples to run on this indicator pair.
+        base_config (dict): Remaining GenericStrategy parameters.
+        equity_every (int): Bars between equity samples for the risk metrics, 0 to skip them.
+        periods_per_year (float): Bars per year of the data.
+        risk_free_rate (float): Annual risk-free rate of the Sharpe and Sortino ratios.
+
+    Returns:
+        tuple: (results, cache_hits, cache_misses) with one result dict per exit configuration.
+    """
+    close = pd.Series(_worker_close, copy=False)
+    hits, misses = (_worker_cache.hits, _worker_cache.misses) if _worker_cache else (0, 0)
+    fast, slow = calculate_indicators(close, indicator_type, short_window, long_window,
+                                      cache=_worker_cache, fingerprint=_worker_fingerprint)
+    if _worker_cache:
+        hits, misses = _worker_cache.hits - hits, _worker_cache.misses - misses
+    final_price = _worker_close[-1]
+    initial_capital = base_config['initial_capital']
+
+    configs = [dict(base_config, profit_target=profit_target, stop_loss=stop_loss)
+               for profit_target, stop_loss in exit_params]
+    fast, slow = fast.to_numpy(dtype=np.float64), slow.to_numpy(dtype=np.float64)
+    samples = -(-len(_worker_close) // equity_every) + 1 if equity_every > 0 else 0
+    batch = max(1, EQUITY_CHUNK_BYTES // (samples * 8)) if samples else len(configs)
+    states, trade_counts, errors, metrics = [], [], [], []
+    for start in range(0, len(configs), batch):
+        batch_states, batch_counts, batch_errors, equity = run_batch(
+            _worker_close, fast, slow, configs[start:start + batch], equity_every
+        )
+        states.extend(batch_states.tolist())
+        trade_counts.extend(batch_counts)
+        errors.extend(batch_errors)
+        if equity_every > 0:
+            batch_metrics = PerformanceMetrics.calculate_batch_metrics(
+                equity, _worker_close[[0, -1]], initial_capital, periods_per_year / equity_every, risk_free_rate
+            )
+            batch_metrics['max_drawdown_bars'] *= equity_every
+            metrics.extend(batch_metrics[SWEEP_METRICS].to_dict('records'))
+
+    results = []
+    risk_metrics = metrics or itertools.repeat({})
+    for (profit_target, stop_loss), state, trades, error, risk in zip(exit_params, states, trade_counts, errors,
+                                                                      risk_metrics):
+        (balance, current_position, entry_price, _, assets, _, _, total_fees,
+         long_profit, long_loss, short_profit, short_loss) = state
+        # Same valuation (and fee) as the sampled equity of the risk metrics, so the return matches total_return
+        virtual_balance, unrealized_value = PerformanceMetrics.calculate_virtual_balance(
+            final_price, balance, int(current_position), entry_price, assets, base_config['trade_fee']
+        )
+        result = {
+            'indicator_type': indicator_type,
+            'short_window': short_window,
+            'long_window': long_window,
+            'profit_target': profit_target,
+            'stop_loss': stop_loss,
+            'virtual_balance': virtual_balance,
+            'return_pct': (virtual_balance / initial_capital - 1) * 100,
+            'balance': balance,
+            'unrealized_value': unrealized_value,
+            'open_position': int(current_position),
+            'trades': int(trades),
+            'total_fees': total_fees,
+            'long_profit': long_profit,
+            'long_loss': long_loss,
+            'short_profit': short_profit,
+            'short_loss': short_loss,
+            'error': int(error),
+        }
+        result.update(risk)
+        results.append(result)
+    return results, hits, misses
+
+
+def parse_range(text, cast=float):
+    """
+    Parse a sweep range from the command line.
+
+    Accepts a comma separated list ("0.01,0.02,0.05") or an inclusive
+    "start:stop:step" range ("500:2000:500").
+
+    Args:
+        text (str): Range specification.
+        cast (type): int or float.
+
+    Returns:
+        list: Parsed values.
+    """
+    if ':' in text:
+        start, stop, step = (cast(part) for part in text.split(':'))
+        if step <= 0:
+            raise ValueError(f"Range step must be positive: '{text}'")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return [cast(start + i * step) if cast is int else round(start + i * step, 10) for i in range(count)]
+    return [cast(part) for part in text.split(',') if part.strip()]
+
+
+class ParameterSweep:
+    def __init__(self, data, base_config, short_windows, long_windows, profit_targets, stop_losses,
+                 indicator_types=None, processes=None, cache_dir=None, cache_memory_bytes=None,
+                 equity_every=0, rank_by='virtual_balance', risk_free_rate=0.0):
+        """
+        Grid search over GenericStrategy parameters on a process pool.
+
+        Args:
+            data (pd.DataFrame): Market data with a 'close' column.
+            base_config (dict): GenericStrategy parameters that are not swept
+                (initial_capital, trade_fee, enable_* flags, indicator_type).
+            short_windows (list): SHORT_WINDOW values.
+            long_windows (list): LONG_WINDOW values.
+            profit_targets (list): PROFIT_TARGET values.
+            stop_losses (list): STOP_LOSS values.
+            indicator_types (list, optional): Indicator types, defaults to base_config['indicator_type'].
+            processes (int, optional): Worker processes, defaults to all cores.
+            cache_dir (str, optional): On-disk indicator cache shared by the workers.
+            cache_memory_bytes (int, optional): Per-worker in-memory indicator cache budget;
+                the cache is disabled when both cache settings are None.
+            equity_every (int): Sample every configuration's equity each equity_every bars and add
+                its risk metrics (SWEEP_METRICS) to the results, 0 to skip them.
+            rank_by (str): Result column to rank by, highest first (e.g. virtual_balance, sharpe_ratio).
+            risk_free_rate (float): Annual risk-free rate of the Sharpe and Sortino ratios.
+        """
+        self.data = data
+        self.base_config = base_config
+        self.short_windows = list(short_windows)
+        self.long_windows = list(long_windows)
+        self.profit_targets = list(profit_targets)
+        self.stop_losses = list(stop_losses)
+        self.indicator_types = list(indicator_types or [base_config['indicator_type']])
+        self.processes = processes or os.cpu_count()
+        self.cache_dir = cache_dir
+        self.cache_memory_bytes = cache_memory_bytes
+        self.equity_every = equity_every
+        self.rank_by = rank_by
+        self.risk_free_rate = risk_free_rate
+        if rank_by in SWEEP_METRICS and equity_every <= 0:
+            raise ValueError(f"Ranking by '{rank_by}' needs equity sampling (equity_every > 0).")
+
+    def _indicator_groups(self):
+        """Group the grid by indicator pair so each pair is calculated once."""
+        exit_params = list(itertools.product(self.profit_targets, self.stop_losses))
+        groups = []
+        for indicator_type, short_window, long_window in itertools.product(
+                self.indicator_types, self.short_windows, self.long_windows):
+            if short_window >= long_window:
+                continue
+            groups.append((indicator_type, short_window, long_window, exit_params))
+        return groups
+
+    def run(self):
+        """
+        Run every configuration of the grid.
+
+        Returns:
+            pd.DataFrame: Results ranked by the rank_by column (best first).
+        """
+        groups = self._indicator_groups()
+        total = len(groups) * len(self.profit_targets) * len(self.stop_losses)
+        logger.info(f"🔍 Sweeping {total} configurations on {self.processes} processes...")
+
+        fingerprint = None
+        if self.cache_dir is not None or self.cache_memory_bytes is not None:
+            fingerprint = IndicatorCache.fingerprint(self.data['close'])
+
+        periods_per_year = bars_per_year(self.data.index)
+        results = []
+        cache_hits = cache_misses = 0
+        with SharedCandles(self.data['close'].to_numpy()) as candles:
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_attach_shared_candles,
+                                     initargs=(candles.name, candles.shape, fingerprint,
+                                               self.cache_dir, self.cache_memory_bytes or 0)) as pool:
+                futures = [pool.submit(_run_indicator_group, *group, self.base_config, self.equity_every,
+                                       periods_per_year, self.risk_free_rate) for group in groups]
+                for future in futures:
+                    group_results, hits, misses = future.result()
+                    results.extend(group_results)
+                    cache_hits += hits
+                    cache_misses += misses
+
+        if fingerprint is not None:
+            logger.info(f"🗄️ Indicator cache: {cache_hits} hits, {cache_misses} misses.")
+
+        invalid = sum(1 for result in results if result['error'])
+        if invalid:
+            logger.warning(f"⚠️ {invalid} configurations stopped early because no exit condition is enabled.")
+
+        ranked = pd.DataFrame(results)
+        if not ranked.empty:
+            ranked = ranked.sort_values(self.rank_by, ascending=False, kind='stable', na_position='last')
+            ranked = ranked.reset_index(drop=True)
+            ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+        if self.equity_every > 0:
+            close = self.data['close']
+            logger.info(f"📈 Buy-and-hold return over the data: {close.iloc[-1] / close.iloc[0] - 1:.2%}")
+        logger.info(f"✅ Sweep completed with {len(ranked)} results.")
+        return ranked
@@ -0,0 +1,258 @@
+# benchmarks/run_benchmarks.py
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from backtest.data_loader import DataLoader
+from backtest.performance import PerformanceMetrics
+from benchmarks.synthetic import START_DATE, REGIMES, parse_rows, parse_volatility, symbol_names, write_csv, write_store
+from strategies.generic_strategy import GenericStrategy
+from utils.logger import logger, set_trade_log_mode, setup_logging
+from utils.profiling import Profiler, git_revision
+from visualization.interactive_plot import interactive_plot_results
+from visualization.plot_results import plot_results
+
+BASELINE_FILE = './benchmarks/baseline.json'
+RESULTS_FILE = './logs/benchmark_results.json'
+LOG_FILE = './logs/benchmark.log'
+INDICATOR_TYPES = ['SMA', 'EMA', 'WMA', 'RSI', 'MACD']
+ENGINES = ['NUMBA', 'EVENT', 'PYTHON']
+
+STRATEGY_CONFIG = {
+    'initial_capital': 10,
+    'trade_fee': 0.001,
+    'profit_target': 0.05,
+    'stop_loss': 0.02,
+    'enable_stop_loss': True,
+    'short_window': 1000,
+    'long_window': 4000,
+    'indicator_type': 'EMA',
+    'enable_close_long_on_downtrend': False,
+    'enable_close_short_on_uptrend': False,
+    'enable_profit_target': True,
+    'enable_longing': True,
+    'enable_shorting': True,
+}
+
+
+def size_label(rows):
+    if rows % 1_000_000 == 0:
+        return f"{rows // 1_000_000}M"
+    if rows % 1_000 == 0:
+        return f"{rows // 1_000}K"
+    return str(rows)
+
+
+class BenchmarkSuite:
+    def __init__(self, sizes, data_dir='./data/bench', source='store', symbols=1, seed=0, volatility='normal',
+                 repeat=3, indicator_types=None, engines=None, python_max_rows=2_000_000, plot_max_rows=1_000_000):
+        """
+        Time the backtest pipeline on synthetic data of several sizes.
+
+        Stages: DataLoader.load_data, _apply_indicator per indicator type, GenericStrategy.run per
+        engine, PerformanceMetrics.calculate_performance, plot_results and interactive_plot_results.
+        Every stage runs `repeat` times and keeps its fastest run, so loads are measured warm
+        (with the CSV sidecar and the page cache built by the first run).
+
+        Args:
+            sizes (list): Rows per dataset, e.g. [1_000_000, 10_000_000].
+            data_dir (str): Folder of the generated datasets (reused while their settings match).
+            source (str): Dataset format: store (CandleStore) or csv.
+            symbols (int): Symbols per generated store; the first one is benchmarked.
+            seed (int): Seed of the synthetic generator.
+            volatility (str or float): Volatility of the synthetic generator (see benchmarks/synthetic.py).
+            repeat (int): Runs per stage.
+            indicator_types (list, optional): Indicator types to time, defaults to all.
+            engines (list, optional): Engines to time, defaults to all.
+            python_max_rows (int): Largest size the PYTHON engine is timed on.
+            plot_max_rows (int): Largest size the plots are timed on.
+        """
+        self.sizes = sizes
+        self.data_dir = data_dir
+        self.source = source
+        self.symbols = symbols
+        self.seed = seed
+        self.volatility = volatility
+        self.repeat = repeat
+        self.indicator_types = indicator_types or INDICATOR_TYPES
+        self.engines = engines or ENGINES
+        self.python_max_rows = python_max_rows
+        self.plot_max_rows = plot_max_rows
+        self.profiler = Profiler()
+        self.results = {}
+
+    def dataset(self, rows):
+        """Generate (or reuse) the dataset of one size and return its path."""
+        name = f"{size_label(rows)}_{self.source}_seed{self.seed}_{self.volatility}"
+        path = os.path.join(self.data_dir, name)
+        logger.info(f"🧪 Preparing synthetic dataset {name}...")
+        if self.source == 'csv':
+            return write_csv(f"{path}.csv", rows, seed=self.seed, volatility=self.volatility)
+        return write_store(path, rows, self.symbols, self.seed, self.volatility)
+
+    def measure(self, name, rows, function):
+        """Run function `repeat` times in a span and record the fastest run under name."""
+        best = None
+        for _ in range(self.repeat):
+            with self.profiler.span(name, rows) as span:
+                result = function()
+            if best is None or span.wall_seconds < best.wall_seconds:
+                best = span
+        self.results[name] = best.to_dict()
+        return result
+
+    def strategy(self, df, indicator_type='EMA', engine='NUMBA'):
+        return GenericStrategy(df, **dict(STRATEGY_CONFIG, indicator_type=indicator_type), engine=engine)
+
+    def run_size(self, rows):
+        label = size_label(rows)
+        path = self.dataset(rows)
+        end = pd.Timestamp(START_DATE, tz='UTC') + pd.Timedelta(minutes=rows - 1)
+        loader = DataLoader(path, START_DATE, end.isoformat(), symbol=symbol_names(self.symbols)[0])
+        df = self.measure(f"load[{self.source}]@{label}", rows, loader.load_data)
+
+        for indicator_type in self.indicator_types:
+            self.measure(f"indicators[{indicator_type}]@{label}", rows, lambda: self.strategy(df, indicator_type))
+
+        strategy = None
+        for engine in self.engines:
+            if engine == 'PYTHON' and rows > self.python_max_rows:
+                logger.info(f"⏭️ Skipping the PYTHON engine at {label} rows (python_max_rows={self.python_max_rows})")
+                continue
+            strategies = [self.strategy(df, engine=engine) for _ in range(self.repeat)]
+            self.measure(f"run[{engine}]@{label}", rows, lambda: strategies.pop().run())
+            strategy = self.strategy(df, engine=engine)
+            strategy.run()
+
+        if strategy is None:
+            return
+        self.measure(f"performance@{label}", rows, lambda: PerformanceMetrics.calculate_performance(
+            df, strategy.initial_capital, strategy.balance, strategy.current_position, strategy.entry_price,
+            strategy.assets, strategy.total_fees, strategy.long_profit, strategy.long_loss,
+            strategy.short_profit, strategy.short_loss, strategy.ledger.records, strategy.trade_fee
+        ))
+
+        if rows > self.plot_max_rows:
+            logger.info(f"⏭️ Skipping the plots at {label} rows (plot_max_rows={self.plot_max_rows})")
+            return
+        with tempfile.TemporaryDirectory() as folder:
+            self.measure(f"plot@{label}", rows, lambda: plot_results(
+                df, strategy.ledger.records, os.path.join(folder, 'plot.png')))
+            self.measure(f"interactive_plot@{label}", rows, lambda: interactive_plot_results(
+                df, strategy.ledger.records, os.path.join(folder, 'plot.html')))
+
+    def warm_up(self):
+        """Compile the numba kernels on a small frame so the first timed run does not include it."""
+        index = pd.date_range(START_DATE, periods=5_000, freq='1min', tz='UTC')
+        close = 100 + np.cumsum(np.random.default_rng(0).standard_normal(len(index)))
+        df = pd.DataFrame({'close': close}, index=index)
+        for engine in ('NUMBA', 'EVENT'):
+            for indicator_type in self.indicator_types:
+                GenericStrategy(df.copy(), **dict(STRATEGY_CONFIG, indicator_type=indicator_type,
+                                                  short_window=10, long_window=40), engine=engine).run()
+
+    def run(self):
+        set_trade_log_mode('OFF')
+        self.warm_up()
+        for rows in self.sizes:
+            self.run_size(rows)
+        return self.results
+
+    def report(self):
+        return {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(os.path.dirname(os.path.abspath(__file__))),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': {'source': self.source, 'symbols': self.symbols, 'seed': self.seed,
+                         'volatility': self.volatility, 'repeat': self.repeat},
+            'results': self.results,
+        }
+
+
+def compare(results, baseline, tolerance=0.2, min_seconds=0.01):
+    """
+    Compare wall times with a baseline report.
+
+    A stage regressed when it is more than `tolerance` (relative) and `min_seconds` (absolute)
+    slower than in the baseline.
+
+    Returns:
+        list: (name, baseline_seconds, seconds, ratio, regressed) for every stage in both.
+    """
+    rows = []
+    for name, result in results.items():
+        if name not in baseline.get('results', {}):
+            continue
+        before, after = baseline['results'][name]['wall_seconds'], result['wall_seconds']
+        ratio = after / before if before else float('inf')
+        regressed = ratio > 1 + tolerance and after - before > min_seconds
+        rows.append((name, before, after, ratio, regressed))
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the backtest pipeline on synthetic data.")
+    parser.add_argument('--sizes', type=lambda text: [parse_rows(size) for size in text.split(',')],
+                        default=[1_000_000], help="Rows per dataset, e.g. '1M,10M,100M'")
+    parser.add_argument('--source', choices=['store', 'csv'], default='store')
+    parser.add_argument('--data-dir', default='./data/bench')
+    parser.add_argument('--symbols', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--volatility', type=parse_volatility, default='normal',
+                        help=f"{', '.join(REGIMES)}, switching or a number")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--indicators', type=lambda text: text.split(','), default=None, help="e.g. 'SMA,EMA'")
+    parser.add_argument('--engines', type=lambda text: text.split(','), default=None, help="e.g. 'NUMBA,EVENT'")
+    parser.add_argument('--python-max-rows', type=parse_rows, default=2_000_000)
+    parser.add_argument('--plot-max-rows', type=parse_rows, default=1_000_000)
+    parser.add_argument('--output', default=RESULTS_FILE, help="JSON file for this run's results")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline JSON to compare with")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--log-file', default=LOG_FILE)
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown, e.g. 0.2 for 20%%")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_logging(args.log_file)
+    suite = BenchmarkSuite(
+        args.sizes, args.data_dir, args.source, args.symbols, args.seed, args.volatility, args.repeat,
+        args.indicators, args.engines, args.python_max_rows, args.plot_max_rows
+    )
+    suite.run()
+    report = suite.report()
+    for path in [args.output] + ([args.baseline] if args.save_baseline else []):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=2)
+        logger.info(f"💾 Benchmark results saved as {path}")
+
+    if args.save_baseline or not os.path.isfile(args.baseline):
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    comparison = compare(suite.results, baseline, args.tolerance)
+    lines = [f"{'stage':<28}{'baseline':>10}{'now':>10}{'change':>9}"]
+    for name, before, after, ratio, regressed in comparison:
+        lines.append(f"{name:<28}{before:>9.3f}s{after:>9.3f}s{ratio - 1:>+9.0%}{'  ⚠️ REGRESSION' if regressed else ''}")
+    logger.info(f"📊 Benchmark vs baseline ({baseline.get('git_revision')}):\n" + '\n'.join(lines))
+    regressions = [row[0] for row in comparison if row[4]]
+    if regressions:
+        logger.warning(f"⚠️ {len(regressions)} stages regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    logger.info("✅ No regressions against the baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+# benchmarks/synthetic.py
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage.candle_store import CandleStore, to_epoch_ms
+from storage.gaps import MS_PER_MINUTE
+
+SYNTHETIC_VERSION = 1
+BLOCK_ROWS = 1_000_000  # Rows drawn from one seeded generator, keeps the output independent of chunking
+START_DATE = '2022-01-01'
+START_PRICE = 40_000.0
+
+# Per-minute standard deviation of the log return of each volatility regime
+REGIMES = {
+    'calm': 0.0004,
+    'normal': 0.001,
+    'volatile': 0.003,
+}
+REGIME_MINUTES = 7 * 1440  # Length of one regime when volatility='switching'
+
+
+def symbol_names(symbols):
+    """Symbol names of a synthetic dataset: an int n gives SYN0..SYN{n-1}, a list is used as is."""
+    if isinstance(symbols, int):
+        return [f"SYN{i}" for i in range(symbols)]
+    return list(symbols)
+
+
+def _regime_sigmas(rows, volatility, seed, symbol_index, regime_minutes):
+    if volatility == 'switching':
+        segments = -(-rows // regime_minutes)
+        rng = np.random.default_rng([seed, symbol_index, 2 ** 31])
+        choices = np.array(list(REGIMES.values()))[rng.integers(0, len(REGIMES), segments)]
+        return lambda first, count: choices[np.arange(first, first + count) // regime_minutes]
+    sigma = REGIMES[volatility] if isinstance(volatility, str) else float(volatility)
+    return lambda first, count: np.full(count, sigma)
+
+
+def iter_candles(rows, seed=0, symbol_index=0, start=START_DATE, start_price=START_PRICE, volatility='normal',
+                 regime_minutes=REGIME_MINUTES):
+    """
+    Deterministic synthetic 1-minute OHLCV bars, yielded in blocks of BLOCK_ROWS.
+
+    The close follows a geometric random walk. The open is the previous close, the high and low
+    extend the open/close range by a random wick, and the volume grows with the volatility.
+
+    Args:
+        rows (int): Number of bars.
+        seed (int): Random seed; the same arguments always give the same bars.
+        symbol_index (int): Draws an independent walk per symbol of a dataset.
+        start (str): Timestamp of the first bar.
+        start_price (float): Open of the first bar.
+        volatility (str or float): A REGIMES name, a per-minute log-return standard deviation,
+            or 'switching' to change between the REGIMES at random every regime_minutes bars.
+        regime_minutes (int): Regime length of the switching volatility.
+
+    Yields:
+        dict: Store columns ('timestamp' in epoch ms) of the next block.
+    """
+    sigmas = _regime_sigmas(rows, volatility, seed, symbol_index, regime_minutes)
+    start_ms = to_epoch_ms(start)
+    previous_close = start_price
+    for block, first in enumerate(range(0, rows, BLOCK_ROWS)):
+        count = min(BLOCK_ROWS, rows - first)
+        rng = np.random.default_rng([seed, symbol_index, block])
+        sigma = sigmas(first, count)
+        close = previous_close * np.exp(np.cumsum(sigma * rng.standard_normal(count)))
+        open_ = np.concatenate([[previous_close], close[:-1]])
+        wicks = np.abs(rng.standard_normal((2, count))) * sigma * 0.5
+        volume = rng.lognormal(0.0, 0.5, count) * sigma * 5_000
+        previous_close = close[-1]
+        yield {
+            'timestamp': start_ms + np.arange(first, first + count, dtype=np.int64) * MS_PER_MINUTE,
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + wicks[0]),
+            'low': np.minimum(open_, close) * (1 - wicks[1]),
+            'close': close,
+            'volume': volume,
+            'quoteVolume': volume * close,
+        }
+
+
+def _dataset_meta(rows, symbols, seed, volatility, fmt):
+    return {'version': SYNTHETIC_VERSION, 'rows': rows, 'symbols': symbol_names(symbols), 'seed': seed,
+            'volatility': volatility, 'start': START_DATE, 'format': fmt}
+
+
+def _is_current(meta_path, meta):
+    if not os.path.isfile(meta_path):
+        return False
+    with open(meta_path) as file:
+        return json.load(file) == meta
+
+
+def write_store(store_root, rows, symbols=1, seed=0, volatility='normal'):
+    """
+    Write a synthetic CandleStore with rows bars per symbol (kept if it already matches).
+
+    Returns:
+        str: store_root.
+    """
+    meta = _dataset_meta(rows, symbols, seed, volatility, 'store')
+    meta_path = os.path.join(store_root, '_synthetic.json')
+    if _is_current(meta_path, meta):
+        return store_root
+    store = CandleStore(store_root)
+    for symbol_index, symbol in enumerate(meta['symbols']):
+        for bars in iter_candles(rows, seed, symbol_index, volatility=volatility):
+            store.write_bars(symbol, bars)
+    with open(meta_path, 'w') as file:
+        json.dump(meta, file)
+    return store_root
+
+
+def write_csv(csv_path, rows, symbol='SYN0', seed=0, volatility='normal'):
+    """
+    Write synthetic bars of one symbol as a data_handler CSV (kept if it already matches).
+
+    Returns:
+        str: csv_path.
+    """
+    meta = _dataset_meta(rows, [symbol], seed, volatility, 'csv')
+    meta_path = f"{csv_path}.synthetic.json"
+    if os.path.isfile(csv_path) and _is_current(meta_path, meta):
+        return csv_path
+    folder = os.path.dirname(csv_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(csv_path, 'w', newline='') as file:
+        for block, bars in enumerate(iter_candles(rows, seed, 0, volatility=volatility)):
+            seconds = (bars['timestamp'] // 1000).astype('datetime64[s]')
+            pd.DataFrame({
+                'timestamp': np.char.add(np.datetime_as_string(seconds, unit='s'), '+00:00'),
+                'symbol': symbol,
+                'price': bars['close'].round(2),
+                'open': bars['open'].round(2),
+                'high': bars['high'].round(2),
+                'low': bars['low'].round(2),
+                'volume': bars['volume'].round(5),
+                'quoteVolume': bars['quoteVolume'].round(2),
+                'openTime': '',
+                'closeTime': '',
+            }).to_csv(file, header=block == 0, index=False)
+    with open(meta_path, 'w') as file:
+        json.dump(meta, file)
+    return csv_path
+
+
+def parse_rows(text):
+    """Row count with an optional K or M suffix, e.g. '500K' or '10M'."""
+    text = text.strip().upper()
+    scale = {'K': 1_000, 'M': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def parse_volatility(text):
+    """A REGIMES name, 'switching', or a per-minute standard deviation such as '0.002'."""
+    return text if text in REGIMES or text == 'switching' else float(text)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic 1-minute candles.")
+    parser.add_argument('output', help="CandleStore folder, or a .csv file")
+    parser.add_argument('--rows', type=parse_rows, default=1_000_000, help="Bars per symbol, e.g. 1M")
+    parser.add_argument('--symbols', type=int, default=1, help="Number of symbols (store only)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--volatility', type=parse_volatility, default='normal',
+                        help=f"{', '.join(REGIMES)}, switching or a number")
+    args = parser.parse_args()
+    if args.output.endswith('.csv'):
+        write_csv(args.output, args.rows, seed=args.seed, volatility=args.volatility)
+    else:
+        write_store(args.output, args.rows, args.symbols, args.seed, args.volatility)
@@ -0,0 +1,243 @@
+# cli.py
+import argparse
+import os
+import runpy
+import sys
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.py')
+
+
+def load_config(path=DEFAULT_CONFIG):
+    """
+    Read a configuration file (see config.py) into a dict.
+
+    Only the upper-case names are kept, so helpers and imports in the file are ignored.
+
+    Args:
+        path (str): Python file with the configuration constants.
+
+    Returns:
+        dict: Configuration name -> value.
+    """
+    return {name: value for name, value in runpy.run_path(path).items() if name.isupper()}
+
+
+def parse_list(text, cast=str):
+    return [cast(value) for value in text.split(',')]
+
+
+def parse_range(text, cast=float):
+    # backtest.sweep loads numba, so it is only imported when a sweep range is given
+    from backtest.sweep import parse_range as parse
+
+    return parse(text, cast)
+
+
+def setup_logging(config, trade_mode=None):
+    from utils.logger import setup_logging as setup
+
+    setup(config['LOG_FILE'], config['LOG_LEVEL'], trade_mode=trade_mode or config['LOG_TRADES'],
+          sample_every=config['LOG_SAMPLE_EVERY'], lean_records=config['LOG_LEAN_RECORDS'])
+
+
+def run_backtest(args, config):
+    from backtest.pipeline import run_backtest as run
+
+    if args.engine:
+        config['ENGINE'] = args.engine
+    setup_logging(config)
+    run(config, plots=not args.no_plots, trades_file=args.trades_out or config['TRADES_FILE'])
+    return 0
+
+
+def run_sweep(args, config):
+    setup_logging(config, trade_mode=config['SWEEP_LOG_TRADES'])
+    from backtest.pipeline import load_data
+    from backtest.sweep import ParameterSweep
+    from utils.logger import logger
+
+    logger.info("🚀 Starting parameter sweep...")
+    df = load_data(config)
+    base_config = {
+        'initial_capital': config['INITIAL_CAPITAL'],
+        'trade_fee': config['TRADE_FEE'],
+        'enable_stop_loss': config['ENABLE_STOP_LOSS'],
+        'indicator_type': config['INDICATOR_TYPE'],
+        'enable_close_long_on_downtrend': config['ENABLE_CLOSE_LONG_ON_DOWNTREND'],
+        'enable_close_short_on_uptrend': config['ENABLE_CLOSE_SHORT_ON_UPTREND'],
+        'enable_profit_target': config['ENABLE_PROFIT_TARGET'],
+        'enable_longing': config['ENABLE_LONGING'],
+        'enable_shorting': config['ENABLE_SHORTING'],
+    }
+    cache = config['ENABLE_INDICATOR_CACHE']
+
+    sweep = ParameterSweep(
+        df, base_config,
+        short_windows=args.short_windows or config['SWEEP_SHORT_WINDOWS'],
+        long_windows=args.long_windows or config['SWEEP_LONG_WINDOWS'],
+        profit_targets=args.profit_targets or config['SWEEP_PROFIT_TARGETS'],
+        stop_losses=args.stop_losses or config['SWEEP_STOP_LOSSES'],
+        indicator_types=args.indicator_types or [config['INDICATOR_TYPE']],
+        processes=args.processes if args.processes is not None else config['SWEEP_PROCESSES'],
+        cache_dir=config['INDICATOR_CACHE_DIR'] if cache else None,
+        cache_memory_bytes=config['INDICATOR_CACHE_MEMORY_MB'] * 1024 ** 2 if cache else None,
+        equity_every=args.equity_every if args.equity_every is not None else config['SWEEP_EQUITY_EVERY'],
+        rank_by=args.rank_by or config['SWEEP_RANK_BY'],
+        risk_free_rate=config['RISK_FREE_RATE']
+    )
+    results = sweep.run()
+
+    output = args.output or config['SWEEP_RESULTS_FILE']
+    results.to_csv(output, index=False)
+    logger.info(f"🏆 Top {args.top} configurations:\n{results.head(args.top).to_string(index=False)}")
+    logger.info(f"✅ Sweep results saved as {output}")
+    return 0
+
+
+def run_ingest(args, config):
+    import asyncio
+    import logging
+
+    from ingestion.client import ExchangeClient
+    from ingestion.service import IngestionService
+
+    log_file = config['INGEST_LOG_FILE']
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s]: %(message)s',
+        handlers=[logging.FileHandler(log_file), logging.StreamHandler()]
+    )
+
+    client = ExchangeClient(args.base_url or config['INGEST_BASE_URL'],
+                            weight_per_minute=args.weight_per_minute or config['INGEST_WEIGHT_PER_MINUTE'],
+                            max_connections=config['INGEST_MAX_CONNECTIONS'])
+    service = IngestionService(
+        args.symbols or config['INGEST_SYMBOLS'], args.store or config['INGEST_STORE_ROOT'],
+        config['INGEST_WAL_DIR'], args.start_date or config['INGEST_START_DATE'],
+        client=client,
+        max_in_flight=config['INGEST_MAX_IN_FLIGHT'],
+        compact_interval_minutes=config['INGEST_COMPACT_INTERVAL_MINUTES'],
+        gap_fill_interval_minutes=config['INGEST_GAP_FILL_INTERVAL_MINUTES']
+    )
+    try:
+        asyncio.run(service.run())
+    except KeyboardInterrupt:
+        logging.info("🛑 Ingestion stopped manually")
+    return 0
+
+
+def run_live(args, config):
+    setup_logging(config)
+    from utils.logger import logger
+
+    try:
+        import ccxt
+    except ImportError:
+        logger.error("❌ The live command needs the ccxt package: pip install ccxt")
+        return 1
+    from backtest.pipeline import load_data, strategy_config
+    from live_trading.live_trading import LiveTrading
+
+    exchange = getattr(ccxt, config['LIVE_EXCHANGE'])({'apiKey': config['API_KEY'], 'secret': config['API_SECRET']})
+    history = load_data(config) if args.warm_up else None
+    trading = LiveTrading(exchange, strategy_config(config), pair=args.pair or config['LIVE_PAIR'], history=history,
+                          buffer_margin=config['LIVE_BUFFER_MARGIN'])
+    trading.start_trading()
+    return 0
+
+
+def run_plot(args, config):
+    import numpy as np
+
+    setup_logging(config)
+    from backtest.pipeline import load_data, render_plots
+    from strategies.indicator_cache import IndicatorCache
+    from strategies.indicators import calculate_indicators
+    from utils.logger import logger
+
+    trades_file = args.trades or config['TRADES_FILE']
+    if not os.path.isfile(trades_file):
+        logger.error(f"❌ No trades file at {trades_file}, run 'python cli.py backtest' first")
+        return 1
+    trades = np.load(trades_file)
+    df = load_data(config)
+    cache = None
+    if config['ENABLE_INDICATOR_CACHE']:
+        cache = IndicatorCache(config['INDICATOR_CACHE_DIR'], config['INDICATOR_CACHE_MEMORY_MB'] * 1024 ** 2)
+    # Same data and settings as the backtest, so the trade bars line up (and the cached indicators are reused)
+    df['FAST_IND'], df['SLOW_IND'] = calculate_indicators(
+        df['close'], config['INDICATOR_TYPE'], config['SHORT_WINDOW'], config['LONG_WINDOW'], cache=cache
+    )
+    render_plots(df, trades, config)
+    logger.info(f"✅ Plotted {len(trades)} trades from {trades_file}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Crypto trading bot: backtests, sweeps, data ingestion and live trading.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    # Every command takes --config, so the wrappers (main.py, sweep.py, ingest.py) accept it as well
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', default=DEFAULT_CONFIG, help="Configuration file (default: config.py)")
+
+    backtest = commands.add_parser('backtest', parents=[common], help="Backtest the configured strategy")
+    backtest.add_argument('--no-plots', action='store_true', help="Skip the static and interactive plots")
+    backtest.add_argument('--engine', choices=['NUMBA', 'EVENT', 'PYTHON'], help="Override ENGINE")
+    backtest.add_argument('--trades-out', help="Trades file (.npy) for the plot command (default: TRADES_FILE)")
+    backtest.set_defaults(run=run_backtest)
+
+    sweep = commands.add_parser('sweep', parents=[common], help="Parallel parameter sweep (defaults: SWEEP_* in the config)")
+    sweep.add_argument('--short-windows', type=lambda text: parse_range(text, int),
+                       help="SHORT_WINDOW values, e.g. '500,1000' or '500:2000:500'")
+    sweep.add_argument('--long-windows', type=lambda text: parse_range(text, int),
+                       help="LONG_WINDOW values, e.g. '2000,4000' or '2000:8000:2000'")
+    sweep.add_argument('--profit-targets', type=lambda text: parse_range(text),
+                       help="PROFIT_TARGET values, e.g. '0.01:0.1:0.01'")
+    sweep.add_argument('--stop-losses', type=lambda text: parse_range(text), help="STOP_LOSS values, e.g. '0.01,0.02,0.05'")
+    sweep.add_argument('--indicator-types', type=parse_list, help="Indicator types, e.g. 'SMA,EMA'")
+    sweep.add_argument('--processes', type=int, help="Worker processes (default: all cores)")
+    sweep.add_argument('--equity-every', type=int, help="Bars between equity samples for the risk metrics (0 to skip them)")
+    sweep.add_argument('--rank-by', help="Ranking column, e.g. 'sharpe_ratio'")
+    sweep.add_argument('--output', help="CSV file for the ranked results")
+    sweep.add_argument('--top', type=int, default=10, help="Number of top results to log")
+    sweep.set_defaults(run=run_sweep)
+
+    ingest = commands.add_parser('ingest', parents=[common], help="Ingest 1-minute bars of many symbols into the candle store")
+    ingest.add_argument('--symbols', type=parse_list, help="Symbols, e.g. 'BTCUSDT,ETHUSDT'")
+    ingest.add_argument('--start-date', help="First minute gap fills reach back to")
+    ingest.add_argument('--base-url', help="Exchange REST root, e.g. a local stand-in server")
+    ingest.add_argument('--weight-per-minute', type=int, help="Request weight budget shared by all symbols")
+    ingest.add_argument('--store', help="Candle store folder")
+    ingest.set_defaults(run=run_ingest)
+
+    live = commands.add_parser('live', parents=[common], help="Trade the configured strategy live (needs ccxt)")
+    live.add_argument('--pair', help="Trading pair, e.g. 'BTC/USDT' (default: LIVE_PAIR)")
+    live.add_argument('--warm-up', action='store_true', help="Warm up the indicators with the configured data")
+    live.set_defaults(run=run_live)
+
+    plot = commands.add_parser('plot', parents=[common], help="Plot the trades saved by the last backtest")
+    plot.add_argument('--trades', help="Trades file (default: TRADES_FILE)")
+    plot.set_defaults(run=run_plot)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one command of the bot.
+
+    Each command imports only the modules it needs, so e.g. a backtest without plots never
+    loads matplotlib or plotly and a sweep never loads the ingestion client.
+
+    Args:
+        argv (list, optional): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit status.
+    """
+    args = build_parser().parse_args(argv)
+    return args.run(args, load_config(args.config))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,28 +12,88 @@ ENABLE_CLOSE_LONG_ON_DOWNTREND = False   # For Long positions
 ENABLE_CLOSE_SHORT_ON_UPTREND = False    # For Short positions
 ENABLE_STOP_LOSS = True
 
-# Windows
+# Windows (in bars of TIMEFRAME)
 SHORT_WINDOW = 1000
 LONG_WINDOW = 4000
 
 # === Strategy Selector ===
 INDICATOR_TYPE = 'EMA'  # Options: SMA, EMA, WMA, RSI, MACD
 
+# === Backtest Engine ===
+ENGINE = 'NUMBA'  # Options: NUMBA (compiled), EVENT (compiled, skips bars that cannot trade), PYTHON (reference loop)
+
 
 # Trading Parameters
 TRADE_FEE = 0.001
 PROFIT_TARGET = 0.05
 STOP_LOSS = 0.02
 
-# Data Path
+# Risk Metrics (equity curve of the backtest)
+RISK_FREE_RATE = 0.0  # Annual rate subtracted by the Sharpe and Sortino ratios
+VOLATILITY_WINDOW = 1440  # Bars per rolling volatility window (one day of 1m bars)
+
+# Indicator Cache (in-memory LRU + memory-mapped files on disk)
+ENABLE_INDICATOR_CACHE = True
+INDICATOR_CACHE_DIR = './data/cache/indicators'
+INDICATOR_CACHE_MEMORY_MB = 512
+
+# Parameter Sweep (python cli.py sweep), ranges can be overridden on the command line
+SWEEP_SHORT_WINDOWS = [500, 1000, 1500]
+SWEEP_LONG_WINDOWS = [2000, 4000, 6000]
+SWEEP_PROFIT_TARGETS = [0.02, 0.05, 0.1]
+SWEEP_STOP_LOSSES = [0.01, 0.02, 0.05]
+SWEEP_PROCESSES = None  # None: use all cores
+SWEEP_EQUITY_EVERY = 60  # Bars between equity samples for the sweep's risk metrics, 0 to skip them
+SWEEP_RANK_BY = 'virtual_balance'  # Ranking column, e.g. virtual_balance, sharpe_ratio, calmar_ratio
+SWEEP_RESULTS_FILE = './sweep_results.csv'
+SWEEP_LOG_TRADES = 'OFF'  # Per-trade messages during sweeps: ALL, SAMPLED or OFF
+
+# Data Path: CSV file or candle store folder (python -m storage.convert_csv ./data/BTCUSD.csv ./data/store)
 DATA_PATH = './data/BTCUSD.csv'
+SYMBOL = 'BTCUSDT'  # Symbol read from a candle store
+TIMEFRAME = '1m'  # Bar size: 1m, 5m, 15m, 1h, 4h, 1d (pre-aggregated in a candle store)
+MEMMAP_DATA = False  # Serve OHLCV from read-only memory-mapped files shared by concurrent backtests
 START_DATE = '2022-01-10T00:00:00+00:00'
 END_DATE = '2022-08-01T11:59:00+00:00'  
 
+# Market Data Ingestion (python cli.py ingest), one process for all symbols
+INGEST_SYMBOLS = ['BTCUSDT', 'ETHUSDT']
+INGEST_START_DATE = '2022-01-01'
+INGEST_BASE_URL = 'https://api.binance.com'  # Or a local stand-in server
+INGEST_WEIGHT_PER_MINUTE = 1200  # Request weight budget shared by all symbols (Binance limit per IP: 6000)
+INGEST_MAX_CONNECTIONS = 10  # Shared HTTP connection pool
+INGEST_MAX_IN_FLIGHT = 10  # Concurrent backfill requests per symbol
+INGEST_COMPACT_INTERVAL_MINUTES = 60
+INGEST_GAP_FILL_INTERVAL_MINUTES = 1440
+INGEST_STORE_ROOT = './data/store'
+INGEST_WAL_DIR = './data/wal'
+INGEST_LOG_FILE = './data/logs/ingest.log'
+
 # Logging Configuration
 LOG_FOLDER = './logs'
 LOG_FILE = f"{LOG_FOLDER}/trading_bot.log"
 LOG_LEVEL = 'DEBUG'
+LOG_TRADES = 'ALL'  # Per-trade messages: ALL, SAMPLED (one in LOG_SAMPLE_EVERY) or OFF
+LOG_SAMPLE_EVERY = 100
+LOG_LEAN_RECORDS = True  # Skip thread/process names in every log record of the process (faster per-trade logging)
+
+# Plotting
+TRADES_FILE = './logs/trades.npy'  # Trades of the last backtest, re-plotted by python cli.py plot
+PLOT_DOWNSAMPLE = 'MINMAX'  # Options: MINMAX (min/max per pixel), LTTB, NONE (every bar); trade bars are always kept
+INTERACTIVE_PLOT_RESOLUTION = 2000  # Horizontal pixels the interactive plot is downsampled for
+INTERACTIVE_PLOT_DETAIL = True  # Write zoom levels next to the HTML (<name>_files/), loaded when zooming in
+
+# Profiling (stage timings of python cli.py backtest)
+PROFILE_ENABLED = True
+PROFILE_REPORT = './logs/profile_report.json'
+PROFILE_CPROFILE_STAGES = []  # Stages captured with cProfile, e.g. ['run'] or ['ALL']
+PROFILE_TRACEMALLOC = False  # Track peak Python allocations per stage (slows the run down)
+PROFILE_OUTPUT_DIR = './logs/profiles'  # .prof files, open with python -m pstats or snakeviz
+
+# Live Trading (python cli.py live, needs ccxt)
+LIVE_EXCHANGE = 'binance'  # ccxt exchange id
+LIVE_PAIR = 'BTC/USDT'
+LIVE_BUFFER_MARGIN = 1000  # Bars kept in memory on top of LONG_WINDOW
 
 # API Configuration for Live Trading
 API_KEY = 'your_api_key'
@@ -0,0 +1,8 @@
+# ingest.py
+import sys
+
+from cli import main
+
+# Same as python cli.py ingest
+if __name__ == "__main__":
+    sys.exit(main(['ingest'] + sys.argv[1:]))
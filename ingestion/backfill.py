@@ -0,0 +1,163 @@
+# ingestion/backfill.py
+import asyncio
+import logging
+
+import numpy as np
+
+from ingestion.client import ExchangeClient
+from storage.gaps import MS_PER_MINUTE, missing_mask
+
+KLINES_PATH = '/api/v3/klines'
+
+logger = logging.getLogger(__name__)
+
+
+def klines_to_bars(klines):
+    """Convert Binance kline rows into candle store arrays (timestamps floored to the minute)."""
+    return {
+        "timestamp": np.array([int(entry[0]) // MS_PER_MINUTE * MS_PER_MINUTE for entry in klines], dtype=np.int64),
+        "close": np.array([entry[4] for entry in klines], dtype=np.float64),
+        "open": np.array([entry[1] for entry in klines], dtype=np.float64),
+        "high": np.array([entry[2] for entry in klines], dtype=np.float64),
+        "low": np.array([entry[3] for entry in klines], dtype=np.float64),
+        "volume": np.array([entry[5] for entry in klines], dtype=np.float64),
+        "quoteVolume": np.array([entry[7] for entry in klines], dtype=np.float64),
+    }
+
+
+def split_batches(gap_starts, gap_ends, batch_limit):
+    """Split gaps (epoch-ms half-open ranges) into chronological (start, end) request ranges of batch_limit minutes."""
+    batches = []
+    for gap_start, gap_end in zip(np.asarray(gap_starts).tolist(), np.asarray(gap_ends).tolist()):
+        for start in range(gap_start, gap_end, batch_limit * MS_PER_MINUTE):
+            batches.append((start, min(start + batch_limit * MS_PER_MINUTE, gap_end)))
+    return batches
+
+
+class KlineBackfiller:
+    def __init__(self, client=None, request_weight=2, max_in_flight=10, batch_limit=1000, flush_bars=100_000):
+        """
+        Concurrent 1-minute kline backfill into a CandleStore.
+
+        Up to max_in_flight requests run at once through the client, which pools the
+        connections and enforces the request-weight budget. Responses may arrive in any
+        order; they are collected in a reorder buffer and written to the store strictly in
+        time order, in chunks of at least flush_bars bars. The writes run on a worker thread,
+        so other tasks on the event loop (e.g. realtime polling) are not blocked by disk I/O.
+
+        Args:
+            client (ExchangeClient, optional): Shared rate-limited client, defaults to a Binance client.
+            request_weight (int): Weight of one klines request.
+            max_in_flight (int): Concurrent requests of one backfill.
+            batch_limit (int): Candles per request (Binance maximum: 1000).
+            flush_bars (int): Ordered bars buffered before they are merged into the store.
+        """
+        self.client = client or ExchangeClient()
+        self.request_weight = request_weight
+        self.max_in_flight = max_in_flight
+        self.batch_limit = batch_limit
+        self.flush_bars = flush_bars
+
+    async def fetch_klines(self, session, symbol, start, end):
+        """
+        Fetch the 1-minute klines of [start, end).
+
+        Returns:
+            list: Raw kline rows.
+        """
+        params = {
+            "symbol": symbol,
+            "interval": "1m",
+            "startTime": start,
+            "endTime": end - 1,
+            "limit": self.batch_limit
+        }
+        return await self.client.get_json(session, KLINES_PATH, params, self.request_weight)
+
+    async def backfill(self, session, store, symbol, gap_starts, gap_ends, existing=None):
+        """
+        Fetch every gap and merge the bars into the store in time order.
+
+        Args:
+            session (aiohttp.ClientSession): Pooled session (see ExchangeClient.session()).
+            store (CandleStore): Target store.
+            symbol (str): Symbol to fetch and write.
+            gap_starts, gap_ends (np.ndarray): Gaps as half-open epoch-ms ranges (storage.gaps.find_gaps).
+            existing (np.ndarray, optional): Sorted stored timestamps; fetched bars already stored are skipped.
+
+        Returns:
+            int: Number of bars written.
+        """
+        batches = split_batches(gap_starts, gap_ends, self.batch_limit)
+        existing = np.empty(0, dtype=np.int64) if existing is None else existing
+        if not batches:
+            return 0
+        logger.info(f"{symbol}: backfilling {len(batches)} batches with {self.max_in_flight} requests in flight")
+
+        queue = asyncio.Queue()
+        for index, batch in enumerate(batches):
+            queue.put_nowait((index, batch))
+        arrived = {}
+        state = {'next': 0, 'pending': [], 'pending_bars': 0, 'written': 0, 'last': np.iinfo(np.int64).min}
+
+        write_lock = asyncio.Lock()
+
+        async def flush():
+            # The store write runs on a thread so the event loop keeps serving other tasks;
+            # the lock keeps the flushes in time order
+            async with write_lock:
+                if not state['pending']:
+                    return
+                chunks = state['pending']
+                state['pending'] = []
+                state['pending_bars'] = 0
+                bars = {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+                await asyncio.to_thread(store.write_bars, symbol, bars)
+                state['written'] += len(bars['timestamp'])
+
+        async def collect():
+            # Move the contiguous prefix of arrived batches into the ordered write buffer; rows
+            # repeated within a page or overlapping the previous page are dropped
+            while state['next'] in arrived:
+                bars = arrived.pop(state['next'])
+                timestamps, first = np.unique(bars['timestamp'], return_index=True)
+                bars = {column: values[first] for column, values in bars.items()}
+                keep = missing_mask(existing, timestamps) & (timestamps > state['last'])
+                if len(timestamps):
+                    state['last'] = max(state['last'], int(timestamps[-1]))
+                state['pending'].append({column: values[keep] for column, values in bars.items()})
+                state['pending_bars'] += int(keep.sum())
+                state['next'] += 1
+            if state['pending_bars'] >= self.flush_bars:
+                await flush()
+
+        async def worker():
+            while True:
+                try:
+                    index, (start, end) = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                arrived[index] = klines_to_bars(await self.fetch_klines(session, symbol, start, end))
+                await collect()
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_in_flight, len(batches)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            # Whatever arrived in order is kept, even when a batch failed
+            await flush()
+        logger.info(f"{symbol}: backfill wrote {state['written']} bars")
+        return state['written']
+
+    async def _run(self, store, symbol, gap_starts, gap_ends, existing):
+        async with self.client.session() as session:
+            return await self.backfill(session, store, symbol, gap_starts, gap_ends, existing)
+
+    def run(self, store, symbol, gap_starts, gap_ends, existing=None):
+        """Blocking wrapper around backfill() with its own session and event loop."""
+        return asyncio.run(self._run(store, symbol, gap_starts, gap_ends, existing))
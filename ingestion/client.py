@@ -0,0 +1,68 @@
+# ingestion/client.py
+import asyncio
+import logging
+
+import aiohttp
+
+from ingestion.rate_limiter import TokenBucket
+
+BINANCE_BASE_URL = 'https://api.binance.com'
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeClient:
+    def __init__(self, base_url=BINANCE_BASE_URL, rate_limiter=None, weight_per_minute=1200,
+                 max_connections=10, max_retries=5, timeout=30):
+        """
+        Rate-limited JSON client for the exchange REST API.
+
+        All requests go through one pooled aiohttp session (see session()) and take their
+        request weight from one TokenBucket, so every symbol and task using the client
+        shares the same connections and the same weight budget.
+
+        Args:
+            base_url (str): Exchange REST root; point it at a local stand-in server for offline runs.
+            rate_limiter (TokenBucket, optional): Shared weight budget, defaults to a bucket of weight_per_minute.
+            weight_per_minute (int): Budget of the default rate limiter.
+            max_connections (int): Size of the connection pool.
+            max_retries (int): Attempts per request.
+            timeout (float): Total timeout per request in seconds.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.rate_limiter = rate_limiter or TokenBucket(weight_per_minute)
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    def session(self):
+        """Pooled HTTP session with max_connections connections."""
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_connections), timeout=self.timeout)
+
+    async def get_json(self, session, path, params=None, weight=1):
+        """
+        GET base_url + path with retries.
+
+        Failed attempts back off exponentially with asyncio.sleep, so other requests keep
+        running. HTTP 429/418 responses pause the shared rate limiter for Retry-After seconds.
+
+        Returns:
+            Decoded JSON response.
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries):
+            await self.rate_limiter.acquire(weight)
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    if response.status in (418, 429):
+                        retry_after = float(response.headers.get('Retry-After', 2 ** attempt))
+                        logger.warning(f"Rate limited (HTTP {response.status}) on {path}, pausing {retry_after}s")
+                        await self.rate_limiter.pause(retry_after)
+                        continue
+                    logger.warning(f"{path} {params} attempt {attempt + 1} failed with status {response.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"{path} {params} request failed: {e!r}")
+            await asyncio.sleep(2 ** attempt)
+        raise Exception(f"Failed to fetch {path} {params} after {self.max_retries} retries.")
@@ -0,0 +1,46 @@
+# ingestion/rate_limiter.py
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Async token bucket for an exchange request-weight budget.
+
+        Tokens refill continuously at rate_per_minute; acquire() waits until enough tokens
+        are available. Waiters are served in arrival order. Share one bucket between all
+        clients that count against the same limit (e.g. one IP).
+
+        Args:
+            rate_per_minute (float): Tokens (request weight) added per minute.
+            capacity (float, optional): Largest burst, defaults to a tenth of the minute budget.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 10)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens=1):
+        """Wait until tokens are available and take them."""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}.")
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    async def pause(self, seconds):
+        """Block every client of the bucket for seconds (e.g. after an HTTP 429 with Retry-After)."""
+        async with self._lock:
+            await asyncio.sleep(seconds)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
@@ -0,0 +1,159 @@
+# ingestion/service.py
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ingestion.backfill import KlineBackfiller
+from ingestion.client import ExchangeClient
+from storage.bar_log import BarLog
+from storage.candle_store import CandleStore, to_epoch_ms
+from storage.gaps import MS_PER_MINUTE, find_gaps
+
+TICKER_PATH = '/api/v3/ticker/24hr'
+TICKER_WEIGHT = 2
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionService:
+    def __init__(self, symbols, store_root, wal_dir, start_date, client=None, max_in_flight=10,
+                 compact_interval_minutes=60, gap_fill_interval_minutes=1440):
+        """
+        Ingest 1-minute bars of many symbols in one process.
+
+        Every minute the realtime bars of all symbols are fetched concurrently and appended
+        to their bar logs. Gap fills run as background tasks and compaction merges the logs
+        into the store periodically. All requests share the client's connection pool and
+        request-weight budget; each symbol is written to its own store partition. Store reads,
+        writes and compaction run on worker threads, so disk I/O never stalls the realtime
+        polling on the event loop.
+
+        Args:
+            symbols (list): Symbols to ingest, e.g. ['BTCUSDT', 'ETHUSDT'].
+            store_root (str): CandleStore folder.
+            wal_dir (str): Folder of the per-symbol bar logs.
+            start_date (str): First minute gap fills reach back to.
+            client (ExchangeClient, optional): Shared rate-limited client, defaults to a Binance client.
+            max_in_flight (int): Concurrent requests of one symbol's backfill.
+            compact_interval_minutes (int): How often the bar logs are merged into the store.
+            gap_fill_interval_minutes (int): How often every symbol is checked for gaps (also done at startup).
+        """
+        self.symbols = list(symbols)
+        self.store = CandleStore(store_root)
+        self.bar_logs = {symbol: BarLog(os.path.join(wal_dir, symbol)) for symbol in self.symbols}
+        self.start_ms = to_epoch_ms(start_date)
+        self.client = client or ExchangeClient()
+        self.backfiller = KlineBackfiller(self.client, max_in_flight=max_in_flight)
+        self.compact_interval_minutes = compact_interval_minutes
+        self.gap_fill_interval_minutes = gap_fill_interval_minutes
+        self._gap_fills = {}  # symbol -> running gap fill task
+        self._compaction = None  # running background compaction task
+
+    async def fetch_realtime_bar(self, session, symbol, timestamp):
+        """Fetch the 24h ticker of a symbol as the bar of minute timestamp (epoch ms)."""
+        data = await self.client.get_json(session, TICKER_PATH, {'symbol': symbol}, TICKER_WEIGHT)
+        return {
+            'timestamp': timestamp,
+            'close': data.get('lastPrice'),
+            'open': data.get('openPrice'),
+            'high': data.get('highPrice'),
+            'low': data.get('lowPrice'),
+            'volume': data.get('volume'),
+            'quoteVolume': data.get('quoteVolume'),
+        }
+
+    async def append_realtime(self, session, symbol, timestamp):
+        """Append the realtime bar of one symbol unless its minute is not past the high-water mark."""
+        bar = await self.fetch_realtime_bar(session, symbol, timestamp)
+        if self.bar_logs[symbol].append(bar):
+            logger.info(f"{symbol}: real-time bar appended for {datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)}")
+        else:
+            logger.info(f"{symbol}: duplicate minute {datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)}, skipping")
+
+    async def fill_gaps(self, session, symbol):
+        """Backfill every missing minute of one symbol between start_date and the previous minute."""
+        existing = await asyncio.to_thread(self.known_timestamps, symbol)
+        now = int(time.time() * 1000) // MS_PER_MINUTE * MS_PER_MINUTE
+        gap_starts, gap_ends = find_gaps(existing, start=self.start_ms, end=now - MS_PER_MINUTE)
+        if len(gap_starts):
+            logger.info(f"{symbol}: {len(gap_starts)} gaps with {int((gap_ends - gap_starts).sum()) // MS_PER_MINUTE} missing minutes")
+            await self.backfiller.backfill(session, self.store, symbol, gap_starts, gap_ends, existing)
+        self.bar_logs[symbol].advance(await asyncio.to_thread(self.store.last_timestamp, symbol))
+
+    def known_timestamps(self, symbol):
+        """
+        Sorted timestamps (epoch ms) of the bars in the store or still in the bar log.
+
+        Logged bars are not gaps: fetching them as klines would be redundant, and the next
+        compaction would replace those klines with the logged realtime bars.
+        """
+        # The log is read first: a bar compacted in between is then found in the store
+        pending = self.bar_logs[symbol].pending_timestamps()
+        stored = self.store.read(symbol, columns=['timestamp'])['timestamp']
+        return np.union1d(stored, pending)
+
+    def schedule_gap_fills(self, session):
+        """Start a background gap fill for every symbol that has none running."""
+        for symbol in self.symbols:
+            task = self._gap_fills.get(symbol)
+            if task is None or task.done():
+                self._gap_fills[symbol] = asyncio.create_task(self._guarded(self.fill_gaps(session, symbol), symbol, 'gap fill'))
+
+    def compact(self):
+        """Merge every symbol's bar log into the store (blocking, see schedule_compaction)."""
+        for symbol, bar_log in self.bar_logs.items():
+            merged = bar_log.compact(self.store, symbol)
+            if merged:
+                logger.info(f"{symbol}: compacted {merged} logged bars")
+
+    def schedule_compaction(self):
+        """Start compact() on a worker thread unless a compaction is still running."""
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.create_task(self._guarded(asyncio.to_thread(self.compact), 'all', 'compaction'))
+
+    async def _guarded(self, coroutine, symbol, what):
+        try:
+            await coroutine
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{symbol}: {what} failed: {e}")
+
+    async def run(self, iterations=None):
+        """
+        Run the minute loop.
+
+        Args:
+            iterations (int, optional): Stop after this many minutes, runs forever by default.
+        """
+        logger.info(f"Ingesting {len(self.symbols)} symbols: {', '.join(self.symbols)}")
+        await asyncio.to_thread(self.compact)
+        async with self.client.session() as session:
+            self.schedule_gap_fills(session)
+            minute = 0
+            try:
+                while iterations is None or minute < iterations:
+                    timestamp = int(time.time() * 1000) // MS_PER_MINUTE * MS_PER_MINUTE
+                    await asyncio.gather(*(
+                        self._guarded(self.append_realtime(session, symbol, timestamp), symbol, 'real-time append')
+                        for symbol in self.symbols
+                    ))
+                    minute += 1
+                    if minute % self.compact_interval_minutes == 0:
+                        self.schedule_compaction()
+                    if minute % self.gap_fill_interval_minutes == 0:
+                        self.schedule_gap_fills(session)
+                    if iterations is None or minute < iterations:
+                        await asyncio.sleep(MS_PER_MINUTE / 1000 - time.time() % 60)
+                await asyncio.gather(*self._gap_fills.values())
+            finally:
+                for task in self._gap_fills.values():
+                    task.cancel()
+                await asyncio.gather(*self._gap_fills.values(), return_exceptions=True)
+                if self._compaction is not None:
+                    await asyncio.gather(self._compaction, return_exceptions=True)
+                await asyncio.to_thread(self.compact)
@@ -0,0 +1,101 @@
+# live_trading/bar_buffer.py
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class BarRingBuffer:
+    def __init__(self, capacity):
+        """
+        Fixed-capacity circular store for OHLCV bars.
+
+        Every column is a preallocated array of twice the capacity and each value is
+        written to both halves, so the most recent bars are always one contiguous slice.
+        Appends are O(1), never reallocate, and window() returns views without copying.
+
+        Args:
+            capacity (int): Maximum number of bars kept.
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be positive, got {capacity}.")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)  # Epoch milliseconds
+        self._columns = {column: np.zeros(2 * capacity, dtype=np.float64) for column in BAR_COLUMNS}
+        self._head = 0  # Next write position in [0, capacity)
+        self._count = 0
+
+    @classmethod
+    def for_window(cls, long_window, margin=1000):
+        """Buffer large enough for the slow indicator window plus a margin."""
+        return cls(long_window + margin)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return self._timestamps.nbytes + sum(array.nbytes for array in self._columns.values())
+
+    def append(self, timestamp, open, high, low, close, volume):
+        """
+        Add one bar, overwriting the oldest when the buffer is full.
+
+        Args:
+            timestamp (int or pd.Timestamp): Bar time, stored as epoch milliseconds.
+            open, high, low, close, volume (float): Bar values.
+        """
+        if isinstance(timestamp, pd.Timestamp):
+            timestamp = timestamp.value // 1_000_000
+        head, mirror = self._head, self._head + self.capacity
+        self._timestamps[head] = self._timestamps[mirror] = timestamp
+        for column, value in zip(BAR_COLUMNS, (open, high, low, close, volume)):
+            array = self._columns[column]
+            array[head] = array[mirror] = value
+
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def append_bar(self, bar):
+        """Add one bar from a dict with 'timestamp' and the OHLCV keys."""
+        self.append(bar['timestamp'], *(bar[column] for column in BAR_COLUMNS))
+
+    def window(self, column='close', size=None):
+        """
+        Read-only view of the most recent bars of one column, oldest first.
+
+        Args:
+            column (str): 'timestamp' or one of open, high, low, close, volume.
+            size (int, optional): Number of bars, defaults to all stored bars.
+
+        Returns:
+            np.ndarray: View into the buffer; it is only valid until the next append.
+        """
+        size = self._count if size is None else min(size, self._count)
+        array = self._timestamps if column == 'timestamp' else self._columns[column]
+        end = self._head + self.capacity
+        view = array[end - size:end]
+        view.flags.writeable = False
+        return view
+
+    def latest(self, column='close'):
+        if not self._count:
+            raise IndexError("The bar buffer is empty.")
+        array = self._timestamps if column == 'timestamp' else self._columns[column]
+        return array[self._head + self.capacity - 1]
+
+    def to_frame(self, size=None):
+        """
+        Copy the most recent bars into a DataFrame indexed by UTC timestamp (e.g. for plotting).
+
+        Args:
+            size (int, optional): Number of bars, defaults to all stored bars.
+
+        Returns:
+            pd.DataFrame: OHLCV columns.
+        """
+        index = pd.to_datetime(self.window('timestamp', size), unit='ms', utc=True)
+        return pd.DataFrame(
+            {column: self.window(column, size).copy() for column in BAR_COLUMNS},
+            index=index.rename('timestamp')
+        )
@@ -3,29 +3,42 @@ import time
 import pandas as pd
 from utils.logger import logger
 from strategies.generic_strategy import GenericStrategy
+from strategies.streaming_indicators import StreamingIndicatorPair
+from live_trading.bar_buffer import BarRingBuffer
 
 class LiveTrading:
-    def __init__(self, api_client, strategy_config, pair='BTCUSD'):
+    def __init__(self, api_client, strategy_config, pair='BTCUSD', history=None, buffer_margin=1000):
         """
         Initialize Live Trading Module
         Args:
             api_client: Exchange API client for live data and orders.
             strategy_config: Configuration dictionary for strategy parameters.
             pair: Trading pair.
+            history: Optional past bars (DataFrame with OHLCV columns) used to warm up the indicators.
+            buffer_margin: Bars kept in the history buffer on top of the long window.
         """
         self.api_client = api_client
         self.pair = pair
         self.strategy = GenericStrategy(
-            data=pd.DataFrame(),  # Will dynamically update with live data
+            data=pd.DataFrame({'close': pd.Series(dtype='float64')}, index=pd.DatetimeIndex([], tz='UTC')),
             **strategy_config
         )
+        self.indicators = StreamingIndicatorPair(
+            self.strategy.indicator_type, self.strategy.short_window, self.strategy.long_window
+        )
+        self.bars = BarRingBuffer.for_window(self.strategy.long_window, buffer_margin)
+        if history is not None:
+            self.indicators.warm_up(history['close'].to_numpy())
+            for timestamp, row in history.iloc[-self.bars.capacity:].iterrows():
+                self.bars.append(timestamp, row['open'], row['high'], row['low'], row['close'], row['volume'])
+            logger.info(f"🔥 Indicators warmed up with {len(history)} historical bars")
         logger.info("✅ Live Trading Initialized")
 
     def fetch_live_data(self):
         """Fetch live market data from the exchange."""
         ticker = self.api_client.fetch_ticker(self.pair)
         return {
-            'timestamp': pd.Timestamp.now(),
+            'timestamp': pd.Timestamp.now(tz='UTC'),
             'close': float(ticker['last']),
             'open': float(ticker['open']),
             'high': float(ticker['high']),
@@ -33,14 +46,31 @@ class LiveTrading:
             'volume': float(ticker['volume']),
         }
 
+    def on_bar(self, bar):
+        """
+        Store one new bar, update the streaming indicators and let the strategy act on it.
+
+        Args:
+            bar (dict): Bar with at least 'timestamp' and 'close'.
+
+        Returns:
+            tuple: (fast, slow) indicator values for the bar.
+        """
+        self.bars.append_bar(bar)
+        fast_ind, slow_ind = self.indicators.update(bar['close'])
+        self.strategy.process_bar(bar['close'], fast_ind, slow_ind, bar['timestamp'])
+        return fast_ind, slow_ind
+
+    def history_frame(self, size=None):
+        """Recent bars from the history buffer as a DataFrame (e.g. for plotting)."""
+        return self.bars.to_frame(size)
+
     def start_trading(self):
         """Start the live trading loop."""
         logger.info("🚀 Starting Live Trading Loop...")
         try:
             while True:
-                new_data = self.fetch_live_data()
-                self.strategy.data = self.strategy.data.append(new_data, ignore_index=True)
-                self.strategy.run()
+                self.on_bar(self.fetch_live_data())
                 time.sleep(60)  # Adjust for your preferred frequency (e.g., 1 minute)
         except KeyboardInterrupt:
             logger.info("🛑 Live Trading Stopped Manually")
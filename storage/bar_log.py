@@ -0,0 +1,167 @@
+# storage/bar_log.py
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from storage.candle_store import COLUMNS
+
+LOG_NAME = 'wal.csv'
+SEALED_NAME = 'wal.sealed.csv'
+HWM_NAME = 'hwm'
+
+
+class BarLog:
+    def __init__(self, folder):
+        """
+        Append-only write-ahead log of new bars for one symbol, in front of a CandleStore.
+
+        Each bar is one CSV line (the columns of COLUMNS, timestamp in epoch ms) appended to
+        {folder}/wal.csv and synced to disk. The newest accepted timestamp (high-water mark) is
+        persisted in {folder}/hwm, so duplicate or late bars are rejected with one comparison
+        instead of a scan of the history. compact() seals the log and merges it into the store.
+
+        Args:
+            folder (str): Log folder of the symbol.
+        """
+        self.folder = folder
+        self.log_path = os.path.join(folder, LOG_NAME)
+        self.sealed_path = os.path.join(folder, SEALED_NAME)
+        self.hwm_path = os.path.join(folder, HWM_NAME)
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+        self._repair_tail()
+        self.high_water_mark = self._read_high_water_mark()
+        # Bars that reached the log before a crash could persist the mark
+        for path in (self.sealed_path, self.log_path):
+            newest = _newest_timestamp(path)
+            if newest is not None and (self.high_water_mark is None or newest > self.high_water_mark):
+                self.high_water_mark = newest
+
+    def __len__(self):
+        """Number of bars waiting for compaction."""
+        return sum(_count_lines(path) for path in (self.sealed_path, self.log_path))
+
+    def pending_timestamps(self):
+        """Sorted timestamps (epoch ms) of the logged bars that are not merged into the store yet."""
+        with self._lock:
+            parts = [read_segment(path)['timestamp'] for path in (self.sealed_path, self.log_path)]
+        return np.unique(np.concatenate(parts))
+
+    def advance(self, timestamp):
+        """Raise the high-water mark to timestamp (epoch ms), e.g. to the newest bar already in the store."""
+        with self._lock:
+            if timestamp is not None and (self.high_water_mark is None or timestamp > self.high_water_mark):
+                self.high_water_mark = int(timestamp)
+                self._write_high_water_mark()
+
+    def append(self, bar):
+        """
+        Append one bar if it is newer than the high-water mark.
+
+        Args:
+            bar (dict): 'timestamp' in epoch ms and the value columns of COLUMNS (missing ones are stored as NaN).
+
+        Returns:
+            bool: False when the bar was rejected as a duplicate or late bar.
+        """
+        timestamp = int(bar['timestamp'])
+        values = [float(bar[column]) if bar.get(column) is not None else math.nan for column in COLUMNS if column != 'timestamp']
+        line = ','.join([str(timestamp)] + [repr(value) for value in values]) + '\n'
+
+        with self._lock:
+            if self.high_water_mark is not None and timestamp <= self.high_water_mark:
+                return False
+            with open(self.log_path, 'a') as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+            self.high_water_mark = timestamp
+            self._write_high_water_mark()
+        return True
+
+    def compact(self, store, symbol):
+        """
+        Merge the logged bars into the store and start a new log.
+
+        The active log is sealed (renamed) under the lock, so appends continue into a fresh
+        file while the sealed segment is merged. Merging is idempotent: if the process stops
+        before the segment is removed, the next compaction merges it again.
+
+        Args:
+            store (CandleStore): Target store.
+            symbol (str): Symbol partition to write.
+
+        Returns:
+            int: Number of bars merged.
+        """
+        merged = 0
+        if os.path.isfile(self.sealed_path):
+            merged += self._merge_sealed(store, symbol)
+
+        with self._lock:
+            if not os.path.isfile(self.log_path) or os.path.getsize(self.log_path) == 0:
+                return merged
+            os.replace(self.log_path, self.sealed_path)
+        return merged + self._merge_sealed(store, symbol)
+
+    def _merge_sealed(self, store, symbol):
+        arrays = read_segment(self.sealed_path)
+        store.write_bars(symbol, arrays)
+        # Under the lock, so pending_timestamps() sees every bar in the log or in the store
+        with self._lock:
+            os.remove(self.sealed_path)
+        return len(arrays['timestamp'])
+
+    def _repair_tail(self):
+        """Drop a partially written last line left by a crash during append."""
+        if not os.path.isfile(self.log_path):
+            return
+        with open(self.log_path, 'rb+') as file:
+            content = file.read()
+            if content and not content.endswith(b'\n'):
+                file.truncate(content.rfind(b'\n') + 1)
+
+    def _read_high_water_mark(self):
+        if not os.path.isfile(self.hwm_path):
+            return None
+        with open(self.hwm_path) as file:
+            text = file.read().strip()
+        return int(text) if text else None
+
+    def _write_high_water_mark(self):
+        tmp_path = f"{self.hwm_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            file.write(str(self.high_water_mark))
+        os.replace(tmp_path, self.hwm_path)
+
+
+def read_segment(path):
+    """
+    Read a log segment into store arrays.
+
+    Returns:
+        dict: Column name -> array, in log order.
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMNS.items()}
+    # Values are logged with repr(), and the round-trip parser reads them back bit for bit
+    df = pd.read_csv(path, names=list(COLUMNS), header=None, dtype=COLUMNS, float_precision='round_trip')
+    return {column: df[column].to_numpy() for column in COLUMNS}
+
+
+def _newest_timestamp(path):
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return None
+    timestamps = read_segment(path)['timestamp']
+    return int(timestamps.max()) if len(timestamps) else None
+
+
+def _count_lines(path):
+    if not os.path.isfile(path):
+        return 0
+    with open(path, 'rb') as file:
+        return file.read().count(b'\n')
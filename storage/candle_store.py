@@ -0,0 +1,349 @@
+# storage/candle_store.py
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from storage.versioned_folder import POINTER_NAME, load_version, publish_version
+
+MS_PER_DAY = 86_400_000
+SNAPSHOT_FOLDER = '_snapshots'
+
+# Column schema of the store: epoch-millisecond timestamps and float64 values
+COLUMNS = {
+    'timestamp': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+    'quoteVolume': np.float64,
+}
+
+
+def to_epoch_ms(value, end_of_day=False):
+    """
+    Convert a date string or timestamp to UTC epoch milliseconds.
+
+    Args:
+        value (str, pd.Timestamp or int): Date or datetime, naive values are taken as UTC; ints are epoch ms already.
+        end_of_day (bool): For a date-only string, return the last millisecond of that day
+            (the same inclusive behaviour as DataFrame.loc['...':'YYYY-MM-DD']).
+
+    Returns:
+        int: Epoch milliseconds.
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    timestamp = pd.Timestamp(value)
+    timestamp = timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+    ms = timestamp.value // 1_000_000
+    if end_of_day and isinstance(value, str) and len(value.strip()) == 10:
+        ms += MS_PER_DAY - 1
+    return ms
+
+
+def day_of(ms):
+    """Partition name (YYYY-MM-DD) for epoch milliseconds."""
+    return str(np.datetime64(int(ms) // MS_PER_DAY, 'D'))
+
+
+def month_of(ms):
+    """Partition name (YYYY-MM) for epoch milliseconds."""
+    return str(np.datetime64(int(ms), 'ms').astype('datetime64[M]'))
+
+
+# Partition period -> (function naming the partition of a timestamp, length of the name)
+PARTITIONS = {
+    'day': (day_of, 10),
+    'month': (month_of, 7),
+}
+
+
+class CandleStore:
+    def __init__(self, root, partition='day', timeframes=None):
+        """
+        Columnar candle store partitioned by symbol and UTC day (or month).
+
+        Layout: {root}/{symbol}/{YYYY-MM-DD}/ with one {column}.npy file per column of COLUMNS.
+        Each partition is a versioned folder (see storage/versioned_folder.py), so a rewrite is
+        swapped in atomically while other threads or processes read it. Readers only open the
+        partitions that overlap the requested range and only the columns they ask for.
+
+        1-minute stores also keep rolled-up bars of higher timeframes (see storage/timeframes.py)
+        under {root}/_rollups; write_bars() updates the rollup buckets its bars fall into.
+
+        Args:
+            root (str): Store folder.
+            partition (str): Partition period, 'day' or 'month'.
+            timeframes (list, optional): Rollup timeframes kept up to date, defaults to
+                storage.timeframes.ROLLUP_TIMEFRAMES; pass () for none.
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"Partition period '{partition}' is not supported.")
+        self.root = root
+        self.partition = partition
+        self._partition_of, self._name_length = PARTITIONS[partition]
+        self._write_locks = {}  # symbol -> lock serializing write_bars() across threads
+        self._write_locks_guard = threading.Lock()
+        self.pyramid = None
+        if timeframes is None or timeframes:
+            from storage.timeframes import TimeframePyramid
+            self.pyramid = TimeframePyramid(self, timeframes)
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name)) and not name.startswith(('_', '.'))
+        )
+
+    def partitions(self, symbol):
+        """Sorted partition names of a symbol."""
+        folder = os.path.join(self.root, symbol)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name for name in os.listdir(folder) if len(name) == self._name_length and not name.startswith('.'))
+
+    def read_partition(self, symbol, name, columns=None):
+        """
+        Read one partition.
+
+        Returns:
+            dict: Column name -> array, or None when the partition does not exist.
+        """
+        folder = os.path.join(self.root, symbol, name)
+        if not os.path.isdir(folder):
+            return None
+        columns = list(columns or COLUMNS)
+
+        def load(path, pointer=None):
+            return {column: np.load(os.path.join(path, f"{column}.npy")) for column in columns}
+
+        current = load_version(folder, load)
+        if current is not None:
+            return current[1]
+        try:
+            # Partitions written before the versioned layout keep their columns in the folder itself
+            return load(folder)
+        except FileNotFoundError:
+            # Being migrated, or still being written for the first time
+            current = load_version(folder, load)
+            return current[1] if current is not None else None
+
+    def last_timestamp(self, symbol):
+        """Newest stored bar time in epoch ms (reads only the last partition), or None."""
+        for name in reversed(self.partitions(symbol)):
+            part = self.read_partition(symbol, name, ['timestamp'])
+            if part is not None:  # Skips a new partition that is still being written
+                return int(part['timestamp'][-1]) if len(part['timestamp']) else None
+        return None
+
+    def write_partition(self, symbol, name, arrays):
+        """
+        Replace one partition. The new files are written to a fresh version folder that is
+        swapped in atomically afterwards, so readers see either the old or the new partition,
+        never a half-written or missing one.
+
+        Args:
+            symbol (str): Symbol name.
+            name (str): Partition name (YYYY-MM-DD or YYYY-MM).
+            arrays (dict): Column name -> array for every column in COLUMNS, sorted by timestamp.
+        """
+        def write(path):
+            for column, dtype in COLUMNS.items():
+                np.save(os.path.join(path, f"{column}.npy"), np.ascontiguousarray(arrays[column], dtype=dtype))
+
+        publish_version(os.path.join(self.root, symbol, name), write, {})
+
+    def write_bars(self, symbol, arrays):
+        """
+        Merge bars into the store. Bars may span several partitions and may overlap stored bars;
+        for duplicate timestamps the new bar wins. Rollups of the affected buckets are rebuilt.
+        Writes of one symbol are serialized, so threads (e.g. compaction and a backfill) can
+        write the same symbol concurrently.
+
+        Args:
+            symbol (str): Symbol name.
+            arrays (dict): Column name -> array; 'timestamp' in epoch ms, missing columns are stored as NaN.
+
+        Returns:
+            list: Names of the partitions that were written.
+        """
+        timestamps = np.asarray(arrays['timestamp'], dtype=np.int64)
+        if not len(timestamps):
+            return []
+        with self._write_lock(symbol):
+            return self._write_bars(symbol, arrays, timestamps)
+
+    def _write_lock(self, symbol):
+        with self._write_locks_guard:
+            return self._write_locks.setdefault(symbol, threading.Lock())
+
+    def _write_bars(self, symbol, arrays, timestamps):
+        columns = {
+            column: (np.asarray(arrays[column], dtype=dtype) if column in arrays
+                     else np.full(len(timestamps), np.nan, dtype=dtype))
+            for column, dtype in COLUMNS.items()
+        }
+        columns['timestamp'] = timestamps
+
+        keys = self._partition_keys(timestamps)
+        order = np.argsort(keys, kind='stable')
+        boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+        written = []
+        for chunk in np.split(order, boundaries):
+            name = self._partition_of(timestamps[chunk[0]])
+            new = {column: values[chunk] for column, values in columns.items()}
+            existing = self.read_partition(symbol, name)
+            if existing is not None:
+                new = {column: np.concatenate([existing[column], new[column]]) for column in COLUMNS}
+            self.write_partition(symbol, name, _dedupe_sorted(new))
+            written.append(name)
+
+        if self.pyramid is not None:
+            self.pyramid.update(symbol, int(timestamps.min()), int(timestamps.max()))
+        return written
+
+    def _partition_keys(self, timestamps):
+        if self.partition == 'day':
+            return timestamps // MS_PER_DAY
+        return timestamps.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+
+    def read(self, symbol, start=None, end=None, columns=None):
+        """
+        Read the bars of a symbol between start and end (inclusive).
+
+        Args:
+            symbol (str): Symbol name.
+            start, end (str, pd.Timestamp or int, optional): Range bounds; date-only end strings include the whole day.
+            columns (list, optional): Columns to load besides 'timestamp', defaults to all.
+
+        Returns:
+            dict: Column name -> concatenated array.
+        """
+        columns = ['timestamp'] + [column for column in (columns or COLUMNS) if column != 'timestamp']
+        start_ms = to_epoch_ms(start) if start is not None else None
+        end_ms = to_epoch_ms(end, end_of_day=True) if end is not None else None
+        first = self._partition_of(start_ms) if start_ms is not None else None
+        last = self._partition_of(end_ms) if end_ms is not None else None
+
+        parts = []
+        for name in self.partitions(symbol):
+            if (first and name < first) or (last and name > last):
+                continue
+            part = self.read_partition(symbol, name, columns)
+            if part is not None:  # None while a new partition is written for the first time
+                parts.append(part)
+
+        if not parts:
+            return {column: np.empty(0, dtype=COLUMNS[column]) for column in columns}
+        result = {column: np.concatenate([part[column] for part in parts]) for column in columns}
+
+        return select_range(result, start_ms, end_ms)
+
+    def signature(self, symbol):
+        """Digest of the partition names and pointer identities of a symbol; changes whenever a partition is rewritten."""
+        digest = hashlib.blake2b(digest_size=16)
+        for name in self.partitions(symbol):
+            folder = os.path.join(self.root, symbol, name)
+            try:
+                # The pointer file is replaced by every rewrite
+                stat = os.stat(os.path.join(folder, POINTER_NAME))
+            except FileNotFoundError:
+                stat = os.stat(folder)
+            digest.update(f"{name}:{stat.st_ino}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()
+
+    def snapshot(self, symbol, timeframe='1m'):
+        """
+        All bars of a symbol as contiguous, read-only memory-mapped columns.
+
+        The snapshot ({root}/_snapshots/{timeframe}/{symbol}/) is rebuilt when any partition
+        changed since it was written, and a rebuild is swapped in atomically (see
+        storage/versioned_folder.py), so concurrent readers never see a half-removed one.
+        Every process mapping it shares one page-cached copy of the data, and slices of the
+        returned arrays are views.
+
+        Args:
+            symbol (str): Symbol name.
+            timeframe (str): '1m' or one of the rollup timeframes.
+
+        Returns:
+            dict: Column name -> np.memmap (mode 'r'), sorted by 'timestamp'.
+        """
+        if timeframe == '1m':
+            source = self
+        elif self.pyramid is not None:
+            source = self.pyramid.rollup(symbol, timeframe)
+        else:
+            raise ValueError(f"Timeframe '{timeframe}' is not available in a store without rollups.")
+
+        folder = os.path.join(self.root, SNAPSHOT_FOLDER, timeframe, symbol)
+        signature = source.signature(symbol)
+        current = load_version(folder, _open_snapshot)
+        if current is not None and current[0]['signature'] == signature:
+            return current[1]
+
+        arrays = source.read(symbol)
+
+        def write(path):
+            for column, values in arrays.items():
+                np.save(os.path.join(path, f"{column}.npy"), np.ascontiguousarray(values, dtype=COLUMNS[column]))
+
+        pointer = publish_version(folder, write, {'signature': signature})
+        return _open_snapshot(os.path.join(folder, pointer['version']), pointer)
+
+    def read_frame(self, symbol, start=None, end=None, columns=None, timeframe='1m'):
+        """
+        Read bars as a DataFrame indexed by UTC timestamp.
+
+        Args:
+            timeframe (str): '1m' for the stored minutes or one of the rollup timeframes (e.g. '1h').
+
+        Returns:
+            pd.DataFrame: Requested columns with a 'timestamp' DatetimeIndex.
+        """
+        if timeframe == '1m':
+            arrays = self.read(symbol, start, end, columns)
+        elif self.pyramid is not None:
+            arrays = self.pyramid.read(symbol, timeframe, start, end, columns)
+        else:
+            raise ValueError(f"Timeframe '{timeframe}' is not available in a store without rollups.")
+        index = pd.to_datetime(arrays.pop('timestamp'), unit='ms', utc=True).rename('timestamp')
+        return pd.DataFrame(arrays, index=index)
+
+
+def select_range(arrays, start=None, end=None):
+    """
+    Slice sorted columns to start..end (inclusive) with a binary search on 'timestamp'.
+
+    Args:
+        arrays (dict): Column name -> array sorted by 'timestamp' (epoch ms).
+        start, end (str, pd.Timestamp or int, optional): Range bounds; date-only end strings include the whole day.
+
+    Returns:
+        dict: Column name -> slice (a view of the input arrays).
+    """
+    timestamps = arrays['timestamp']
+    lo = np.searchsorted(timestamps, to_epoch_ms(start), side='left') if start is not None else 0
+    hi = np.searchsorted(timestamps, to_epoch_ms(end, end_of_day=True), side='right') if end is not None else len(timestamps)
+    return {column: values[lo:hi] for column, values in arrays.items()}
+
+
+def _open_snapshot(path, pointer):
+    return {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode='r') for column in COLUMNS}
+
+
+def _dedupe_sorted(arrays):
+    """Sort bars by timestamp and keep the last occurrence of every timestamp."""
+    timestamps = arrays['timestamp']
+    order = np.argsort(timestamps, kind='stable')
+    sorted_timestamps = timestamps[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[:-1] = sorted_timestamps[1:] != sorted_timestamps[:-1]
+    order = order[keep]
+    return {column: values[order] for column, values in arrays.items()}
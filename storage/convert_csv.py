@@ -0,0 +1,65 @@
+# storage/convert_csv.py
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from storage.candle_store import CandleStore
+from utils.logger import logger, setup_logging
+
+# CSV column -> store column (the 'price' column of the CSV is the close price)
+CSV_COLUMNS = {
+    'price': 'close',
+    'open': 'open',
+    'high': 'high',
+    'low': 'low',
+    'volume': 'volume',
+    'quoteVolume': 'quoteVolume',
+}
+
+
+def to_epoch_ms_array(timestamps):
+    """Parse ISO timestamp strings into int64 UTC epoch milliseconds."""
+    parsed = pd.to_datetime(timestamps, utc=True, format='ISO8601')
+    return parsed.dt.tz_convert(None).to_numpy().astype('datetime64[ms]').astype(np.int64)
+
+
+def convert_csv(csv_path, store_root, symbol, chunksize=1_000_000):
+    """
+    One-time conversion of a data_handler CSV (e.g. data/BTCUSD.csv) into a CandleStore.
+
+    Args:
+        csv_path (str): Source CSV file.
+        store_root (str): CandleStore folder.
+        symbol (str): Symbol to store the bars under.
+        chunksize (int): Rows parsed per chunk, bounds memory use.
+
+    Returns:
+        int: Number of CSV rows converted.
+    """
+    store = CandleStore(store_root)
+    total_rows = 0
+    usecols = ['timestamp', *CSV_COLUMNS]
+    for chunk in pd.read_csv(csv_path, usecols=lambda column: column in usecols, chunksize=chunksize):
+        arrays = {'timestamp': to_epoch_ms_array(chunk['timestamp'])}
+        for csv_column, store_column in CSV_COLUMNS.items():
+            if csv_column in chunk.columns:
+                arrays[store_column] = pd.to_numeric(chunk[csv_column], errors='coerce').to_numpy(dtype=np.float64)
+        partitions = store.write_bars(symbol, arrays)
+        total_rows += len(chunk)
+        logger.info(f"📦 Converted {total_rows} rows ({len(partitions)} day partitions in this chunk)")
+
+    logger.info(f"✅ {csv_path} converted into {store_root}/{symbol}")
+    return total_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a candle CSV into the columnar candle store.")
+    parser.add_argument('csv_path', help="Source CSV, e.g. ./data/BTCUSD.csv")
+    parser.add_argument('store_root', help="Store folder, e.g. ./data/store")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--log-file', default='./logs/convert_csv.log')
+    args = parser.parse_args()
+    setup_logging(args.log_file)
+    convert_csv(args.csv_path, args.store_root, args.symbol, args.chunksize)
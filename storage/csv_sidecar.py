@@ -0,0 +1,94 @@
+# storage/csv_sidecar.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage.candle_store import COLUMNS
+from storage.convert_csv import CSV_COLUMNS, to_epoch_ms_array
+from storage.versioned_folder import load_version, publish_version
+
+SIDECAR_SUFFIX = '.sidecar'
+SIDECAR_VERSION = 2
+
+# Explicit CSV schema: no dtype inference, unused text columns are never parsed
+CSV_DTYPES = {csv_column: np.float64 for csv_column in CSV_COLUMNS}
+CSV_DTYPES['timestamp'] = str
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+def sidecar_path(csv_path):
+    return f"{csv_path}{SIDECAR_SUFFIX}"
+
+
+def _source_signature(csv_path):
+    stat = os.stat(csv_path)
+    return {'version': SIDECAR_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def parse_csv(csv_path):
+    """
+    Parse a data_handler CSV with the typed schema into store columns sorted by time.
+
+    Returns:
+        dict: Column name -> array ('timestamp' in epoch ms, 'price' renamed to 'close').
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [column for column in CSV_DTYPES if column in header]
+    df = pd.read_csv(
+        csv_path,
+        usecols=usecols,
+        dtype={column: CSV_DTYPES[column] for column in usecols},
+        engine=CSV_ENGINE
+    )
+    arrays = {'timestamp': to_epoch_ms_array(df['timestamp'])}
+    for csv_column, store_column in CSV_COLUMNS.items():
+        if csv_column in df.columns:
+            arrays[store_column] = df[csv_column].to_numpy(dtype=np.float64)
+
+    timestamps = arrays['timestamp']
+    if len(timestamps) and np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        arrays = {column: values[order] for column, values in arrays.items()}
+    return arrays
+
+
+def _open_columns(path, pointer):
+    return {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode='r') for column in pointer['columns']}
+
+
+def load_csv_columns(csv_path):
+    """
+    Columns of a CSV, parsed once and then served from a binary sidecar.
+
+    The sidecar ({csv_path}.sidecar/) holds one .npy file per column and the size and
+    mtime of the CSV it was built from; any change to the CSV rebuilds it. A rebuild writes
+    a new version that is swapped in atomically (see storage/versioned_folder.py), so
+    concurrent readers never see a half-written or deleted sidecar. Columns are always
+    memory-mapped, so a later date-range slice only reads the pages it touches.
+
+    Args:
+        csv_path (str): data_handler CSV file.
+
+    Returns:
+        dict: Column name -> read-only memory-mapped array, sorted by 'timestamp' (epoch ms).
+    """
+    folder = sidecar_path(csv_path)
+    signature = _source_signature(csv_path)
+    current = load_version(folder, _open_columns)
+    if current is not None and current[0]['source'] == signature:
+        return current[1]
+
+    arrays = parse_csv(csv_path)
+
+    def write(path):
+        for column, values in arrays.items():
+            np.save(os.path.join(path, f"{column}.npy"), np.ascontiguousarray(values, dtype=COLUMNS[column]))
+
+    pointer = publish_version(folder, write, {'source': signature, 'columns': list(arrays)})
+    return _open_columns(os.path.join(folder, pointer['version']), pointer)
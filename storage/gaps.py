@@ -0,0 +1,58 @@
+# storage/gaps.py
+import numpy as np
+
+MS_PER_MINUTE = 60_000
+
+
+def find_gaps(timestamps, start=None, end=None):
+    """
+    Find the runs of missing 1-minute bars.
+
+    Works on epoch minutes: np.diff over the sorted timestamps marks every place where the
+    next bar is more than one minute away, so the whole history is scanned in one pass.
+
+    Args:
+        timestamps (np.ndarray): Sorted bar times in epoch ms.
+        start (int, optional): First expected bar (epoch ms); bars before the first stored one are missing.
+        end (int, optional): Last expected bar (epoch ms); bars after the last stored one are missing.
+
+    Returns:
+        tuple: (gap_starts, gap_ends) int64 epoch-ms arrays; each gap is the half-open range [start, end).
+    """
+    minutes = np.asarray(timestamps, dtype=np.int64) // MS_PER_MINUTE
+    start_minute = start // MS_PER_MINUTE if start is not None else None
+    end_minute = end // MS_PER_MINUTE if end is not None else None
+
+    if not len(minutes):
+        if start_minute is None or end_minute is None or end_minute < start_minute:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.array([start_minute]) * MS_PER_MINUTE, np.array([end_minute + 1]) * MS_PER_MINUTE
+
+    jumps = np.flatnonzero(np.diff(minutes) > 1)
+    gap_starts = minutes[jumps] + 1
+    gap_ends = minutes[jumps + 1]
+    if start_minute is not None and start_minute < minutes[0]:
+        gap_starts = np.concatenate([[start_minute], gap_starts])
+        gap_ends = np.concatenate([[minutes[0]], gap_ends])
+    if end_minute is not None and end_minute > minutes[-1]:
+        gap_starts = np.concatenate([gap_starts, [minutes[-1] + 1]])
+        gap_ends = np.concatenate([gap_ends, [end_minute + 1]])
+    return gap_starts * MS_PER_MINUTE, gap_ends * MS_PER_MINUTE
+
+
+def missing_mask(existing, timestamps):
+    """
+    Which timestamps are not in existing.
+
+    Args:
+        existing (np.ndarray): Sorted epoch-ms timestamps already stored.
+        timestamps (np.ndarray): Candidate epoch-ms timestamps.
+
+    Returns:
+        np.ndarray: Boolean mask over timestamps, True where the bar is missing.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not len(existing):
+        return np.ones(len(timestamps), dtype=bool)
+    positions = np.minimum(np.searchsorted(existing, timestamps), len(existing) - 1)
+    return existing[positions] != timestamps
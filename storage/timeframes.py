@@ -0,0 +1,138 @@
+# storage/timeframes.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage.candle_store import CandleStore, to_epoch_ms
+
+# Supported timeframes in minutes; every one divides a UTC day, so buckets nest inside 1d buckets
+TIMEFRAME_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '15m': 15,
+    '1h': 60,
+    '4h': 240,
+    '1d': 1440,
+}
+ROLLUP_TIMEFRAMES = ('5m', '15m', '1h', '4h', '1d')
+ROLLUP_FOLDER = '_rollups'
+
+
+def timeframe_ms(timeframe):
+    if timeframe not in TIMEFRAME_MINUTES:
+        raise ValueError(f"Timeframe '{timeframe}' is not supported. Options: {', '.join(TIMEFRAME_MINUTES)}")
+    return TIMEFRAME_MINUTES[timeframe] * 60_000
+
+
+def resample_bars(arrays, timeframe):
+    """
+    Aggregate sorted bars into timeframe buckets aligned to UTC (a bucket's timestamp is its start).
+
+    open is the first open, high the max, low the min, close the last close and the
+    volumes are summed; NaN values are ignored. Only the columns present are aggregated.
+
+    Args:
+        arrays (dict): Column name -> array with 'timestamp' in epoch ms, sorted by time.
+        timeframe (str): Target timeframe, e.g. '1h'.
+
+    Returns:
+        dict: Column name -> aggregated array.
+    """
+    size = timeframe_ms(timeframe)
+    buckets = np.asarray(arrays['timestamp'], dtype=np.int64) // size * size
+    if not len(buckets):
+        return {column: values[:0] for column, values in arrays.items()}
+    firsts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    lasts = np.concatenate([firsts[1:], [len(buckets)]]) - 1
+
+    result = {'timestamp': buckets[firsts]}
+    for column, values in arrays.items():
+        if column == 'open':
+            result[column] = values[firsts]
+        elif column == 'high':
+            result[column] = np.fmax.reduceat(values, firsts)
+        elif column == 'low':
+            result[column] = np.fmin.reduceat(values, firsts)
+        elif column == 'close':
+            result[column] = values[lasts]
+        elif column in ('volume', 'quoteVolume'):
+            result[column] = np.add.reduceat(np.nan_to_num(values), firsts)
+    return result
+
+
+def resample_frame(df, timeframe):
+    """Aggregate an OHLCV DataFrame with a UTC DatetimeIndex into timeframe bars (see resample_bars)."""
+    columns = [column for column in ('open', 'high', 'low', 'close', 'volume', 'quoteVolume') if column in df.columns]
+    arrays = {'timestamp': df.index.values.astype('datetime64[ms]').astype(np.int64)}
+    arrays.update({column: df[column].to_numpy(dtype=np.float64) for column in columns})
+    bars = resample_bars(arrays, timeframe)
+    index = pd.to_datetime(bars.pop('timestamp'), unit='ms', utc=True).rename(df.index.name or 'timestamp')
+    return pd.DataFrame(bars, index=index)
+
+
+class TimeframePyramid:
+    def __init__(self, store, timeframes=None):
+        """
+        Rolled-up OHLCV bars of a 1-minute CandleStore.
+
+        Each timeframe is a month-partitioned CandleStore under {root}/_rollups/{timeframe}.
+        update() rebuilds only the buckets touched by newly written minutes, so the rollups
+        stay current at a cost proportional to the new data; read() builds a missing rollup
+        from the minutes on first use.
+
+        Args:
+            store (CandleStore): 1-minute store.
+            timeframes (list, optional): Maintained timeframes, defaults to ROLLUP_TIMEFRAMES.
+        """
+        self.store = store
+        self.timeframes = tuple(timeframes or ROLLUP_TIMEFRAMES)
+        for timeframe in self.timeframes:
+            timeframe_ms(timeframe)
+        self._outer_ms = max(timeframe_ms(timeframe) for timeframe in self.timeframes)
+        self.rollups = {
+            timeframe: CandleStore(os.path.join(store.root, ROLLUP_FOLDER, timeframe), partition='month', timeframes=())
+            for timeframe in self.timeframes
+        }
+
+    def update(self, symbol, start, end):
+        """
+        Rebuild every rollup bucket overlapping [start, end] from the 1-minute bars.
+
+        Args:
+            symbol (str): Symbol name.
+            start, end (int): Epoch-ms range of the new minutes.
+        """
+        first = start // self._outer_ms * self._outer_ms
+        last = end // self._outer_ms * self._outer_ms + self._outer_ms - 1
+        minutes = self.store.read(symbol, first, last)
+        if not len(minutes['timestamp']):
+            return
+        for timeframe, rollup in self.rollups.items():
+            rollup.write_bars(symbol, resample_bars(minutes, timeframe))
+
+    def rebuild(self, symbol):
+        """Build every rollup of a symbol from all stored minutes, one month at a time."""
+        partitions = self.store.partitions(symbol)
+        months = sorted({name[:7] for name in partitions})
+        for month in months:
+            names = [name for name in partitions if name.startswith(month)]
+            self.update(symbol, to_epoch_ms(names[0]), to_epoch_ms(names[-1], end_of_day=True))
+
+    def read(self, symbol, timeframe, start=None, end=None, columns=None):
+        """
+        Read rolled-up bars whose bucket starts between start and end (inclusive).
+
+        Returns:
+            dict: Column name -> array, like CandleStore.read().
+        """
+        return self.rollup(symbol, timeframe).read(symbol, start, end, columns)
+
+    def rollup(self, symbol, timeframe):
+        """Rollup store of a timeframe, built from the minutes first if the symbol has none yet."""
+        if timeframe not in self.rollups:
+            raise ValueError(f"Timeframe '{timeframe}' is not maintained. Options: 1m, {', '.join(self.timeframes)}")
+        rollup = self.rollups[timeframe]
+        if not rollup.partitions(symbol) and self.store.partitions(symbol):
+            self.rebuild(symbol)
+        return rollup
@@ -0,0 +1,101 @@
+# storage/versioned_folder.py
+import json
+import os
+import shutil
+import time
+import uuid
+
+POINTER_NAME = 'current.json'
+TMP_SUFFIX = '.tmp'
+VERSION_PREFIX = 'v-'
+# Unreferenced versions are kept this long after they were written, covering the moment between a
+# concurrent build's rename and its pointer update; unfinished builds (e.g. of a crashed process) longer
+VERSION_GRACE_SECONDS = 60
+BUILD_GRACE_SECONDS = 600
+
+
+def read_pointer(folder):
+    """Metadata of the current version of a folder ('version' names its subfolder), or None."""
+    try:
+        with open(os.path.join(folder, POINTER_NAME)) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def publish_version(folder, write, meta):
+    """
+    Build a new version of a folder and make it current atomically.
+
+    write(path) fills a fresh version subfolder. Then {folder}/current.json is replaced with
+    os.replace, so readers see either the previous or the new version, never a mix.
+    Superseded versions are removed; processes that mapped their files keep reading them
+    until they unmap, and readers that had not opened them yet move on to the new version
+    (see load_version).
+
+    Args:
+        folder (str): Versioned folder, created if needed.
+        write (callable): Called with the path of the new version subfolder.
+        meta (dict): JSON metadata stored in the pointer.
+
+    Returns:
+        dict: The new pointer (meta plus 'version').
+    """
+    os.makedirs(folder, exist_ok=True)
+    version = f"{VERSION_PREFIX}{uuid.uuid4().hex}"
+    tmp_path = os.path.join(folder, f"{version}{TMP_SUFFIX}")
+    os.makedirs(tmp_path)
+    write(tmp_path)
+    os.rename(tmp_path, os.path.join(folder, version))
+
+    pointer = dict(meta, version=version)
+    pointer_tmp = os.path.join(folder, f"{POINTER_NAME}.{uuid.uuid4().hex}{TMP_SUFFIX}")
+    with open(pointer_tmp, 'w') as file:
+        json.dump(pointer, file)
+    os.replace(pointer_tmp, os.path.join(folder, POINTER_NAME))
+    _remove_stale(folder, version)
+    return pointer
+
+
+def load_version(folder, load, attempts=3):
+    """
+    Open the current version of a folder.
+
+    Args:
+        folder (str): Versioned folder.
+        load (callable): load(version_path, pointer) returning the opened data.
+        attempts (int): Pointer reads before giving up when versions are replaced concurrently.
+
+    Returns:
+        tuple: (pointer, data), or None when the folder has no current version.
+    """
+    for attempt in range(attempts):
+        pointer = read_pointer(folder)
+        if pointer is None:
+            return None
+        try:
+            return pointer, load(os.path.join(folder, pointer['version']), pointer)
+        except FileNotFoundError:
+            # Superseded and removed after the pointer was read; the pointer names a newer version now
+            if attempt == attempts - 1:
+                raise
+
+
+def _remove_stale(folder, version):
+    # Keeps the version just published, the current one and anything recent (e.g. a concurrent build)
+    current = (read_pointer(folder) or {}).get('version')
+    now = time.time()
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if name in (POINTER_NAME, version, current):
+            continue
+        grace = BUILD_GRACE_SECONDS if name.endswith(TMP_SUFFIX) else VERSION_GRACE_SECONDS
+        try:
+            if name.startswith((VERSION_PREFIX, POINTER_NAME)) and now - os.path.getmtime(path) < grace:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)  # Files of the unversioned layout and abandoned pointer writes
+        except OSError:
+            pass  # Removed concurrently, or still mapped on platforms that do not allow it
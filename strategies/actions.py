@@ -0,0 +1,16 @@
+# strategies/actions.py
+# Action codes of the trade ledger and the compiled engines (kept free of numba so they import fast)
+ACTION_NONE = 0
+ACTION_GO_LONG = 1
+ACTION_CLOSE_LONG = 2
+ACTION_GO_SHORT = 3
+ACTION_CLOSE_SHORT = 4
+ACTION_STOP_LOSS = 5
+
+ACTION_NAMES = {
+    ACTION_GO_LONG: 'GO_LONG',
+    ACTION_CLOSE_LONG: 'CLOSE_LONG',
+    ACTION_GO_SHORT: 'GO_SHORT',
+    ACTION_CLOSE_SHORT: 'CLOSE_SHORT',
+    ACTION_STOP_LOSS: 'STOP-LOSS',
+}
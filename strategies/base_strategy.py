@@ -1,6 +1,7 @@
 # strategies/base_strategy.py
 import pandas as pd
-from utils.logger import logger
+from strategies.trade_ledger import TradeLedger
+from utils.logger import logger, trade_logger
 
 
 class BaseStrategy:
@@ -43,9 +44,28 @@ class BaseStrategy:
         self.short_profit = 0
         self.short_loss = 0
 
-        self.data['Action'] = None
+        # Trades are kept in a compact ledger; current_bar is the row the execute_* methods record
+        self.ledger = TradeLedger()
+        self.current_bar = -1  # No bar processed yet
+        self._actions = None
         logger.info("📊 Base Strategy Initialized")
 
+    @property
+    def actions(self):
+        """
+        Action of every bar of the data as a categorical Series (NaN on bars without a trade).
+
+        Built from the ledger on first access and rebuilt only after new trades. In live trading
+        the bars run past the data; the Series then covers every processed bar, indexed by bar number.
+        """
+        if self._actions is None or self._actions[0] != len(self.ledger):
+            bars = self.ledger.records['bar']
+            length = max(len(self.data), self.current_bar + 1, int(bars.max()) + 1 if len(bars) else 0)
+            index = self.data.index if length == len(self.data) else pd.RangeIndex(length)
+            column = pd.Series(self.ledger.action_codes(length), index=index, name='Action')
+            self._actions = (len(self.ledger), column)
+        return self._actions[1]
+
     def calculate_close_long_price(self, entry_price):
         return entry_price * (1 + self.profit_target + 2 * self.trade_fee)
 
@@ -66,26 +86,26 @@ class BaseStrategy:
             percentage_loss = (loss / (self.entry_price * self.assets)) * 100
             self.short_loss += abs(loss)
         else:
-            logger.warning("⚠️ STOP-LOSS Triggered but no active position found. Skipping...")
+            trade_logger.warning("⚠️ STOP-LOSS Triggered but no active position found. Skipping...")
             return
 
         fee = current_price * self.assets * self.trade_fee
         self.total_fees += fee
         self.balance = (self.entry_price * self.assets) - abs(loss)
+        self.ledger.append(self.current_bar, 'STOP-LOSS', current_price, self.assets, fee, -abs(loss))
         self.current_position = 0
         self.assets = 0
 
-        logger.warning(
-            f"🛑 STOP-LOSS Triggered | Position: {self.current_position}, Price: {current_price:.2f}, "
-            f"Loss: ${loss:.2f} ({percentage_loss:.2f}%), Fee: ${fee:.2f}, New Balance: ${self.balance:.2f}, Timestamp: {timestamp}"
+        trade_logger.warning(
+            "🛑 STOP-LOSS Triggered | Position: %s, Price: %.2f, Loss: $%.2f (%.2f%%), Fee: $%.2f, "
+            "New Balance: $%.2f, Timestamp: %s",
+            self.current_position, current_price, loss, percentage_loss, fee, self.balance, timestamp
         )
 
-        self.data.at[timestamp, 'Action'] = 'STOP-LOSS'
-
     # === LONG POSITION LOGIC ===
     def execute_go_long(self, current_price, timestamp):
         if not self.enable_longing:
-            logger.warning("🛑 GO_LONG is disabled via ENABLE_LONGING.")
+            trade_logger.warning("🛑 GO_LONG is disabled via ENABLE_LONGING.")
             return
 
         self.assets = self.balance / current_price
@@ -95,12 +115,12 @@ class BaseStrategy:
         fee = current_price * self.assets * self.trade_fee
         self.total_fees += fee
 
-        logger.info(
-            f"🟢 GO_LONG Triggered | Price: {current_price:.2f}, Assets: {self.assets:.6f}, "
-            f"Stop-Loss: {self.stop_loss_price}, Fee: ${fee:.2f}, Timestamp: {timestamp}"
+        trade_logger.info(
+            "🟢 GO_LONG Triggered | Price: %.2f, Assets: %.6f, Stop-Loss: %s, Fee: $%.2f, Timestamp: %s",
+            current_price, self.assets, self.stop_loss_price, fee, timestamp
         )
 
-        self.data.at[timestamp, 'Action'] = 'GO_LONG'
+        self.ledger.append(self.current_bar, 'GO_LONG', current_price, self.assets, fee, 0.0)
         self.balance = 0
         self.current_position = 1
 
@@ -117,19 +137,19 @@ class BaseStrategy:
         self.total_fees += fee
         self.balance = (self.entry_price * self.assets) + profit
 
-        logger.info(
-            f"🔴 CLOSE_LONG Triggered | Price: {current_price:.2f}, Profit: ${profit:.2f} "
-            f"({percentage_gain:.2f}%), Fee: ${fee:.2f}, New Balance: ${self.balance:.2f}, Timestamp: {timestamp}"
+        trade_logger.info(
+            "🔴 CLOSE_LONG Triggered | Price: %.2f, Profit: $%.2f (%.2f%%), Fee: $%.2f, New Balance: $%.2f, Timestamp: %s",
+            current_price, profit, percentage_gain, fee, self.balance, timestamp
         )
 
-        self.data.at[timestamp, 'Action'] = 'CLOSE_LONG'
+        self.ledger.append(self.current_bar, 'CLOSE_LONG', current_price, self.assets, fee, profit)
         self.current_position = 0
         self.assets = 0
 
     # === SHORT POSITION LOGIC ===
     def execute_go_short(self, current_price, timestamp):
         if not self.enable_shorting:
-            logger.warning("🛑 GO_SHORT is disabled via ENABLE_SHORTING.")
+            trade_logger.warning("🛑 GO_SHORT is disabled via ENABLE_SHORTING.")
             return
 
         self.assets = self.balance / current_price
@@ -139,12 +159,12 @@ class BaseStrategy:
         fee = current_price * self.assets * self.trade_fee
         self.total_fees += fee
 
-        logger.info(
-            f"🔻 GO_SHORT Triggered | Price: {current_price:.2f}, Assets: {self.assets:.6f}, "
-            f"Stop-Loss: {self.stop_loss_price}, Fee: ${fee:.2f}, Timestamp: {timestamp}"
+        trade_logger.info(
+            "🔻 GO_SHORT Triggered | Price: %.2f, Assets: %.6f, Stop-Loss: %s, Fee: $%.2f, Timestamp: %s",
+            current_price, self.assets, self.stop_loss_price, fee, timestamp
         )
 
-        self.data.at[timestamp, 'Action'] = 'GO_SHORT'
+        self.ledger.append(self.current_bar, 'GO_SHORT', current_price, self.assets, fee, 0.0)
         self.balance = 0
         self.current_position = -1
 
@@ -161,12 +181,12 @@ class BaseStrategy:
         self.total_fees += fee
         self.balance = (self.entry_price * self.assets) + profit
 
-        logger.info(
-            f"🔼 CLOSE_SHORT Triggered | Price: {current_price:.2f}, Profit: ${profit:.2f} "
-            f"({percentage_gain:.2f}%), Fee: ${fee:.2f}, New Balance: ${self.balance:.2f}, Timestamp: {timestamp}"
+        trade_logger.info(
+            "🔼 CLOSE_SHORT Triggered | Price: %.2f, Profit: $%.2f (%.2f%%), Fee: $%.2f, New Balance: $%.2f, Timestamp: %s",
+            current_price, profit, percentage_gain, fee, self.balance, timestamp
         )
 
-        self.data.at[timestamp, 'Action'] = 'CLOSE_SHORT'
+        self.ledger.append(self.current_bar, 'CLOSE_SHORT', current_price, self.assets, fee, profit)
         self.current_position = 0
         self.assets = 0
 
@@ -0,0 +1,601 @@
+# strategies/engine.py
+import numpy as np
+from numba import njit
+
+from strategies.actions import (
+    ACTION_NONE, ACTION_GO_LONG, ACTION_CLOSE_LONG, ACTION_GO_SHORT, ACTION_CLOSE_SHORT, ACTION_STOP_LOSS
+)
+
+# Error codes returned by the compiled engine
+ENGINE_OK = 0
+ENGINE_INVALID_LONG_EXIT = 1
+ENGINE_INVALID_SHORT_EXIT = 2
+
+# Strategy parameter vector layout
+P_TRADE_FEE = 0
+P_PROFIT_TARGET = 1
+P_STOP_LOSS = 2
+P_ENABLE_STOP_LOSS = 3
+P_ENABLE_LONGING = 4
+P_ENABLE_SHORTING = 5
+P_ENABLE_PROFIT_TARGET = 6
+P_CLOSE_LONG_ON_DOWNTREND = 7
+P_CLOSE_SHORT_ON_UPTREND = 8
+N_PARAMS = 9
+
+# Strategy state vector layout (mirrors the BaseStrategy attributes)
+S_BALANCE = 0
+S_POSITION = 1
+S_ENTRY_PRICE = 2
+S_STOP_LOSS_PRICE = 3
+S_ASSETS = 4
+S_UPTREND_TRIGGERED = 5
+S_DOWNTREND_TRIGGERED = 6
+S_TOTAL_FEES = 7
+S_LONG_PROFIT = 8
+S_LONG_LOSS = 9
+S_SHORT_PROFIT = 10
+S_SHORT_LOSS = 11
+N_STATE = 12
+
+
+def make_params(trade_fee, profit_target, stop_loss, enable_stop_loss, enable_longing, enable_shorting,
+                enable_profit_target, enable_close_long_on_downtrend, enable_close_short_on_uptrend):
+    """Pack GenericStrategy settings into an engine parameter vector."""
+    return np.array([
+        trade_fee, profit_target, stop_loss, enable_stop_loss, enable_longing, enable_shorting,
+        enable_profit_target, enable_close_long_on_downtrend, enable_close_short_on_uptrend
+    ], dtype=np.float64)
+
+
+def make_state(balance, current_position=0, entry_price=None, stop_loss_price=None, assets=0,
+               uptrend_triggered=False, downtrend_triggered=False, total_fees=0,
+               long_profit=0, long_loss=0, short_profit=0, short_loss=0):
+    """Pack strategy state into an engine state vector (unset prices become NaN)."""
+    return np.array([
+        balance, current_position,
+        np.nan if entry_price is None else entry_price,
+        np.nan if stop_loss_price is None else stop_loss_price,
+        assets, uptrend_triggered, downtrend_triggered, total_fees,
+        long_profit, long_loss, short_profit, short_loss
+    ], dtype=np.float64)
+
+
+# Trade values layout (one row per trade, next to its bar and action code)
+T_PRICE = 0
+T_ASSETS = 1
+T_FEE = 2
+T_PNL = 3
+N_TRADE_VALUES = 4
+
+
+@njit(cache=True)
+def _record_trade(trade_bars, trade_actions, trade_values, n_trades, bar, action, price, values):
+    """Append a trade to the log, doubling the buffers when they are full."""
+    if n_trades == trade_bars.shape[0]:
+        capacity = trade_bars.shape[0] * 2
+        new_bars = np.empty(capacity, dtype=np.int64)
+        new_actions = np.empty(capacity, dtype=np.int8)
+        new_values = np.empty((capacity, N_TRADE_VALUES), dtype=np.float64)
+        new_bars[:n_trades] = trade_bars
+        new_actions[:n_trades] = trade_actions
+        new_values[:n_trades] = trade_values
+        trade_bars, trade_actions, trade_values = new_bars, new_actions, new_values
+
+    trade_bars[n_trades] = bar
+    trade_actions[n_trades] = action
+    trade_values[n_trades, T_PRICE] = price
+    trade_values[n_trades, T_ASSETS] = values[0]
+    trade_values[n_trades, T_FEE] = values[1]
+    trade_values[n_trades, T_PNL] = values[2]
+    return trade_bars, trade_actions, trade_values, n_trades + 1
+
+
+@njit(cache=True)
+def _open_position(state, params, current_price, position, trade):
+    trade_fee = params[P_TRADE_FEE]
+    state[S_ASSETS] = state[S_BALANCE] / current_price
+    state[S_ENTRY_PRICE] = current_price
+    if params[P_ENABLE_STOP_LOSS] != 0.0:
+        if position == 1:
+            state[S_STOP_LOSS_PRICE] = current_price * (1 - params[P_STOP_LOSS])
+        else:
+            state[S_STOP_LOSS_PRICE] = current_price * (1 + params[P_STOP_LOSS])
+    fee = current_price * state[S_ASSETS] * trade_fee
+    state[S_TOTAL_FEES] += fee
+    state[S_BALANCE] = 0.0
+    state[S_POSITION] = position
+    trade[0] = state[S_ASSETS]
+    trade[1] = fee
+    trade[2] = 0.0
+
+
+@njit(cache=True)
+def _stop_loss(state, params, current_price, trade):
+    trade_fee = params[P_TRADE_FEE]
+    entry_price = state[S_ENTRY_PRICE]
+    assets = state[S_ASSETS]
+    if state[S_POSITION] == 1:
+        loss = (entry_price - current_price) * assets * (1 - 2 * trade_fee)
+        state[S_LONG_LOSS] += abs(loss)
+    else:
+        loss = (current_price - entry_price) * assets * (1 - 2 * trade_fee)
+        state[S_SHORT_LOSS] += abs(loss)
+    fee = current_price * assets * trade_fee
+    state[S_TOTAL_FEES] += fee
+    state[S_BALANCE] = (entry_price * assets) - abs(loss)
+    state[S_POSITION] = 0
+    state[S_ASSETS] = 0.0
+    trade[0] = assets
+    trade[1] = fee
+    trade[2] = -abs(loss)
+
+
+@njit(cache=True)
+def _close_position(state, params, current_price, trade):
+    trade_fee = params[P_TRADE_FEE]
+    entry_price = state[S_ENTRY_PRICE]
+    assets = state[S_ASSETS]
+    if state[S_POSITION] == 1:
+        profit = (current_price - entry_price) * assets * (1 - 2 * trade_fee)
+        if profit > 0:
+            state[S_LONG_PROFIT] += profit
+        else:
+            state[S_LONG_LOSS] += abs(profit)
+    else:
+        profit = (entry_price - current_price) * assets * (1 - 2 * trade_fee)
+        if profit > 0:
+            state[S_SHORT_PROFIT] += profit
+        else:
+            state[S_SHORT_LOSS] += abs(profit)
+    fee = current_price * assets * trade_fee
+    state[S_TOTAL_FEES] += fee
+    state[S_BALANCE] = (entry_price * assets) + profit
+    state[S_POSITION] = 0
+    state[S_ASSETS] = 0.0
+    trade[0] = assets
+    trade[1] = fee
+    trade[2] = profit
+
+
+@njit(cache=True)
+def _step_bar(state, params, current_price, fast_ind, slow_ind, trades):
+    """
+    Apply GenericStrategy's long/short/stop-loss/profit-target rules to one bar.
+
+    A bar can execute two trades when a long is closed and a short is opened on it.
+    The (assets, fee, pnl) of the first and second trade are written to trades[0] and trades[1].
+
+    Returns:
+        tuple: (first, second) ACTION_* codes executed on this bar (ACTION_NONE when unused),
+        or (-error, ACTION_NONE) for an ENGINE_* error code.
+    """
+    trade_fee = params[P_TRADE_FEE]
+    profit_target = params[P_PROFIT_TARGET]
+    enable_stop_loss = params[P_ENABLE_STOP_LOSS] != 0.0
+    enable_profit_target = params[P_ENABLE_PROFIT_TARGET] != 0.0
+    action = ACTION_NONE
+
+    # === LONG POSITION LOGIC ===
+    if params[P_ENABLE_LONGING] != 0.0:
+        if state[S_POSITION] == 0 and state[S_UPTREND_TRIGGERED] == 0.0 and fast_ind > slow_ind:
+            _open_position(state, params, current_price, 1, trades[0])
+            state[S_UPTREND_TRIGGERED] = 1.0
+            return ACTION_GO_LONG, ACTION_NONE
+
+        if state[S_POSITION] == 1 and enable_stop_loss and current_price <= state[S_STOP_LOSS_PRICE]:
+            _stop_loss(state, params, current_price, trades[0])
+            return ACTION_STOP_LOSS, ACTION_NONE
+
+        if state[S_POSITION] == 1:
+            close_on_downtrend = params[P_CLOSE_LONG_ON_DOWNTREND] != 0.0
+            target_price = state[S_ENTRY_PRICE] * (1 + profit_target + 2 * trade_fee)
+            if enable_profit_target and close_on_downtrend:
+                close_long = current_price >= target_price and fast_ind < slow_ind
+            elif enable_profit_target:
+                close_long = current_price >= target_price
+            elif close_on_downtrend:
+                close_long = fast_ind < slow_ind
+            else:
+                return -ENGINE_INVALID_LONG_EXIT, ACTION_NONE
+
+            if close_long:
+                _close_position(state, params, current_price, trades[0])
+                action = ACTION_CLOSE_LONG
+
+        if fast_ind <= slow_ind:
+            state[S_UPTREND_TRIGGERED] = 0.0
+
+    # === SHORT POSITION LOGIC ===
+    if params[P_ENABLE_SHORTING] != 0.0:
+        if state[S_POSITION] == 0 and state[S_DOWNTREND_TRIGGERED] == 0.0 and fast_ind < slow_ind:
+            if action != ACTION_NONE:
+                _open_position(state, params, current_price, -1, trades[1])
+                state[S_DOWNTREND_TRIGGERED] = 1.0
+                return action, ACTION_GO_SHORT
+            _open_position(state, params, current_price, -1, trades[0])
+            state[S_DOWNTREND_TRIGGERED] = 1.0
+            return ACTION_GO_SHORT, ACTION_NONE
+
+        if state[S_POSITION] == -1 and enable_stop_loss and current_price >= state[S_STOP_LOSS_PRICE]:
+            _stop_loss(state, params, current_price, trades[0])
+            return ACTION_STOP_LOSS, ACTION_NONE
+
+        if state[S_POSITION] == -1:
+            close_on_uptrend = params[P_CLOSE_SHORT_ON_UPTREND] != 0.0
+            target_price = state[S_ENTRY_PRICE] * (1 - profit_target - 2 * trade_fee)
+            if enable_profit_target and close_on_uptrend:
+                close_short = current_price <= target_price and fast_ind > slow_ind
+            elif enable_profit_target:
+                close_short = current_price <= target_price
+            elif close_on_uptrend:
+                close_short = fast_ind > slow_ind
+            else:
+                return -ENGINE_INVALID_SHORT_EXIT, action
+
+            if close_short:
+                _close_position(state, params, current_price, trades[0])
+                action = ACTION_CLOSE_SHORT
+
+        if fast_ind >= slow_ind:
+            state[S_DOWNTREND_TRIGGERED] = 0.0
+
+    return action, ACTION_NONE
+
+
+@njit(cache=True)
+def run_generic_engine(close, fast, slow, params, state):
+    """
+    Compiled equivalent of GenericStrategy's Python run loop.
+
+    Walks the close/fast/slow arrays once and applies the same long, short,
+    stop-loss and profit-target rules as the BaseStrategy execute_* methods.
+
+    Args:
+        close, fast, slow (np.ndarray): float64 price and indicator arrays of equal length.
+        params (np.ndarray): Parameter vector from make_params().
+        state (np.ndarray): State vector from make_state(); updated in place.
+
+    Returns:
+        tuple: (trade_bars, trade_actions, trade_values, error) where the trade arrays are
+        trimmed to the executed trades, trade_values has the T_* columns (price, assets,
+        fee, pnl) and error is one of the ENGINE_* codes.
+    """
+    trade_bars = np.empty(64, dtype=np.int64)
+    trade_actions = np.empty(64, dtype=np.int8)
+    trade_values = np.empty((64, N_TRADE_VALUES), dtype=np.float64)
+    trades = np.zeros((2, 3), dtype=np.float64)
+    n_trades = 0
+    error = ENGINE_OK
+
+    for i in range(1, close.shape[0]):
+        if np.isnan(fast[i]) or np.isnan(slow[i]):
+            continue
+
+        first, second = _step_bar(state, params, close[i], fast[i], slow[i], trades)
+        if first < 0:
+            error = -first
+            if second != ACTION_NONE:
+                trade_bars, trade_actions, trade_values, n_trades = _record_trade(
+                    trade_bars, trade_actions, trade_values, n_trades, i, second, close[i], trades[0])
+            break
+        if first != ACTION_NONE:
+            trade_bars, trade_actions, trade_values, n_trades = _record_trade(
+                trade_bars, trade_actions, trade_values, n_trades, i, first, close[i], trades[0])
+        if second != ACTION_NONE:
+            trade_bars, trade_actions, trade_values, n_trades = _record_trade(
+                trade_bars, trade_actions, trade_values, n_trades, i, second, close[i], trades[1])
+
+    return trade_bars[:n_trades].copy(), trade_actions[:n_trades].copy(), trade_values[:n_trades].copy(), error
+
+
+# Relation of FAST_IND to SLOW_IND on a bar, used by the event-skipping engine
+REL_BELOW = 0
+REL_EQUAL = 1
+REL_ABOVE = 2
+REL_NAN = 3
+EVENT_BLOCK = 64  # Bars per min/max block of the price search
+
+
+def make_event_index(close, fast, slow, block=EVENT_BLOCK):
+    """
+    Precompute what run_event_engine needs to skip bars that cannot trigger anything.
+
+    Args:
+        close, fast, slow (np.ndarray): float64 price and indicator arrays of equal length.
+        block (int): Bars per block of the close min/max arrays.
+
+    Returns:
+        tuple: (relations, run_starts, block_min, block_max) with the REL_* code of every bar,
+        the first bar of every run of equal codes (i.e. the crossover bars) and the NaN-ignoring
+        min/max of close over consecutive blocks.
+    """
+    diff = fast - slow
+    relations = np.where(diff < 0, REL_BELOW, np.where(diff > 0, REL_ABOVE, REL_EQUAL)).astype(np.int8)
+    relations[np.isnan(diff)] = REL_NAN
+    run_starts = np.concatenate([[0], np.flatnonzero(relations[1:] != relations[:-1]) + 1]).astype(np.int64)
+    if not len(close):
+        return relations, run_starts[:0], close[:0], close[:0]
+    offsets = np.arange(0, len(close), block)
+    return relations, run_starts, np.fmin.reduceat(close, offsets), np.fmax.reduceat(close, offsets)
+
+
+@njit(cache=True)
+def _next_relation_event(relations, run_starts, start, mask):
+    """First bar >= start whose relation code is in the bit mask (len(relations) when none)."""
+    n = relations.shape[0]
+    if mask == 0:
+        return n
+    r = np.searchsorted(run_starts, start, side='right') - 1
+    while r < run_starts.shape[0]:
+        if (1 << relations[run_starts[r]]) & mask:
+            return max(run_starts[r], start)
+        r += 1
+    return n
+
+
+@njit(cache=True)
+def _next_price_event(close, block_min, block_max, block, start, end, low, high):
+    """First bar in [start, end) with close <= low or close >= high (end when none)."""
+    if low == -np.inf and high == np.inf:
+        return end
+    j = start
+    first_block_end = min((start // block + 1) * block, end)
+    while j < first_block_end:
+        if close[j] <= low or close[j] >= high:
+            return j
+        j += 1
+    while j < end:
+        b = j // block
+        if block_min[b] <= low or block_max[b] >= high:
+            stop = min(j + block, end)
+            while j < stop:
+                if close[j] <= low or close[j] >= high:
+                    return j
+                j += 1
+        else:
+            j += block
+    return end
+
+
+@njit(cache=True)
+def _next_joint_event(close, relations, run_starts, block_min, block_max, block, start, end, relation, low, high):
+    """First bar in [start, end) with the given relation code and close <= low or close >= high."""
+    r = np.searchsorted(run_starts, start, side='right') - 1
+    while r < run_starts.shape[0] and run_starts[r] < end:
+        if relations[run_starts[r]] == relation:
+            run_end = run_starts[r + 1] if r + 1 < run_starts.shape[0] else relations.shape[0]
+            run_end = min(run_end, end)
+            hit = _next_price_event(close, block_min, block_max, block, max(run_starts[r], start), run_end, low, high)
+            if hit < run_end:
+                return hit
+        r += 1
+    return end
+
+
+@njit(cache=True)
+def _next_event(close, relations, run_starts, block_min, block_max, block, params, state, start):
+    """
+    First bar >= start on which _step_bar could change the state.
+
+    Every other bar is a no-op for the current position and triggers: entries and trigger
+    resets only depend on the fast/slow relation, exits on the stop/target prices.
+    """
+    below, equal, above = 1 << REL_BELOW, 1 << REL_EQUAL, 1 << REL_ABOVE
+    longing = params[P_ENABLE_LONGING] != 0.0
+    shorting = params[P_ENABLE_SHORTING] != 0.0
+    enable_stop_loss = params[P_ENABLE_STOP_LOSS] != 0.0
+    enable_profit_target = params[P_ENABLE_PROFIT_TARGET] != 0.0
+    trade_fee = params[P_TRADE_FEE]
+    profit_target = params[P_PROFIT_TARGET]
+    position = state[S_POSITION]
+
+    mask = 0
+    low, high = -np.inf, np.inf
+    joint_relation = -1
+    target_price = np.nan
+    if longing and state[S_UPTREND_TRIGGERED] != 0.0:
+        mask |= below | equal  # Trigger reset
+    if shorting and state[S_DOWNTREND_TRIGGERED] != 0.0:
+        mask |= above | equal
+    if position == 0:
+        if longing and state[S_UPTREND_TRIGGERED] == 0.0:
+            mask |= above
+        if shorting and state[S_DOWNTREND_TRIGGERED] == 0.0:
+            mask |= below
+    elif position == 1 and longing:
+        close_on_downtrend = params[P_CLOSE_LONG_ON_DOWNTREND] != 0.0
+        if enable_stop_loss:
+            low = state[S_STOP_LOSS_PRICE]
+        target_price = state[S_ENTRY_PRICE] * (1 + profit_target + 2 * trade_fee)
+        if enable_profit_target and close_on_downtrend:
+            joint_relation = REL_BELOW
+        elif enable_profit_target:
+            high = target_price
+        elif close_on_downtrend:
+            mask |= below
+        else:
+            mask |= below | equal | above  # Invalid exit configuration, reported on the next bar
+    elif position == -1 and shorting:
+        close_on_uptrend = params[P_CLOSE_SHORT_ON_UPTREND] != 0.0
+        if enable_stop_loss:
+            high = state[S_STOP_LOSS_PRICE]
+        target_price = state[S_ENTRY_PRICE] * (1 - profit_target - 2 * trade_fee)
+        if enable_profit_target and close_on_uptrend:
+            joint_relation = REL_ABOVE
+        elif enable_profit_target:
+            low = target_price
+        elif close_on_uptrend:
+            mask |= above
+        else:
+            mask |= below | equal | above
+
+    event = _next_relation_event(relations, run_starts, start, mask)
+    event = _next_price_event(close, block_min, block_max, block, start, event, low, high)
+    if joint_relation == REL_BELOW:
+        event = _next_joint_event(close, relations, run_starts, block_min, block_max, block,
+                                  start, event, REL_BELOW, -np.inf, target_price)
+    elif joint_relation == REL_ABOVE:
+        event = _next_joint_event(close, relations, run_starts, block_min, block_max, block,
+                                  start, event, REL_ABOVE, target_price, np.inf)
+    return event
+
+
+@njit(cache=True)
+def run_event_engine(close, fast, slow, relations, run_starts, block_min, block_max, block, params, state):
+    """
+    Event-skipping equivalent of run_generic_engine.
+
+    Instead of stepping every bar it jumps to the next bar that can change the state: a
+    crossover that allows an entry or resets a trigger, or the first close beyond the
+    stop-loss or profit-target price of the open position. The work per run scales with the
+    number of crossovers and trades instead of the number of bars.
+
+    Args:
+        close, fast, slow (np.ndarray): float64 price and indicator arrays of equal length.
+        relations, run_starts, block_min, block_max: Output of make_event_index().
+        block (int): Block size passed to make_event_index().
+        params (np.ndarray): Parameter vector from make_params().
+        state (np.ndarray): State vector from make_state(); updated in place.
+
+    Returns:
+        tuple: Same as run_generic_engine.
+    """
+    trade_bars = np.empty(64, dtype=np.int64)
+    trade_actions = np.empty(64, dtype=np.int8)
+    trade_values = np.empty((64, N_TRADE_VALUES), dtype=np.float64)
+    trades = np.zeros((2, 3), dtype=np.float64)
+    n_trades = 0
+    error = ENGINE_OK
+
+    i = 1
+    n = close.shape[0]
+    while i < n:
+        i = _next_event(close, relations, run_starts, block_min, block_max, block, params, state, i)
+        if i >= n:
+            break
+        if relations[i] == REL_NAN:
+            i += 1
+            continue
+
+        first, second = _step_bar(state, params, close[i], fast[i], slow[i], trades)
+        if first < 0:
+            error = -first
+            if second != ACTION_NONE:
+                trade_bars, trade_actions, trade_values, n_trades = _record_trade(
+                    trade_bars, trade_actions, trade_values, n_trades, i, second, close[i], trades[0])
+            break
+        if first != ACTION_NONE:
+            trade_bars, trade_actions, trade_values, n_trades = _record_trade(
+                trade_bars, trade_actions, trade_values, n_trades, i, first, close[i], trades[0])
+        if second != ACTION_NONE:
+            trade_bars, trade_actions, trade_values, n_trades = _record_trade(
+                trade_bars, trade_actions, trade_values, n_trades, i, second, close[i], trades[1])
+        i += 1
+
+    return trade_bars[:n_trades].copy(), trade_actions[:n_trades].copy(), trade_values[:n_trades].copy(), error
+
+
+@njit(cache=True)
+def _mark_to_market(state, params, current_price):
+    """Portfolio value at current_price, with an open position valued as if it were closed there."""
+    position = state[S_POSITION]
+    if position == 0:
+        return state[S_BALANCE]
+    entry_price = state[S_ENTRY_PRICE]
+    return state[S_BALANCE] + state[S_ASSETS] * (
+        entry_price + position * (current_price - entry_price) * (1 - 2 * params[P_TRADE_FEE])
+    )
+
+
+@njit(cache=True)
+def run_generic_engine_batch(close, fast, slow, params, states, equity_bars, equity):
+    """
+    Run many GenericStrategy configurations that share one indicator pair in a single pass.
+
+    Every configuration keeps its own row of state (position, entry price, assets,
+    balance, triggers, ...) and all rows are stepped together on each bar.
+
+    Args:
+        close, fast, slow (np.ndarray): float64 price and indicator arrays of equal length.
+        params (np.ndarray): (n_configs, N_PARAMS) parameter matrix.
+        states (np.ndarray): (n_configs, N_STATE) state matrix; updated in place.
+        equity_bars (np.ndarray): Sorted int64 bars at which the equity is sampled (may be empty).
+        equity (np.ndarray): (n_configs, len(equity_bars)) output of the mark-to-market equity.
+
+    Returns:
+        tuple: (trade_counts, errors) int64 arrays with one entry per configuration.
+    """
+    n_configs = params.shape[0]
+    trade_counts = np.zeros(n_configs, dtype=np.int64)
+    errors = np.zeros(n_configs, dtype=np.int64)
+    trades = np.zeros((2, 3), dtype=np.float64)
+    sample = 0
+
+    for i in range(close.shape[0]):
+        current_price = close[i]
+        if i > 0 and not (np.isnan(fast[i]) or np.isnan(slow[i])):
+            for c in range(n_configs):
+                if errors[c] != ENGINE_OK:
+                    continue
+                first, second = _step_bar(states[c], params[c], current_price, fast[i], slow[i], trades)
+                if first < 0:
+                    errors[c] = -first
+                elif first != ACTION_NONE:
+                    trade_counts[c] += 1
+                if second != ACTION_NONE:
+                    trade_counts[c] += 1
+
+        if sample < equity_bars.shape[0] and equity_bars[sample] == i:
+            for c in range(n_configs):
+                equity[c, sample] = _mark_to_market(states[c], params[c], current_price)
+            sample += 1
+
+    return trade_counts, errors
+
+
+def equity_sample_bars(n_bars, every):
+    """
+    Bars at which a batch run samples the equity: every `every` bars plus the last bar.
+
+    Args:
+        n_bars (int): Number of bars.
+        every (int): Sampling interval, 0 disables the sampling.
+
+    Returns:
+        np.ndarray: Sorted int64 bar numbers.
+    """
+    if every <= 0 or n_bars == 0:
+        return np.empty(0, dtype=np.int64)
+    bars = np.arange(0, n_bars, every, dtype=np.int64)
+    return bars if bars[-1] == n_bars - 1 else np.append(bars, np.int64(n_bars - 1))
+
+
+def run_batch(close, fast, slow, configs, equity_every=0):
+    """
+    Run GenericStrategy configurations that share one indicator pair through the batched engine.
+
+    Args:
+        close, fast, slow (np.ndarray): float64 price and indicator arrays of equal length.
+        configs (list): Dicts with initial_capital, trade_fee, profit_target, stop_loss and the
+            enable_* flags of GenericStrategy.
+        equity_every (int): Sample the mark-to-market equity of every configuration each
+            equity_every bars (and on the last bar), 0 to skip it.
+
+    Returns:
+        tuple: (states, trade_counts, errors, equity) with one row of final state and one row of
+            sampled equity (see equity_sample_bars) per configuration.
+    """
+    params = np.array([
+        make_params(
+            config['trade_fee'], config['profit_target'], config['stop_loss'], config['enable_stop_loss'],
+            config['enable_longing'], config['enable_shorting'], config['enable_profit_target'],
+            config['enable_close_long_on_downtrend'], config['enable_close_short_on_uptrend']
+        ) for config in configs
+    ], dtype=np.float64).reshape(len(configs), N_PARAMS)
+    states = np.array([make_state(config['initial_capital']) for config in configs],
+                      dtype=np.float64).reshape(len(configs), N_STATE)
+    equity_bars = equity_sample_bars(close.shape[0], equity_every)
+    equity = np.empty((len(configs), len(equity_bars)), dtype=np.float64)
+    trade_counts, errors = run_generic_engine_batch(close, fast, slow, params, states, equity_bars, equity)
+    return states, trade_counts, errors, equity
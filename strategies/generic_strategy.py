@@ -1,18 +1,24 @@
 # strategies/generic_strategy.py
+import logging
+
 import pandas as pd
 import numpy as np
+from strategies.actions import ACTION_NAMES
 from strategies.base_strategy import BaseStrategy
-from utils.logger import logger
-
-from numba import njit
-from tqdm import tqdm  # For visual progress bars
+from strategies.indicators import calculate_indicators
+from strategies.engine import (
+    run_generic_engine, run_event_engine, make_event_index, make_params, make_state, EVENT_BLOCK,
+    ENGINE_INVALID_LONG_EXIT, ENGINE_INVALID_SHORT_EXIT,
+    T_PRICE, T_ASSETS, T_FEE, T_PNL
+)
+from utils.logger import logger, trade_logger
 
 
 class GenericStrategy(BaseStrategy):
     def __init__(self, data, initial_capital, trade_fee, profit_target, stop_loss, enable_stop_loss,
                  short_window, long_window, indicator_type, enable_close_long_on_downtrend,
                  enable_close_short_on_uptrend, enable_profit_target,
-                 enable_longing=True, enable_shorting=False):
+                 enable_longing=True, enable_shorting=False, engine='PYTHON', indicator_cache=None):
         """
         Initialize the Generic Strategy with configuration parameters.
 
@@ -31,6 +37,8 @@ class GenericStrategy(BaseStrategy):
             enable_profit_target (bool): Enable profit target.
             enable_longing (bool): Enable long trading.
             enable_shorting (bool): Enable short trading.
+            engine (str): Backtest engine used by run() (PYTHON, NUMBA, EVENT).
+            indicator_cache (IndicatorCache, optional): Cache for FAST_IND and SLOW_IND series.
         """
         super().__init__(
             data, initial_capital, trade_fee, profit_target, stop_loss,
@@ -42,6 +50,8 @@ class GenericStrategy(BaseStrategy):
         self.enable_close_long_on_downtrend = enable_close_long_on_downtrend
         self.enable_close_short_on_uptrend = enable_close_short_on_uptrend
         self.enable_profit_target = enable_profit_target
+        self.engine = engine
+        self.indicator_cache = indicator_cache
 
         self.uptrend_triggered = False
         self.downtrend_triggered = False
@@ -55,131 +65,193 @@ class GenericStrategy(BaseStrategy):
         Apply the selected indicator type to the data with optimized calculations and progress logging.
         Supports: SMA, EMA, WMA, RSI, MACD
         """
+        from tqdm import tqdm  # For visual progress bars, imported only when indicators are calculated
+
         logger.info(f"📊 Calculating indicators: {self.indicator_type}")
         total_steps = len(self.data)
         progress_bar = tqdm(total=total_steps, desc=f"Calculating {self.indicator_type}", unit="row")
 
-        if self.indicator_type == 'SMA':
-            self.data['FAST_IND'] = self.data['close'].rolling(window=self.short_window, min_periods=1).mean()
-            progress_bar.update(total_steps // 2)
-            self.data['SLOW_IND'] = self.data['close'].rolling(window=self.long_window, min_periods=1).mean()
-            progress_bar.update(total_steps // 2)
-
-        elif self.indicator_type == 'EMA':
-            self.data['FAST_IND'] = self.data['close'].ewm(span=self.short_window, min_periods=1).mean()
-            progress_bar.update(total_steps // 2)
-            self.data['SLOW_IND'] = self.data['close'].ewm(span=self.long_window, min_periods=1).mean()
-            progress_bar.update(total_steps // 2)
-
-        elif self.indicator_type == 'WMA':
-            self.data['FAST_IND'] = self._calculate_weighted_moving_average(self.data['close'], self.short_window, progress_bar)
-            self.data['SLOW_IND'] = self._calculate_weighted_moving_average(self.data['close'], self.long_window, progress_bar)
-
-        elif self.indicator_type == 'RSI':
-            delta = self.data['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            avg_gain = gain.rolling(window=self.short_window, min_periods=1).mean()
-            avg_loss = loss.rolling(window=self.short_window, min_periods=1).mean()
-            rs = avg_gain / avg_loss
-            self.data['FAST_IND'] = 100 - (100 / (1 + rs))
-            progress_bar.update(total_steps // 2)
-            self.data['SLOW_IND'] = self.data['FAST_IND'].rolling(window=self.long_window, min_periods=1).mean()
-            progress_bar.update(total_steps // 2)
-
-        elif self.indicator_type == 'MACD':
-            fast_ema = self.data['close'].ewm(span=self.short_window, min_periods=1).mean()
-            slow_ema = self.data['close'].ewm(span=self.long_window, min_periods=1).mean()
-            self.data['FAST_IND'] = fast_ema - slow_ema
-            progress_bar.update(total_steps // 2)
-            self.data['SLOW_IND'] = self.data['FAST_IND'].ewm(span=9, min_periods=1).mean()
-            progress_bar.update(total_steps // 2)
+        self.data['FAST_IND'], self.data['SLOW_IND'] = calculate_indicators(
+            self.data['close'], self.indicator_type, self.short_window, self.long_window, progress_bar,
+            cache=self.indicator_cache
+        )
+        # NumPy views used by the engines; close may be a read-only memmap shared with other backtests
+        self.close = self.data['close'].to_numpy(dtype=np.float64)
+        self.fast_ind = self.data['FAST_IND'].to_numpy(dtype=np.float64)
+        self.slow_ind = self.data['SLOW_IND'].to_numpy(dtype=np.float64)
 
-        else:
-            raise ValueError(f"Indicator '{self.indicator_type}' is not supported.")
-        
         progress_bar.close()
         logger.info(f"✅ Indicator {self.indicator_type} calculation completed.")
 
-    def run(self):
+    def run(self, engine=None):
+        """
+        Run the strategy over the data with the selected engine.
+
+        Args:
+            engine (str): Optional override of the configured engine (PYTHON, NUMBA, EVENT).
+        """
+        engine = engine or self.engine
+        if engine == 'NUMBA':
+            self._run_numba()
+        elif engine == 'EVENT':
+            self._run_numba(skip_events=True)
+        elif engine == 'PYTHON':
+            self._run_python()
+        else:
+            raise ValueError(f"Engine '{engine}' is not supported.")
+
+    def _run_numba(self, skip_events=False):
+        """
+        Run the compiled state-machine kernel and apply its trade log and final state to the strategy.
+
+        Args:
+            skip_events (bool): Use the event-skipping kernel, which only visits crossover bars and
+                bars where the stop-loss or profit target is reached (same trades, fewer bars).
+        """
+        logger.info(f"🚀 Generic Strategy run started ({'EVENT' if skip_events else 'NUMBA'} engine).")
+
+        params = make_params(
+            self.trade_fee, self.profit_target, self.stop_loss, self.enable_stop_loss,
+            self.enable_longing, self.enable_shorting, self.enable_profit_target,
+            self.enable_close_long_on_downtrend, self.enable_close_short_on_uptrend
+        )
+        state = make_state(
+            self.balance, self.current_position, self.entry_price, self.stop_loss_price, self.assets,
+            self.uptrend_triggered, self.downtrend_triggered, self.total_fees,
+            self.long_profit, self.long_loss, self.short_profit, self.short_loss
+        )
+        if skip_events:
+            event_index = make_event_index(self.close, self.fast_ind, self.slow_ind)
+            trade_bars, trade_actions, trade_values, error = run_event_engine(
+                self.close, self.fast_ind, self.slow_ind, *event_index, EVENT_BLOCK, params, state
+            )
+        else:
+            trade_bars, trade_actions, trade_values, error = run_generic_engine(
+                self.close, self.fast_ind, self.slow_ind, params, state
+            )
+
+        (self.balance, current_position, entry_price, stop_loss_price, self.assets,
+         uptrend_triggered, downtrend_triggered, self.total_fees,
+         self.long_profit, self.long_loss, self.short_profit, self.short_loss) = state.tolist()
+        self.current_position = int(current_position)
+        self.entry_price = None if np.isnan(entry_price) else entry_price
+        self.stop_loss_price = None if np.isnan(stop_loss_price) else stop_loss_price
+        self.uptrend_triggered = bool(uptrend_triggered)
+        self.downtrend_triggered = bool(downtrend_triggered)
+
+        self.ledger.extend(
+            trade_bars, trade_actions, trade_values[:, T_PRICE], trade_values[:, T_ASSETS],
+            trade_values[:, T_FEE], trade_values[:, T_PNL]
+        )
+        if trade_logger.isEnabledFor(logging.DEBUG):
+            for bar, action, price in zip(trade_bars, trade_actions, trade_values[:, T_PRICE]):
+                trade_logger.debug("%s | Price: %.2f, Timestamp: %s", ACTION_NAMES[action], price, self.data.index[bar])
+        logger.info(f"⚡ Compiled engine executed {len(trade_bars)} trades.")
+
+        if error == ENGINE_INVALID_LONG_EXIT:
+            logger.error("⚠️ Invalid configuration: Both enable_profit_target and enable_close_long_on_downtrend are False.")
+            raise ValueError("Both enable_profit_target and enable_close_long_on_downtrend cannot be False.")
+        if error == ENGINE_INVALID_SHORT_EXIT:
+            logger.error("⚠️ Invalid configuration: Both enable_profit_target and enable_close_short_on_uptrend are False.")
+            raise ValueError("Both enable_profit_target and enable_close_short_on_uptrend cannot be False.")
+
+        logger.info("🏁 Generic Strategy run completed.")
+
+    def _run_python(self):
+        """
+        Reference engine: bar-by-bar Python loop over the price and indicator arrays.
+        """
         logger.info("🚀 Generic Strategy run started.")
         
+        index = self.data.index
         for i in range(1, len(self.data)):
-            current_price = self.data['close'].iloc[i]
-            fast_ind = self.data['FAST_IND'].iloc[i]
-            slow_ind = self.data['SLOW_IND'].iloc[i]
-            timestamp = self.data.index[i]
+            self.process_bar(self.close[i], self.fast_ind[i], self.slow_ind[i], index[i], bar=i)
+
+        logger.info("🏁 Generic Strategy run completed.")
+
+    def process_bar(self, current_price, fast_ind, slow_ind, timestamp, bar=None):
+        """
+        Apply the strategy rules to a single bar.
 
-            if pd.isna(fast_ind) or pd.isna(slow_ind):
-                continue
+        Used by the PYTHON engine for every row of the data and by live trading for each new bar.
+
+        Args:
+            current_price (float): Close price of the bar.
+            fast_ind (float): Fast indicator value.
+            slow_ind (float): Slow indicator value.
+            timestamp: Bar timestamp.
+            bar (int, optional): Row of the bar in the data, recorded in the trade ledger.
+                Defaults to the next bar after the previous call (live trading).
+        """
+        self.current_bar = self.current_bar + 1 if bar is None else bar
+        if pd.isna(fast_ind) or pd.isna(slow_ind):
+            return
+
+        # === LONG POSITION LOGIC ===
+        if self.enable_longing:
+            if self.current_position == 0 and not self.uptrend_triggered and fast_ind > slow_ind:
+                self.execute_go_long(current_price, timestamp)
+                self.uptrend_triggered = True
+                return
+
+            if self.current_position == 1 and self.enable_stop_loss and current_price <= self.stop_loss_price:
+                self.execute_stop_loss(current_price, timestamp)
+                return
 
             # === LONG POSITION LOGIC ===
-            if self.enable_longing:
-                if self.current_position == 0 and not self.uptrend_triggered and fast_ind > slow_ind:
-                    self.execute_go_long(current_price, timestamp)
-                    self.uptrend_triggered = True
-                    continue
-
-                if self.current_position == 1 and self.enable_stop_loss and current_price <= self.stop_loss_price:
-                    self.execute_stop_loss(current_price, timestamp)
-                    continue
-
-                # === LONG POSITION LOGIC ===
-                if self.current_position == 1:
-                    if self.enable_profit_target and self.enable_close_long_on_downtrend:
-                        # ✅ Both enabled: Check both conditions
-                        if current_price >= self.calculate_close_long_price(self.entry_price) and fast_ind < slow_ind:
-                            self.execute_close_long(current_price, timestamp)
-                    elif self.enable_profit_target:
-                        # ✅ Only Profit Target enabled
-                        if current_price >= self.calculate_close_long_price(self.entry_price):
-                            self.execute_close_long(current_price, timestamp)
-                    elif self.enable_close_long_on_downtrend:
-                        # ✅ Only Close on Downtrend enabled
-                        if fast_ind < slow_ind:
-                            self.execute_close_long(current_price, timestamp)
-                    else:
-                        # ❌ Invalid Configuration
-                        logger.error("⚠️ Invalid configuration: Both enable_profit_target and enable_close_long_on_downtrend are False.")
-                        raise ValueError("Both enable_profit_target and enable_close_long_on_downtrend cannot be False.")
-
-                if fast_ind <= slow_ind:
-                    self.uptrend_triggered = False
-
-            # === SHORT POSITION LOGIC ===
-            if self.enable_shorting:
-                # 🟢 Enter Short Position
-                if self.current_position == 0 and not self.downtrend_triggered and fast_ind < slow_ind:
-                    self.execute_go_short(current_price, timestamp)
-                    self.downtrend_triggered = True
-                    continue
-
-                # 🛑 Stop-Loss for Short Position
-                if self.current_position == -1 and self.enable_stop_loss and current_price >= self.stop_loss_price:
-                    self.execute_stop_loss(current_price, timestamp)
-                    continue
-
-                # 🔻 Close Short Position
-                if self.current_position == -1:
-                    if self.enable_profit_target and self.enable_close_short_on_uptrend:
-                        # Both enabled: Check both conditions
-                        if current_price <= self.calculate_close_short_price(self.entry_price) and fast_ind > slow_ind:
-                            self.execute_close_short(current_price, timestamp)
-                    elif self.enable_profit_target:
-                        # Only Profit Target enabled
-                        if current_price <= self.calculate_close_short_price(self.entry_price):
-                            self.execute_close_short(current_price, timestamp)
-                    elif self.enable_close_short_on_uptrend:
-                        # Only Sell on Downtrend enabled
-                        if fast_ind > slow_ind:
-                            self.execute_close_short(current_price, timestamp)
-                    else:
-                        # ❌ Invalid Configuration: No valid conditions to close the position
-                        logger.error("⚠️ Invalid configuration: Both enable_profit_target and enable_close_short_on_uptrend are False.")
-                        raise ValueError("Both enable_profit_target and enable_close_short_on_uptrend cannot be False.")
-
-                # 🔄 Reset Downtrend Trigger
-                if fast_ind >= slow_ind:
-                    self.downtrend_triggered = False
+            if self.current_position == 1:
+                if self.enable_profit_target and self.enable_close_long_on_downtrend:
+                    # ✅ Both enabled: Check both conditions
+                    if current_price >= self.calculate_close_long_price(self.entry_price) and fast_ind < slow_ind:
+                        self.execute_close_long(current_price, timestamp)
+                elif self.enable_profit_target:
+                    # ✅ Only Profit Target enabled
+                    if current_price >= self.calculate_close_long_price(self.entry_price):
+                        self.execute_close_long(current_price, timestamp)
+                elif self.enable_close_long_on_downtrend:
+                    # ✅ Only Close on Downtrend enabled
+                    if fast_ind < slow_ind:
+                        self.execute_close_long(current_price, timestamp)
+                else:
+                    # ❌ Invalid Configuration
+                    logger.error("⚠️ Invalid configuration: Both enable_profit_target and enable_close_long_on_downtrend are False.")
+                    raise ValueError("Both enable_profit_target and enable_close_long_on_downtrend cannot be False.")
 
-        logger.info("🏁 Generic Strategy run completed.")
+            if fast_ind <= slow_ind:
+                self.uptrend_triggered = False
+
+        # === SHORT POSITION LOGIC ===
+        if self.enable_shorting:
+            # 🟢 Enter Short Position
+            if self.current_position == 0 and not self.downtrend_triggered and fast_ind < slow_ind:
+                self.execute_go_short(current_price, timestamp)
+                self.downtrend_triggered = True
+                return
+
+            # 🛑 Stop-Loss for Short Position
+            if self.current_position == -1 and self.enable_stop_loss and current_price >= self.stop_loss_price:
+                self.execute_stop_loss(current_price, timestamp)
+                return
+
+            # 🔻 Close Short Position
+            if self.current_position == -1:
+                if self.enable_profit_target and self.enable_close_short_on_uptrend:
+                    # Both enabled: Check both conditions
+                    if current_price <= self.calculate_close_short_price(self.entry_price) and fast_ind > slow_ind:
+                        self.execute_close_short(current_price, timestamp)
+                elif self.enable_profit_target:
+                    # Only Profit Target enabled
+                    if current_price <= self.calculate_close_short_price(self.entry_price):
+                        self.execute_close_short(current_price, timestamp)
+                elif self.enable_close_short_on_uptrend:
+                    # Only Sell on Downtrend enabled
+                    if fast_ind > slow_ind:
+                        self.execute_close_short(current_price, timestamp)
+                else:
+                    # ❌ Invalid Configuration: No valid conditions to close the position
+                    logger.error("⚠️ Invalid configuration: Both enable_profit_target and enable_close_short_on_uptrend are False.")
+                    raise ValueError("Both enable_profit_target and enable_close_short_on_uptrend cannot be False.")
+
+            # 🔄 Reset Downtrend Trigger
+            if fast_ind >= slow_ind:
+                self.downtrend_triggered = False
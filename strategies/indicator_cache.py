@@ -0,0 +1,153 @@
+# strategies/indicator_cache.py
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+
+class IndicatorCache:
+    def __init__(self, cache_dir=None, max_memory_bytes=512 * 1024 ** 2):
+        """
+        Two-level cache for indicator series.
+
+        Level 1 is an in-memory LRU bounded by a byte budget, level 2 is an on-disk
+        store of .npy files that are memory-mapped when read back.
+
+        Args:
+            cache_dir (str, optional): Folder for the on-disk store; None keeps the cache in memory only.
+            max_memory_bytes (int): Byte budget of the in-memory LRU.
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(close, index=None):
+        """
+        Hash the close series and its date range.
+
+        Args:
+            close (pd.Series or np.ndarray): Close prices.
+            index (pd.Index, optional): Timestamps; taken from close when it is a Series.
+
+        Returns:
+            str: Hex digest identifying the data.
+        """
+        if index is None:
+            index = getattr(close, 'index', None)
+        values = np.ascontiguousarray(np.asarray(close, dtype=np.float64))
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(values.view(np.uint8))
+        digest.update(str(len(values)).encode())
+        if index is not None and len(index):
+            digest.update(f"{index[0]}|{index[-1]}".encode())
+        return digest.hexdigest()
+
+    @property
+    def hits(self):
+        return self.memory_hits + self.disk_hits
+
+    def stats(self):
+        """Return hit/miss counters and the current memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+        }
+
+    def get(self, fingerprint, key):
+        """
+        Look up an indicator series.
+
+        Args:
+            fingerprint (str): Data fingerprint from fingerprint().
+            key (tuple): Indicator parameters, e.g. ('EMA', 1000).
+
+        Returns:
+            np.ndarray or None: Cached values (read-only), or None on a miss.
+        """
+        entry = (fingerprint, key)
+        values = self._memory.get(entry)
+        if values is not None:
+            self._memory.move_to_end(entry)
+            self.memory_hits += 1
+            return values
+
+        path = self._path(fingerprint, key)
+        if path and os.path.isfile(path):
+            values = np.load(path, mmap_mode='r')
+            self._remember(entry, values)
+            self.disk_hits += 1
+            return values
+
+        self.misses += 1
+        return None
+
+    def put(self, fingerprint, key, values):
+        """Store an indicator series in memory and, when configured, on disk."""
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        values.flags.writeable = False
+        self._remember((fingerprint, key), values)
+
+        path = self._path(fingerprint, key)
+        if path and not os.path.isfile(path):
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'wb') as file:
+                np.save(file, values)
+            os.replace(tmp_path, path)  # Atomic, safe with concurrent sweep workers
+
+    def get_or_compute(self, fingerprint, key, compute):
+        """
+        Return the cached series for key, computing and storing it on a miss.
+
+        Args:
+            fingerprint (str): Data fingerprint from fingerprint().
+            key (tuple): Indicator parameters.
+            compute (callable): Returns the series (array-like) when it is not cached.
+
+        Returns:
+            np.ndarray: Indicator values.
+        """
+        values = self.get(fingerprint, key)
+        if values is None:
+            values = np.asarray(compute(), dtype=np.float64)
+            self.put(fingerprint, key, values)
+        return values
+
+    def clear_memory(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def _remember(self, entry, values):
+        if entry in self._memory:
+            self._memory.move_to_end(entry)
+            return
+        if values.nbytes > self.max_memory_bytes:
+            return
+        self._memory[entry] = values
+        self._memory_bytes += values.nbytes
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _path(self, fingerprint, key):
+        if not self.cache_dir:
+            return None
+        name = '_'.join(str(part) for part in key)
+        return os.path.join(self.cache_dir, f"{fingerprint}_{name}.npy")
@@ -0,0 +1,165 @@
+# strategies/indicators.py
+import numpy as np
+import pandas as pd
+from numba import njit
+
+
+def calculate_indicators(close, indicator_type, short_window, long_window, progress_bar=None,
+                         cache=None, fingerprint=None):
+    """
+    Calculate the fast and slow indicator series used by GenericStrategy.
+
+    Args:
+        close (pd.Series): Close prices.
+        indicator_type (str): Type of indicator (SMA, EMA, WMA, RSI, MACD).
+        short_window (int): Window for the fast indicator.
+        long_window (int): Window for the slow indicator.
+        progress_bar (tqdm, optional): Progress bar advanced by half the rows per series.
+        cache (IndicatorCache, optional): Cache consulted before computing each series.
+        fingerprint (str, optional): Precomputed IndicatorCache.fingerprint() of close.
+
+    Returns:
+        tuple: (fast, slow) indicator series aligned with close.
+    """
+    if not isinstance(close, pd.Series):
+        close = pd.Series(close, copy=False)
+    if cache is not None and fingerprint is None:
+        fingerprint = cache.fingerprint(close)
+    half_steps = len(close) // 2
+
+    def component(key, compute):
+        if cache is None:
+            return compute()
+        return pd.Series(cache.get_or_compute(fingerprint, key, compute), index=close.index, copy=False)
+
+    def sma(window):
+        return component(('SMA', window), lambda: close.rolling(window=window, min_periods=1).mean())
+
+    def ema(window):
+        return component(('EMA', window), lambda: close.ewm(span=window, min_periods=1).mean())
+
+    if indicator_type == 'SMA':
+        fast = sma(short_window)
+        _advance(progress_bar, half_steps)
+        slow = sma(long_window)
+        _advance(progress_bar, half_steps)
+
+    elif indicator_type == 'EMA':
+        fast = ema(short_window)
+        _advance(progress_bar, half_steps)
+        slow = ema(long_window)
+        _advance(progress_bar, half_steps)
+
+    elif indicator_type == 'WMA':
+        fast = component(('WMA', short_window), lambda: weighted_moving_average(close, short_window))
+        _advance(progress_bar, half_steps)
+        slow = component(('WMA', long_window), lambda: weighted_moving_average(close, long_window))
+        _advance(progress_bar, half_steps)
+
+    elif indicator_type == 'RSI':
+        fast = component(('RSI', short_window), lambda: _relative_strength_index(close, short_window))
+        _advance(progress_bar, half_steps)
+        slow = component(('RSI_SMA', short_window, long_window),
+                         lambda: fast.rolling(window=long_window, min_periods=1).mean())
+        _advance(progress_bar, half_steps)
+
+    elif indicator_type == 'MACD':
+        fast = component(('MACD', short_window, long_window), lambda: ema(short_window) - ema(long_window))
+        _advance(progress_bar, half_steps)
+        slow = component(('MACD_SIGNAL', short_window, long_window, 9),
+                         lambda: fast.ewm(span=9, min_periods=1).mean())
+        _advance(progress_bar, half_steps)
+
+    else:
+        raise ValueError(f"Indicator '{indicator_type}' is not supported.")
+
+    return fast, slow
+
+
+def weighted_moving_average(close, window, progress_bar=None):
+    """
+    Linearly weighted moving average in O(n) regardless of window size.
+
+    The newest bar gets weight `window`, the oldest weight 1. Like the other
+    indicators it uses min_periods=1: the first bars average over the rows available.
+
+    Args:
+        close (pd.Series): Close prices.
+        window (int): Number of bars in the window.
+        progress_bar (tqdm, optional): Progress bar advanced by half the rows.
+
+    Returns:
+        pd.Series: WMA aligned with close.
+    """
+    if window < 1:
+        raise ValueError(f"WMA window must be positive, got {window}.")
+    values = _weighted_moving_average(close.to_numpy(dtype=np.float64), int(window))
+    _advance(progress_bar, len(close) // 2)
+    return pd.Series(values, index=close.index, name=close.name)
+
+
+@njit(cache=True)
+def _weighted_moving_average(values, window):
+    """
+    Running weighted-sum recurrence: with S the plain window sum and N the weighted sum,
+    N_t = N_(t-1) + window * x_t - S_(t-1). Both sums are recomputed exactly once per
+    window to stop rounding drift, which keeps the cost amortized O(1) per bar.
+
+    Non-finite values enter the sums as 0 and are counted instead, so the output is NaN
+    only while one is inside the window (like rolling().apply) and never carries it forward.
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    window_sum = 0.0
+    weighted_sum = 0.0
+    invalid = 0  # Non-finite values in the window
+    full_denominator = window * (window + 1) / 2.0
+
+    for t in range(n):
+        x = values[t]
+        valid = np.isfinite(x)
+        if t < window:
+            if valid:
+                weighted_sum += (t + 1) * x
+                window_sum += x
+            else:
+                invalid += 1
+            out[t] = weighted_sum / ((t + 1) * (t + 2) / 2.0) if invalid == 0 else np.nan
+            continue
+
+        if t % window == 0:
+            window_sum = 0.0
+            weighted_sum = 0.0
+            invalid = 0
+            start = t - window + 1
+            for j in range(start, t + 1):
+                if np.isfinite(values[j]):
+                    window_sum += values[j]
+                    weighted_sum += (j - start + 1) * values[j]
+                else:
+                    invalid += 1
+        else:
+            old = values[t - window]
+            old_valid = np.isfinite(old)
+            x = x if valid else 0.0
+            weighted_sum += window * x - window_sum
+            window_sum += x - (old if old_valid else 0.0)
+            invalid += (0 if valid else 1) - (0 if old_valid else 1)
+        out[t] = weighted_sum / full_denominator if invalid == 0 else np.nan
+
+    return out
+
+
+def _relative_strength_index(close, window):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.rolling(window=window, min_periods=1).mean()
+    avg_loss = loss.rolling(window=window, min_periods=1).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def _advance(progress_bar, steps):
+    if progress_bar is not None:
+        progress_bar.update(steps)
@@ -1,7 +1,7 @@
 # strategies/ma_strategy.py
 import pandas as pd
 from strategies.base_strategy import BaseStrategy
-from utils.logger import logger
+from utils.logger import logger, trade_logger
 
 
 class MovingAverageStrategy(BaseStrategy):
@@ -28,9 +28,9 @@ class MovingAverageStrategy(BaseStrategy):
             if pd.isna(sma50) or pd.isna(sma200):
                 continue
             
-            logger.debug(
-                f"{timestamp} - Price: {current_price:.2f}, SMA50: {sma50:.2f}, SMA200: {sma200:.2f}, "
-                f"Position: {self.current_position}, Uptrend: {self.uptrend_triggered}"
+            trade_logger.debug(
+                "%s - Price: %.2f, SMA50: %.2f, SMA200: %.2f, Position: %s, Uptrend: %s",
+                timestamp, current_price, sma50, sma200, self.current_position, self.uptrend_triggered
             )
             
             # 🟢 1. BUY Condition 
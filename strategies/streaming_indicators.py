@@ -0,0 +1,207 @@
+# strategies/streaming_indicators.py
+import math
+from collections import deque
+
+
+class StreamingSMA:
+    def __init__(self, window):
+        """
+        Simple moving average updated one bar at a time (min_periods=1, NaN values are skipped).
+
+        Args:
+            window (int): Number of bars in the window.
+        """
+        self.window = window
+        self._values = deque()
+        self._sum = 0.0
+        self._count = 0  # Non-NaN values inside the window
+        self._updates = 0
+        self.value = math.nan
+
+    def update(self, x):
+        self._updates += 1
+        self._values.append(x)
+        if not math.isnan(x):
+            self._sum += x
+            self._count += 1
+        if len(self._values) > self.window:
+            dropped = self._values.popleft()
+            if not math.isnan(dropped):
+                self._sum -= dropped
+                self._count -= 1
+            if self._updates % self.window == 0:
+                # Recompute exactly once per window to stop rounding drift
+                self._sum = math.fsum(value for value in self._values if not math.isnan(value))
+        self.value = self._sum / self._count if self._count else math.nan
+        return self.value
+
+
+class StreamingEMA:
+    def __init__(self, span):
+        """
+        Exponential moving average matching pandas ewm(span=span, min_periods=1, adjust=True).
+
+        Like pandas, a NaN value is skipped: it adds no weight, the older values keep decaying
+        and the average stays at its previous value.
+
+        Args:
+            span (int): EMA span.
+        """
+        self.span = span
+        self._decay = 1 - 2 / (span + 1)
+        self._numerator = 0.0
+        self._denominator = 0.0
+        self.value = math.nan
+
+    def update(self, x):
+        self._numerator *= self._decay
+        self._denominator *= self._decay
+        if not math.isnan(x):
+            self._numerator += x
+            self._denominator += 1
+        self.value = self._numerator / self._denominator if self._denominator else math.nan
+        return self.value
+
+
+class StreamingWMA:
+    def __init__(self, window):
+        """
+        Linearly weighted moving average with the same O(1) recurrence as
+        strategies.indicators.weighted_moving_average.
+
+        Non-finite values enter the sums as 0 and are counted, so the value is NaN only
+        while one is inside the window, as in the batch version.
+
+        Args:
+            window (int): Number of bars in the window.
+        """
+        self.window = window
+        self._values = deque()
+        self._sum = 0.0
+        self._weighted_sum = 0.0
+        self._invalid = 0  # Non-finite values inside the window
+        self._updates = 0
+        self.value = math.nan
+
+    def update(self, x):
+        self._updates += 1
+        valid = math.isfinite(x)
+        self._invalid += 0 if valid else 1
+        finite = x if valid else 0.0
+        if len(self._values) < self.window:
+            self._values.append(x)
+            self._sum += finite
+            self._weighted_sum += len(self._values) * finite
+        else:
+            dropped = self._values.popleft()
+            self._weighted_sum += self.window * finite - self._sum
+            self._sum += finite - (dropped if math.isfinite(dropped) else 0.0)
+            self._invalid -= 0 if math.isfinite(dropped) else 1
+            self._values.append(x)
+            if self._updates % self.window == 0:
+                # Recompute exactly once per window to stop rounding drift
+                self._sum = math.fsum(value for value in self._values if math.isfinite(value))
+                self._weighted_sum = math.fsum(weight * value for weight, value in enumerate(self._values, 1)
+                                               if math.isfinite(value))
+
+        count = len(self._values)
+        self.value = self._weighted_sum / (count * (count + 1) / 2) if not self._invalid else math.nan
+        return self.value
+
+
+class StreamingRSI:
+    def __init__(self, window):
+        """
+        RSI from simple moving averages of gains and losses, matching GenericStrategy's RSI.
+
+        Args:
+            window (int): Averaging window.
+        """
+        self.window = window
+        self._previous = None
+        self._avg_gain = StreamingSMA(window)
+        self._avg_loss = StreamingSMA(window)
+        self.value = math.nan
+
+    def update(self, x):
+        delta = 0.0 if self._previous is None else x - self._previous
+        self._previous = x
+        avg_gain = self._avg_gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self._avg_loss.update(-delta if delta < 0 else 0.0)
+
+        if avg_loss == 0:
+            self.value = math.nan if avg_gain == 0 else 100.0
+        else:
+            self.value = 100 - (100 / (1 + avg_gain / avg_loss))
+        return self.value
+
+
+class StreamingMACD:
+    def __init__(self, short_window, long_window, signal_window=9):
+        """
+        MACD line (fast EMA - slow EMA) and its signal line.
+
+        Args:
+            short_window (int): Fast EMA span.
+            long_window (int): Slow EMA span.
+            signal_window (int): Signal EMA span.
+        """
+        self._fast_ema = StreamingEMA(short_window)
+        self._slow_ema = StreamingEMA(long_window)
+        self._signal = StreamingEMA(signal_window)
+        self.value = math.nan
+        self.signal = math.nan
+
+    def update(self, x):
+        self.value = self._fast_ema.update(x) - self._slow_ema.update(x)
+        self.signal = self._signal.update(self.value)
+        return self.value, self.signal
+
+
+class StreamingIndicatorPair:
+    def __init__(self, indicator_type, short_window, long_window):
+        """
+        Incremental FAST_IND / SLOW_IND pair for GenericStrategy.
+
+        Each update() consumes one close price in constant time and returns the same
+        values calculate_indicators() produces for that bar on the full history.
+
+        Args:
+            indicator_type (str): Type of indicator (SMA, EMA, WMA, RSI, MACD).
+            short_window (int): Window for the fast indicator.
+            long_window (int): Window for the slow indicator.
+        """
+        self.indicator_type = indicator_type
+        if indicator_type == 'SMA':
+            self._fast, self._slow = StreamingSMA(short_window), StreamingSMA(long_window)
+        elif indicator_type == 'EMA':
+            self._fast, self._slow = StreamingEMA(short_window), StreamingEMA(long_window)
+        elif indicator_type == 'WMA':
+            self._fast, self._slow = StreamingWMA(short_window), StreamingWMA(long_window)
+        elif indicator_type == 'RSI':
+            self._fast, self._slow = StreamingRSI(short_window), StreamingSMA(long_window)
+        elif indicator_type == 'MACD':
+            self._macd = StreamingMACD(short_window, long_window)
+        else:
+            raise ValueError(f"Indicator '{indicator_type}' is not supported.")
+
+    def update(self, close):
+        """
+        Add one close price.
+
+        Returns:
+            tuple: (fast, slow) indicator values for this bar.
+        """
+        if self.indicator_type == 'MACD':
+            return self._macd.update(close)
+        if self.indicator_type == 'RSI':
+            fast = self._fast.update(close)
+            return fast, self._slow.update(fast)
+        return self._fast.update(close), self._slow.update(close)
+
+    def warm_up(self, closes):
+        """Feed historical close prices without trading on them."""
+        fast = slow = math.nan
+        for close in closes:
+            fast, slow = self.update(float(close))
+        return fast, slow
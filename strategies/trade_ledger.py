@@ -0,0 +1,88 @@
+# strategies/trade_ledger.py
+import numpy as np
+import pandas as pd
+
+from strategies.actions import ACTION_NAMES
+
+TRADE_DTYPE = np.dtype([
+    ('bar', np.int64),
+    ('action', np.int8),  # ACTION_* code from strategies.actions
+    ('price', np.float64),
+    ('assets', np.float64),
+    ('fee', np.float64),
+    ('pnl', np.float64),  # Realized profit (negative for losses), 0 for entries
+])
+ACTION_CODES = {name: code for code, name in ACTION_NAMES.items()}
+ACTION_CATEGORIES = [ACTION_NAMES[code] for code in sorted(ACTION_NAMES)]
+
+
+class TradeLedger:
+    def __init__(self, capacity=64):
+        """
+        Growable record array of executed trades.
+
+        The buffer doubles when full, so appends are amortized O(1) and memory scales with
+        the number of trades instead of the number of bars.
+
+        Args:
+            capacity (int): Initial number of trade slots.
+        """
+        self._records = np.empty(max(capacity, 1), dtype=TRADE_DTYPE)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def records(self):
+        """Executed trades as a TRADE_DTYPE record array (a view, in execution order)."""
+        return self._records[:self._size]
+
+    def _reserve(self, count):
+        needed = self._size + count
+        if needed > len(self._records):
+            grown = np.empty(max(needed, 2 * len(self._records)), dtype=TRADE_DTYPE)
+            grown[:self._size] = self._records[:self._size]
+            self._records = grown
+
+    def append(self, bar, action, price, assets, fee, pnl):
+        """Record one trade; action is an ACTION_* code or its name (e.g. 'GO_LONG')."""
+        self._reserve(1)
+        self._records[self._size] = (bar, ACTION_CODES.get(action, action), price, assets, fee, pnl)
+        self._size += 1
+
+    def extend(self, bars, actions, prices, assets, fees, pnls):
+        """Record many trades from equal-length arrays (e.g. the compiled engine's trade log)."""
+        count = len(bars)
+        self._reserve(count)
+        added = self._records[self._size:self._size + count]
+        added['bar'] = bars
+        added['action'] = actions
+        added['price'] = prices
+        added['assets'] = assets
+        added['fee'] = fees
+        added['pnl'] = pnls
+        self._size += count
+
+    def of_action(self, action):
+        """Trades of one ACTION_* code or name."""
+        records = self.records
+        return records[records['action'] == ACTION_CODES.get(action, action)]
+
+    def action_codes(self, length):
+        """
+        Action of every bar as a categorical (NaN on bars without a trade).
+
+        When a bar has two trades (a long closed and a short opened) the last one is shown,
+        like the former 'Action' column.
+
+        Args:
+            length (int): Number of bars.
+
+        Returns:
+            pd.Categorical: Categories are the ACTION_NAMES values.
+        """
+        codes = np.full(length, -1, dtype=np.int8)
+        records = self.records
+        codes[records['bar']] = records['action'] - min(ACTION_NAMES)
+        return pd.Categorical.from_codes(codes, categories=ACTION_CATEGORIES)
@@ -0,0 +1,8 @@
+# sweep.py
+import sys
+
+from cli import main
+
+# Same as python cli.py sweep
+if __name__ == "__main__":
+    sys.exit(main(['sweep'] + sys.argv[1:]))
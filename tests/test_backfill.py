@@ -0,0 +1,167 @@
+# tests/test_backfill.py
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ingestion.backfill import KLINES_PATH, KlineBackfiller, klines_to_bars
+from ingestion.client import ExchangeClient
+from ingestion.rate_limiter import TokenBucket
+from storage.candle_store import CandleStore
+from storage.gaps import MS_PER_MINUTE, find_gaps
+
+START = 1_640_995_200_000  # 2022-01-01 00:00 UTC
+MARKET_MINUTES = 5_000
+DOWNTIME = {START + minute * MS_PER_MINUTE for minute in [*range(1234, 1241), 3999]}  # Minutes without klines
+STORED_MINUTES = [*range(0, 200), *range(2500, 2600), *range(4000, 4100)]
+RETRY_AFTER = 0.3
+
+
+def kline(timestamp):
+    close = 20_000 + (timestamp // MS_PER_MINUTE) % 997
+    return [timestamp, str(close - 1), str(close + 2), str(close - 3), str(close), '1.5', timestamp + 59_999,
+            str(close * 1.5)]
+
+
+class StandInExchange:
+    """Klines endpoint answering pages with uneven delays, an overlapping and a repeated row."""
+
+    def __init__(self, rate_limited=()):
+        self.arrivals = []  # (monotonic time, startTime) of every request
+        self.completed = []  # startTime of the answered pages in completion order
+        self.rate_limited = set(rate_limited)  # startTimes answered once with HTTP 429
+
+    async def klines(self, request):
+        start, limit = int(request.query['startTime']), int(request.query['limit'])
+        end = int(request.query.get('endTime', start + limit * MS_PER_MINUTE - 1))
+        self.arrivals.append((time.monotonic(), start))
+        if start in self.rate_limited:
+            self.rate_limited.discard(start)
+            return web.json_response({'code': -1003}, status=429, headers={'Retry-After': str(RETRY_AFTER)})
+        await asyncio.sleep((start // MS_PER_MINUTE * 7919 % 13) * 0.003)
+        timestamps = [timestamp for timestamp in range(start, end + 1, MS_PER_MINUTE)
+                      if timestamp not in DOWNTIME and timestamp < START + MARKET_MINUTES * MS_PER_MINUTE][:limit]
+        rows = [kline(timestamp) for timestamp in timestamps]
+        if rows:
+            overlap = timestamps[-1] + MS_PER_MINUTE
+            if overlap not in DOWNTIME and overlap < START + MARKET_MINUTES * MS_PER_MINUTE:
+                rows.append(kline(overlap))
+            rows.append(kline(timestamps[0]))
+        self.completed.append(start)
+        return web.json_response(rows)
+
+
+def serve(exchange, test, rate_limiter=None):
+    async def run():
+        app = web.Application()
+        app.router.add_get(KLINES_PATH, exchange.klines)
+        async with TestServer(app) as server:
+            client = ExchangeClient(str(server.make_url('')), rate_limiter=rate_limiter or TokenBucket(10 ** 9))
+            async with client.session() as session:
+                return await test(client, session)
+    return asyncio.run(run())
+
+
+def stored_store(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    timestamps = START + np.array(STORED_MINUTES, dtype=np.int64) * MS_PER_MINUTE
+    store.write_bars('BTCUSDT', {'timestamp': timestamps, 'close': np.full(len(timestamps), -1.0)})
+    return store, timestamps
+
+
+def backfill(store, existing, max_in_flight=8, batch_limit=100, flush_bars=500):
+    gap_starts, gap_ends = find_gaps(existing, start=START, end=START + (MARKET_MINUTES - 1) * MS_PER_MINUTE)
+
+    async def test(client, session):
+        backfiller = KlineBackfiller(client, max_in_flight=max_in_flight, batch_limit=batch_limit, flush_bars=flush_bars)
+        return await backfiller.backfill(session, store, 'BTCUSDT', gap_starts, gap_ends, existing)
+    return test
+
+
+async def sequential_fetch(client, session, gap_starts, gap_ends, existing, batch_limit=100):
+    """The replaced fetch loop: one startTime/limit request after the other, deduplicated by timestamp."""
+    unique = {}
+    for gap_start, gap_end in zip(gap_starts.tolist(), gap_ends.tolist()):
+        for start in range(gap_start, gap_end, batch_limit * MS_PER_MINUTE):
+            params = {'symbol': 'BTCUSDT', 'interval': '1m', 'startTime': start, 'limit': batch_limit}
+            for row in await client.get_json(session, KLINES_PATH, params):
+                unique[row[0]] = row
+    return [unique[timestamp] for timestamp in sorted(unique) if timestamp not in set(existing.tolist())]
+
+
+def test_out_of_order_pages_are_stored_in_order_and_match_the_sequential_fetch(tmp_path):
+    store, existing = stored_store(tmp_path)
+    exchange = StandInExchange()
+    written = serve(exchange, backfill(store, existing))
+
+    assert exchange.completed != sorted(exchange.completed)  # Pages did arrive out of order
+    result = store.read('BTCUSDT')
+    assert np.all(np.diff(result['timestamp']) > 0)
+    assert len(result['timestamp']) == MARKET_MINUTES - len(DOWNTIME)
+    assert written == len(result['timestamp']) - len(existing)
+    # Stored bars are kept, the overlapping rows of the pages do not replace them
+    stored = np.isin(result['timestamp'], existing)
+    np.testing.assert_array_equal(result['close'][stored], -1.0)
+
+    gap_starts, gap_ends = find_gaps(existing, start=START, end=START + (MARKET_MINUTES - 1) * MS_PER_MINUTE)
+    expected = klines_to_bars(serve(StandInExchange(), lambda client, session: sequential_fetch(
+        client, session, gap_starts, gap_ends, existing)))
+    for column, values in expected.items():
+        np.testing.assert_array_equal(result[column][~stored], values, err_msg=column)
+
+
+def test_rate_limited_request_backs_off_and_is_retried(tmp_path):
+    store, existing = stored_store(tmp_path)
+    limited_start = START + 300 * MS_PER_MINUTE  # Second page of the first gap
+    exchange = StandInExchange(rate_limited=[limited_start])
+    serve(exchange, backfill(store, existing))
+
+    attempts = [arrival for arrival, start in exchange.arrivals if start == limited_start]
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= RETRY_AFTER - 0.01
+    # The pause holds every request of the shared rate limiter back
+    assert not [arrival for arrival, _ in exchange.arrivals if attempts[0] + 0.05 < arrival < attempts[1] - 0.01]
+    assert len(store.read('BTCUSDT')['timestamp']) == MARKET_MINUTES - len(DOWNTIME)
+
+
+def assert_within_rate(times, weight, rate_per_second, capacity, slack=1):
+    times = np.sort(np.asarray(times))
+    for i in range(len(times)):
+        counts = np.arange(1, len(times) - i + 1)  # Requests in [times[i], times[j]]
+        allowed = capacity + rate_per_second * (times[i:] - times[i])
+        assert np.all(counts * weight <= allowed + slack * weight)
+
+
+def test_backfill_requests_stay_within_the_rate_limit(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    existing = START + np.arange(MARKET_MINUTES - 3_000, dtype=np.int64) * MS_PER_MINUTE
+    exchange = StandInExchange()
+    # 100 weight per second with bursts of 4, so at most 50 klines requests (weight 2) per second
+    serve(exchange, backfill(store, existing), rate_limiter=TokenBucket(6_000, capacity=4))
+
+    times = [arrival for arrival, _ in exchange.arrivals]
+    assert len(times) == 30
+    assert times[-1] - times[0] >= (30 * 2 - 4) / 100 - 0.01
+    assert_within_rate(times, 2, 100, 4)
+
+
+def test_token_bucket_keeps_the_acquire_rate_within_its_limit():
+    bucket = TokenBucket(6_000, capacity=5)
+    times = []
+
+    async def take():
+        await bucket.acquire()
+        times.append(time.monotonic())
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*(take() for _ in range(60)))
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= (60 - 5) / 100 - 0.01
+    assert_within_rate(times, 1, 100, 5)
+    with pytest.raises(ValueError):
+        asyncio.run(bucket.acquire(6))
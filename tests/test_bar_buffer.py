@@ -0,0 +1,56 @@
+# tests/test_bar_buffer.py
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from live_trading.bar_buffer import BAR_COLUMNS, BarRingBuffer
+
+
+def random_bar(rng, minute):
+    close = 100 + rng.standard_normal()
+    return {'timestamp': 1_640_995_200_000 + minute * 60_000, 'open': close + 0.1, 'high': close + 1,
+            'low': close - 1, 'close': close, 'volume': rng.random()}
+
+
+@pytest.mark.parametrize('capacity', [1, 7, 64])
+def test_windows_match_a_bounded_deque(capacity):
+    rng = np.random.default_rng(capacity)
+    buffer = BarRingBuffer(capacity)
+    reference = deque(maxlen=capacity)
+
+    for minute in range(5 * capacity + 3):
+        bar = random_bar(rng, minute)
+        buffer.append_bar(bar)
+        reference.append(bar)
+
+        assert len(buffer) == len(reference)
+        for column in ('timestamp',) + BAR_COLUMNS:
+            expected = [row[column] for row in reference]
+            np.testing.assert_array_equal(buffer.window(column), expected)
+            np.testing.assert_array_equal(buffer.window(column, size=3), expected[-3:])
+            assert buffer.latest(column) == expected[-1]
+
+
+def test_window_is_a_read_only_view():
+    buffer = BarRingBuffer(4)
+    for minute in range(6):
+        buffer.append(pd.Timestamp('2022-01-01', tz='UTC') + pd.Timedelta(minutes=minute), 1, 2, 0, minute, 1)
+
+    window = buffer.window()
+    assert not window.flags.writeable
+    assert not window.flags.owndata
+    np.testing.assert_array_equal(window, [2, 3, 4, 5])
+    frame = buffer.to_frame()
+    assert frame.index[0] == pd.Timestamp('2022-01-01 00:02', tz='UTC')
+    np.testing.assert_array_equal(frame['close'], [2, 3, 4, 5])
+
+
+def test_empty_and_invalid_buffers():
+    with pytest.raises(ValueError):
+        BarRingBuffer(0)
+    buffer = BarRingBuffer(3)
+    assert len(buffer.window()) == 0
+    with pytest.raises(IndexError):
+        buffer.latest()
@@ -0,0 +1,82 @@
+# tests/test_bar_log.py
+import os
+
+import numpy as np
+
+from storage.bar_log import BarLog
+from storage.candle_store import COLUMNS, CandleStore
+
+
+def random_bars(rows, start='2022-01-01', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(rows))
+    first = np.datetime64(start, 'ms').astype(np.int64)
+    return [
+        {'timestamp': int(first + row * 60_000), 'open': close[row] + 0.1, 'high': close[row] + 1,
+         'low': close[row] - 1, 'close': close[row], 'volume': rng.random(), 'quoteVolume': rng.random()}
+        for row in range(rows)
+    ]
+
+
+def assert_store_holds(store, bars):
+    arrays = store.read('BTCUSDT')
+    for column in COLUMNS:
+        np.testing.assert_array_equal(arrays[column], [bar[column] for bar in bars])
+
+
+def test_appended_bars_compact_into_the_store_bit_for_bit(tmp_path):
+    store = CandleStore(str(tmp_path / 'store'), timeframes=())
+    log = BarLog(str(tmp_path / 'wal'))
+    bars = random_bars(3000)
+
+    for bar in bars[:2000]:
+        assert log.append(bar)
+    assert len(log) == 2000
+    np.testing.assert_array_equal(log.pending_timestamps(), [bar['timestamp'] for bar in bars[:2000]])
+    assert log.compact(store, 'BTCUSDT') == 2000
+    assert len(log) == 0 and len(log.pending_timestamps()) == 0
+
+    for bar in bars[2000:]:
+        assert log.append(bar)
+    assert log.compact(store, 'BTCUSDT') == 1000
+    assert_store_holds(store, bars)
+
+
+def test_duplicate_and_late_bars_are_rejected_across_restarts(tmp_path):
+    folder = str(tmp_path / 'wal')
+    bars = random_bars(10)
+    log = BarLog(folder)
+    for bar in bars[:5]:
+        log.append(bar)
+
+    assert not log.append(bars[4])
+    assert not log.append(bars[2])
+    reopened = BarLog(folder)
+    assert reopened.high_water_mark == bars[4]['timestamp']
+    assert not reopened.append(bars[3])
+    assert reopened.append(bars[5])
+    reopened.advance(bars[8]['timestamp'])
+    assert not reopened.append(bars[7])
+    assert len(reopened) == 6
+
+
+def test_sealed_segment_and_torn_tail_survive_a_crash(tmp_path):
+    store = CandleStore(str(tmp_path / 'store'), timeframes=())
+    folder = str(tmp_path / 'wal')
+    bars = random_bars(20)
+    log = BarLog(folder)
+    for bar in bars[:10]:
+        log.append(bar)
+    log.compact(store, 'BTCUSDT')
+    for bar in bars[10:]:
+        log.append(bar)
+    # Crash after sealing the log but before the merge, then during the first append to the new log
+    os.replace(log.log_path, log.sealed_path)
+    with open(log.log_path, 'w') as file:
+        file.write(f"{bars[-1]['timestamp'] + 60_000},1.0,2.0")
+
+    recovered = BarLog(folder)
+    assert len(recovered) == 10
+    assert recovered.high_water_mark == bars[-1]['timestamp']
+    assert recovered.compact(store, 'BTCUSDT') == 10
+    assert_store_holds(store, bars)
@@ -0,0 +1,191 @@
+# tests/test_candle_store.py
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from storage.candle_store import COLUMNS, SNAPSHOT_FOLDER, CandleStore
+from storage.convert_csv import convert_csv
+from storage.versioned_folder import POINTER_NAME, read_pointer
+
+
+def random_bars(rows, start='2022-01-01', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(rows))
+    first = np.datetime64(start, 'ms').astype(np.int64)
+    return {
+        'timestamp': first + np.arange(rows, dtype=np.int64) * 60_000,
+        'open': close + 0.1,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.random(rows),
+        'quoteVolume': rng.random(rows),
+    }
+
+
+def reference_frame(*chunks):
+    # Later chunks win on duplicate timestamps, like write_bars
+    frame = pd.concat([pd.DataFrame(chunk) for chunk in chunks], ignore_index=True)
+    return frame.drop_duplicates('timestamp', keep='last').sort_values('timestamp').reset_index(drop=True)
+
+
+def assert_bars_equal(arrays, frame):
+    assert set(arrays) == set(frame.columns)
+    for column, values in arrays.items():
+        assert values.dtype == COLUMNS[column]
+        np.testing.assert_array_equal(values, frame[column].to_numpy())
+
+
+@pytest.mark.parametrize('partition', ['day', 'month'])
+def test_overlapping_unordered_writes_read_back_like_pandas(tmp_path, partition):
+    store = CandleStore(str(tmp_path), partition=partition, timeframes=())
+    bars = random_bars(4 * 1440, start='2022-01-30')
+    rng = np.random.default_rng(1)
+    chunks = []
+    for first in (3000, 0, 1000, 4500):
+        rows = rng.permutation(np.arange(first, min(first + 2000, len(bars['timestamp']))))
+        chunk = {column: values[rows] for column, values in bars.items()}
+        chunk['close'] = chunk['close'] + first  # Overlapping rows differ, so the newest write must win
+        chunks.append(chunk)
+        store.write_bars('BTCUSDT', chunk)
+
+    expected = reference_frame(*chunks)
+    assert_bars_equal(store.read('BTCUSDT'), expected)
+    assert len(store.partitions('BTCUSDT')) == (4 if partition == 'day' else 2)
+
+    # A date-only end includes its whole day
+    times = pd.to_datetime(expected['timestamp'], unit='ms')
+    inside = (times >= '2022-01-31 12:00') & (times < '2022-02-02')
+    assert_bars_equal(store.read('BTCUSDT', '2022-01-31 12:00', '2022-02-01'),
+                      expected[inside.to_numpy()].reset_index(drop=True))
+    columns = store.read('BTCUSDT', columns=['close'])
+    assert set(columns) == {'timestamp', 'close'}
+    np.testing.assert_array_equal(columns['close'], expected['close'])
+    assert store.last_timestamp('BTCUSDT') == expected['timestamp'].iloc[-1]
+
+
+def test_missing_columns_are_stored_as_nan(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    bars = random_bars(10)
+    store.write_bars('BTCUSDT', {'timestamp': bars['timestamp'], 'close': bars['close']})
+
+    arrays = store.read('BTCUSDT')
+    np.testing.assert_array_equal(arrays['close'], bars['close'])
+    assert np.isnan(arrays['quoteVolume']).all()
+    assert store.symbols() == ['BTCUSDT']
+
+
+def test_convert_csv_round_trip(tmp_path):
+    bars = random_bars(3000, start='2022-01-01 12:00')
+    csv_path = str(tmp_path / 'candles.csv')
+    times = pd.to_datetime(bars['timestamp'], unit='ms', utc=True)
+    pd.DataFrame({
+        'timestamp': times.strftime('%Y-%m-%dT%H:%M:%S+00:00'), 'symbol': 'BTCUSDT', 'price': bars['close'],
+        'open': bars['open'], 'high': bars['high'], 'low': bars['low'], 'volume': bars['volume'],
+        'quoteVolume': bars['quoteVolume'],
+    }).to_csv(csv_path, index=False)
+
+    assert convert_csv(csv_path, str(tmp_path / 'store'), 'BTCUSDT', chunksize=700) == 3000
+    arrays = CandleStore(str(tmp_path / 'store')).read('BTCUSDT')
+    np.testing.assert_array_equal(arrays['timestamp'], bars['timestamp'])
+    for column in ('open', 'high', 'low', 'close', 'volume', 'quoteVolume'):
+        np.testing.assert_allclose(arrays[column], bars[column], rtol=1e-14, atol=1e-15)
+
+
+def test_reads_never_see_a_partition_mid_rewrite(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    timestamps = random_bars(3 * 1440)['timestamp']
+
+    def generation(number):
+        # Every value column of a row holds the generation, so a row mixing two writes is detected
+        return dict({column: np.full(len(timestamps), float(number)) for column in COLUMNS if column != 'timestamp'},
+                    timestamp=timestamps)
+
+    store.write_bars('BTCUSDT', generation(0))
+    stop = threading.Event()
+    errors = []
+
+    def rewrite():
+        number = 0
+        try:
+            while not stop.is_set():
+                number += 1
+                store.write_bars('BTCUSDT', generation(number))
+        except Exception as error:
+            errors.append(error)
+
+    writer = threading.Thread(target=rewrite)
+    writer.start()
+    reads = 0
+    deadline = time.monotonic() + 2
+    try:
+        while time.monotonic() < deadline:
+            arrays = store.read('BTCUSDT')
+            np.testing.assert_array_equal(arrays['timestamp'], timestamps)
+            values = np.stack([arrays[column] for column in COLUMNS if column != 'timestamp'])
+            assert (values == values[0]).all()
+            assert store.last_timestamp('BTCUSDT') == timestamps[-1]
+            reads += 1
+    finally:
+        stop.set()
+        writer.join()
+    assert not errors
+    assert reads > 10
+
+
+def test_partitions_of_the_unversioned_layout_are_read_and_migrated(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    bars = random_bars(100)
+    folder = os.path.join(str(tmp_path), 'BTCUSDT', '2022-01-01')
+    os.makedirs(folder)
+    for column, dtype in COLUMNS.items():
+        np.save(os.path.join(folder, f"{column}.npy"), bars[column].astype(dtype))
+
+    assert_bars_equal(store.read('BTCUSDT'), pd.DataFrame(bars))
+    signature = store.signature('BTCUSDT')
+    store.write_bars('BTCUSDT', {column: values[:10] * 2 if column != 'timestamp' else values[:10]
+                                 for column, values in bars.items()})
+
+    assert store.signature('BTCUSDT') != signature
+    assert sorted(os.listdir(folder)) == sorted([POINTER_NAME, read_pointer(folder)['version']])
+    np.testing.assert_array_equal(store.read('BTCUSDT')['close'][:10], bars['close'][:10] * 2)
+
+
+def test_snapshot_is_rebuilt_into_a_new_version_after_a_write(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    bars = random_bars(3000)
+    store.write_bars('BTCUSDT', {column: values[:2000] for column, values in bars.items()})
+
+    first = store.snapshot('BTCUSDT')
+    assert isinstance(first['close'], np.memmap)
+    np.testing.assert_array_equal(first['close'], bars['close'][:2000])
+    folder = os.path.join(str(tmp_path), SNAPSHOT_FOLDER, '1m', 'BTCUSDT')
+    version = read_pointer(folder)['version']
+    assert store.snapshot('BTCUSDT')['close'].filename == first['close'].filename
+
+    store.write_bars('BTCUSDT', {column: values[2000:] for column, values in bars.items()})
+    second = store.snapshot('BTCUSDT')
+    assert read_pointer(folder)['version'] != version
+    for column in COLUMNS:
+        np.testing.assert_array_equal(second[column], bars[column])
+    # The earlier mapping still reads the data it was opened on
+    np.testing.assert_array_equal(first['close'], bars['close'][:2000])
+
+
+def test_snapshot_replaces_the_unversioned_layout(tmp_path):
+    store = CandleStore(str(tmp_path), timeframes=())
+    bars = random_bars(100)
+    store.write_bars('BTCUSDT', bars)
+    folder = os.path.join(str(tmp_path), SNAPSHOT_FOLDER, '1m', 'BTCUSDT')
+    os.makedirs(folder)
+    for column in COLUMNS:
+        np.save(os.path.join(folder, f"{column}.npy"), np.zeros(1, dtype=COLUMNS[column]))
+    with open(os.path.join(folder, 'meta.json'), 'w') as file:
+        file.write('{"signature": "old"}')
+
+    np.testing.assert_array_equal(store.snapshot('BTCUSDT')['close'], bars['close'])
+    assert sorted(name for name in os.listdir(folder) if name != POINTER_NAME) == [read_pointer(folder)['version']]
@@ -0,0 +1,35 @@
+# tests/test_cli.py
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['matplotlib', 'plotly', 'numba']
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+
+
+def test_importing_the_cli_does_not_load_plotting_or_numba():
+    result = run_python('-c', "import sys, cli; cli.build_parser(); "
+                              f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
+
+
+@pytest.mark.skipif(importlib.util.find_spec('ccxt') is not None, reason="ccxt is installed")
+def test_live_without_ccxt_logs_an_error_and_fails(tmp_path):
+    log_file = tmp_path / 'trading_bot.log'
+    config = tmp_path / 'config.py'
+    with open(os.path.join(ROOT, 'config.py')) as file:
+        config.write_text(f"{file.read()}\nLOG_FILE = {str(log_file)!r}\n")
+
+    result = run_python('cli.py', 'live', '--config', str(config))
+
+    assert result.returncode == 1
+    assert 'needs the ccxt package' in log_file.read_text()
+    assert 'ERROR' in result.stderr and 'needs the ccxt package' in result.stderr
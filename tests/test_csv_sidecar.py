@@ -0,0 +1,69 @@
+# tests/test_csv_sidecar.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage.csv_sidecar import load_csv_columns, parse_csv, sidecar_path
+from storage.versioned_folder import POINTER_NAME, read_pointer
+
+
+def write_candle_csv(path, rows, start='2022-01-01', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(rows))
+    pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=rows, freq='1min', tz='UTC').strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+        'symbol': 'BTCUSDT',
+        'price': close,
+        'open': close + 0.1,
+        'high': close + 1,
+        'low': close - 1,
+        'volume': rng.random(rows),
+        'quoteVolume': rng.random(rows),
+        'openTime': '',
+        'closeTime': '',
+    }).to_csv(path, index=False)
+    return path
+
+
+def assert_same_columns(arrays, expected):
+    assert set(arrays) == set(expected)
+    for column, values in expected.items():
+        np.testing.assert_array_equal(arrays[column], values)
+
+
+def test_first_build_and_reuse_return_the_same_memmaps(tmp_path):
+    csv_path = write_candle_csv(tmp_path / 'candles.csv', 500)
+    expected = parse_csv(csv_path)
+
+    built = load_csv_columns(csv_path)
+    reused = load_csv_columns(csv_path)
+
+    for arrays in (built, reused):
+        assert all(isinstance(values, np.memmap) for values in arrays.values())
+        assert_same_columns(arrays, expected)
+
+
+def test_changed_csv_publishes_a_new_version(tmp_path):
+    csv_path = str(write_candle_csv(tmp_path / 'candles.csv', 300))
+    first = load_csv_columns(csv_path)
+    version = read_pointer(sidecar_path(csv_path))['version']
+
+    write_candle_csv(csv_path, 400, seed=1)
+    second = load_csv_columns(csv_path)
+
+    assert read_pointer(sidecar_path(csv_path))['version'] != version
+    assert_same_columns(second, parse_csv(csv_path))
+    # Arrays mapped before the rebuild still read the previous data
+    assert len(first['close']) == 300
+
+
+def test_unversioned_sidecar_is_replaced(tmp_path):
+    csv_path = str(write_candle_csv(tmp_path / 'candles.csv', 200))
+    folder = sidecar_path(csv_path)
+    os.makedirs(folder)
+    for name in ('meta.json', 'close.npy'):
+        open(os.path.join(folder, name), 'w').close()
+
+    assert_same_columns(load_csv_columns(csv_path), parse_csv(csv_path))
+    assert sorted(os.listdir(folder)) == sorted([POINTER_NAME, read_pointer(folder)['version']])
@@ -0,0 +1,45 @@
+# tests/test_detail_tiles.py
+import base64
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization.detail_tiles import write_detail_tiles
+
+TILE_PATTERN = re.compile(r'window\.tradingChartTile\("(\w+)", (\d+), (\d+), "([^"]*)"\);')
+
+
+def read_tile(path, n_series):
+    with open(path) as file:
+        key, base, count, payload = TILE_PATTERN.match(file.read()).groups()
+    data = base64.b64decode(payload)
+    count = int(count)
+    seconds = int(base) + np.frombuffer(data, dtype='<u4', count=count).astype(np.int64)
+    values = [np.frombuffer(data, dtype='<f4', count=count, offset=4 * count * (s + 1)) for s in range(n_series)]
+    return seconds, values
+
+
+@pytest.mark.parametrize('method', ['MINMAX', 'LTTB'])
+def test_finest_level_holds_every_bar(tmp_path, method):
+    rows = 5000
+    index = pd.date_range('2022-01-01', periods=rows, freq='1min')
+    rng = np.random.default_rng(0)
+    series = [100 + np.cumsum(rng.standard_normal(rows)), 100 + rng.standard_normal(rows)]
+    html_file = os.path.join(str(tmp_path), 'chart.html')
+
+    manifest = write_detail_tiles(html_file, index, series, resolution=100, method=method)
+
+    levels = len(manifest['levels'])
+    folder = os.path.join(str(tmp_path), manifest['folder'])
+    tiles = [read_tile(os.path.join(folder, f"L{levels}_T{tile}.js"), len(series))
+             for tile in range(len(manifest['levels'][-1]))]
+    seconds = np.concatenate([tile[0] for tile in tiles])
+    np.testing.assert_array_equal(seconds, index.values.astype('datetime64[s]').astype(np.int64))
+    for s, values in enumerate(series):
+        np.testing.assert_array_equal(np.concatenate([tile[1][s] for tile in tiles]), values.astype(np.float32))
+    # Coarser levels stay downsampled
+    first_tile = read_tile(os.path.join(folder, 'L1_T0.js'), len(series))
+    assert len(first_tile[0]) < rows // 2
@@ -0,0 +1,63 @@
+# tests/test_downsample.py
+import numpy as np
+import pytest
+
+from visualization.downsample import downsample_indices
+
+METHODS = ['MINMAX', 'LTTB']
+
+
+def random_close(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return 20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows)))
+
+
+@pytest.mark.parametrize('rows, buckets', [(10_000, 100), (10_007, 333), (999, 200)])
+def test_minmax_keeps_every_bucket_minimum_and_maximum(rows, buckets):
+    close = random_close(rows)
+    close[::97] = np.nan
+    fast = random_close(rows, seed=1)
+    selected = downsample_indices([close, fast], buckets, 'MINMAX')
+
+    assert np.all(np.diff(selected) > 0)
+    size = -(-rows // buckets)
+    for start in range(0, rows, size):
+        rows_in_bucket = selected[(selected >= start) & (selected < start + size)]
+        assert rows_in_bucket[0] == start and rows_in_bucket[-1] == min(start + size, rows) - 1
+        for values in (close, fast):
+            assert np.nanmin(values[rows_in_bucket]) == np.nanmin(values[start:start + size])
+            assert np.nanmax(values[rows_in_bucket]) == np.nanmax(values[start:start + size])
+
+
+def test_lttb_keeps_the_first_and_last_points():
+    close = random_close(10_000, seed=2)
+    close[:5] = np.nan
+    selected = downsample_indices([close], 100, 'LTTB')
+
+    assert len(selected) == 200
+    assert selected[0] == 0 and selected[-1] == len(close) - 1
+    assert np.all(np.diff(selected) > 0)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_kept_rows_are_always_in_the_output(method):
+    close = random_close(20_000, seed=3)
+    keep = np.sort(np.random.default_rng(3).choice(len(close), 50, replace=False))
+    selected = downsample_indices([close, random_close(20_000, seed=4)], 50, method, keep=keep)
+
+    assert np.all(np.isin(keep, selected))
+    assert np.all(np.diff(selected) > 0)
+    assert len(selected) < len(close) // 20
+
+
+@pytest.mark.parametrize('method, rows', [('NONE', 10_000), ('MINMAX', 400), ('LTTB', 200), ('MINMAX', 0)])
+def test_small_series_and_none_come_back_unchanged(method, rows):
+    close = random_close(rows, seed=5)
+    selected = downsample_indices([close, close * 2], 100, method, keep=np.array([3]) if rows else None)
+    np.testing.assert_array_equal(selected, np.arange(rows))
+    assert selected.dtype == np.int64
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        downsample_indices([random_close(100)], 10, 'MEAN')
@@ -0,0 +1,127 @@
+# tests/test_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.engine import ENGINE_INVALID_LONG_EXIT, make_state, run_batch
+from strategies.generic_strategy import GenericStrategy
+
+STATE_ATTRIBUTES = [
+    'balance', 'current_position', 'entry_price', 'stop_loss_price', 'assets', 'uptrend_triggered',
+    'downtrend_triggered', 'total_fees', 'long_profit', 'long_loss', 'short_profit', 'short_loss'
+]
+
+STRATEGY_SETTINGS = dict(
+    initial_capital=10_000, trade_fee=0.001, profit_target=0.01, stop_loss=0.01, enable_stop_loss=True,
+    enable_close_long_on_downtrend=False, enable_close_short_on_uptrend=False, enable_profit_target=True,
+    enable_longing=True, enable_shorting=False
+)
+
+# Exit and direction settings covering every branch of the state machine
+CONFIGS = {
+    'long_profit_target': dict(enable_shorting=False),
+    'long_downtrend_only': dict(enable_shorting=False, enable_profit_target=False,
+                                enable_close_long_on_downtrend=True),
+    'long_both_exits': dict(enable_shorting=False, enable_close_long_on_downtrend=True),
+    'short_profit_target': dict(enable_longing=False, enable_shorting=True),
+    'short_uptrend_only': dict(enable_longing=False, enable_shorting=True, enable_profit_target=False,
+                               enable_close_short_on_uptrend=True),
+    'long_and_short': dict(enable_shorting=True, enable_close_long_on_downtrend=True,
+                           enable_close_short_on_uptrend=True),
+    'no_stop_loss': dict(enable_shorting=True, enable_stop_loss=False),
+}
+
+
+def random_candles(rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows)))
+    index = pd.date_range('2022-01-01', periods=rows, freq='1min', tz='UTC', name='timestamp')
+    return pd.DataFrame({'close': close}, index=index)
+
+
+def make_strategy(df, engine, indicator_type='SMA', **overrides):
+    settings = dict(STRATEGY_SETTINGS, short_window=20, long_window=80, indicator_type=indicator_type, engine=engine)
+    settings.update(overrides)
+    return GenericStrategy(data=df.copy(), **settings)
+
+
+def run_strategy(df, engine, **settings):
+    strategy = make_strategy(df, engine, **settings)
+    strategy.run()
+    return strategy
+
+
+def assert_same_run(strategy, reference):
+    for name in STATE_ATTRIBUTES:
+        assert getattr(strategy, name) == pytest.approx(getattr(reference, name), rel=1e-12), name
+    records, expected = strategy.ledger.records, reference.ledger.records
+    assert len(records) == len(expected)
+    np.testing.assert_array_equal(records['bar'], expected['bar'])
+    np.testing.assert_array_equal(records['action'], expected['action'])
+    for field in ('price', 'assets', 'fee', 'pnl'):
+        np.testing.assert_allclose(records[field], expected[field], rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.parametrize('config', list(CONFIGS))
+def test_numba_engine_matches_python(config):
+    df = random_candles()
+    reference = run_strategy(df, 'PYTHON', **CONFIGS[config])
+    assert len(reference.ledger) > 10
+    assert_same_run(run_strategy(df, 'NUMBA', **CONFIGS[config]), reference)
+
+
+@pytest.mark.parametrize('indicator_type', ['EMA', 'RSI', 'MACD'])
+def test_numba_engine_matches_python_for_indicator(indicator_type):
+    df = random_candles(seed=1)
+    settings = dict(CONFIGS['long_and_short'], indicator_type=indicator_type)
+    assert_same_run(run_strategy(df, 'NUMBA', **settings), run_strategy(df, 'PYTHON', **settings))
+
+
+@pytest.mark.parametrize('engine', ['PYTHON', 'NUMBA'])
+def test_invalid_exit_configuration_raises(engine):
+    with pytest.raises(ValueError):
+        run_strategy(random_candles(2_000), engine, enable_profit_target=False)
+
+
+def test_batch_kernel_matches_single_runs():
+    df = random_candles()
+    reference = make_strategy(df, 'PYTHON')
+    configs = [dict(STRATEGY_SETTINGS, **CONFIGS[config]) for config in CONFIGS]
+    configs.append(dict(STRATEGY_SETTINGS, enable_profit_target=False))  # Invalid exit configuration
+
+    states, trade_counts, errors, equity = run_batch(reference.close, reference.fast_ind, reference.slow_ind,
+                                                     configs, equity_every=1000)
+
+    assert equity.shape == (len(configs), 21)
+    for row, config in enumerate(CONFIGS):
+        single = run_strategy(df, 'NUMBA', **CONFIGS[config])
+        assert errors[row] == 0
+        assert trade_counts[row] == len(single.ledger)
+        np.testing.assert_array_equal(states[row], make_state(*[getattr(single, name) for name in STATE_ATTRIBUTES]))
+        # The last sample values the open position as if it were closed on the last bar
+        fee = configs[row]['trade_fee']
+        value = single.balance
+        if single.current_position:
+            price = single.close[-1]
+            value += single.assets * (single.entry_price + single.current_position * (price - single.entry_price)
+                                      * (1 - 2 * fee))
+        assert equity[row, -1] == pytest.approx(value, rel=1e-12)
+    assert errors[-1] == ENGINE_INVALID_LONG_EXIT
+
+
+@pytest.mark.parametrize('config', list(CONFIGS))
+@pytest.mark.parametrize('short_window, long_window, target', [(20, 80, 0.01), (200, 2000, 0.002), (5, 30, 0.05)])
+def test_event_engine_matches_python(config, short_window, long_window, target):
+    df = random_candles(seed=2)
+    settings = dict(CONFIGS[config], short_window=short_window, long_window=long_window, profit_target=target,
+                    stop_loss=target)
+    reference = run_strategy(df, 'PYTHON', **settings)
+    assert_same_run(run_strategy(df, 'EVENT', **settings), reference)
+
+
+def test_event_engine_matches_python_on_flat_prices():
+    # Equal indicators (no trend) and long runs without price events exercise the skipping
+    df = random_candles(seed=3)
+    df.iloc[5_000:12_000, 0] = df['close'].iloc[5_000]
+    settings = CONFIGS['long_and_short']
+    assert_same_run(run_strategy(df, 'EVENT', **settings), run_strategy(df, 'PYTHON', **settings))
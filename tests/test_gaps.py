@@ -0,0 +1,63 @@
+# tests/test_gaps.py
+import numpy as np
+import pytest
+
+from storage.gaps import MS_PER_MINUTE, find_gaps, missing_mask
+
+START = 1_640_995_200_000  # 2022-01-01 00:00 UTC
+
+
+def reference_gaps(timestamps, start=None, end=None):
+    """The per-timestamp loop find_gaps replaced, extended by the start and end bounds."""
+    gaps = []
+    if not len(timestamps):
+        if start is not None and end is not None and end >= start:
+            gaps.append((start, end + MS_PER_MINUTE))
+        return gaps
+    if start is not None and start < timestamps[0]:
+        gaps.append((start, timestamps[0]))
+    for i in range(1, len(timestamps)):
+        expected_next = timestamps[i - 1] + MS_PER_MINUTE
+        if timestamps[i] > expected_next:
+            gaps.append((expected_next, timestamps[i]))
+    if end is not None and end > timestamps[-1]:
+        gaps.append((timestamps[-1] + MS_PER_MINUTE, end + MS_PER_MINUTE))
+    return gaps
+
+
+def minutes(*offsets):
+    return START + np.array(offsets, dtype=np.int64) * MS_PER_MINUTE
+
+
+def assert_same_gaps(timestamps, start=None, end=None):
+    gap_starts, gap_ends = find_gaps(timestamps, start, end)
+    assert gap_starts.dtype == gap_ends.dtype == np.int64
+    assert list(zip(gap_starts.tolist(), gap_ends.tolist())) == reference_gaps(list(timestamps), start, end)
+
+
+@pytest.mark.parametrize('timestamps, start, end', [
+    (minutes(*range(10)), None, None),  # No gaps
+    (minutes(*range(10)), START, START + 9 * MS_PER_MINUTE),  # No gaps within the bounds
+    (minutes(5, 6, 7), START, None),  # Gap at the start
+    (minutes(0, 1, 2), None, START + 9 * MS_PER_MINUTE),  # Gap at the end
+    (minutes(0, 1, 1, 2, 2, 5, 5, 6), START, START + 8 * MS_PER_MINUTE),  # Duplicate timestamps
+    (minutes(3), START, START + 6 * MS_PER_MINUTE),  # Single bar with gaps on both sides
+    (minutes(), START, START + 4 * MS_PER_MINUTE),  # Nothing stored yet
+    (minutes(), None, None),
+])
+def test_find_gaps_edge_cases_match_the_loop(timestamps, start, end):
+    assert_same_gaps(timestamps, start, end)
+
+
+def test_find_gaps_matches_the_loop_on_random_history():
+    rng = np.random.default_rng(0)
+    offsets = np.sort(rng.choice(20_000, 15_000, replace=False))
+    offsets = np.sort(np.concatenate([offsets, offsets[rng.choice(len(offsets), 100)]]))  # Some duplicates
+    assert_same_gaps(minutes(*offsets), START - 30 * MS_PER_MINUTE, START + 20_100 * MS_PER_MINUTE)
+
+
+@pytest.mark.parametrize('existing', [minutes(), minutes(0, 2, 2, 5), minutes(*range(0, 1000, 3))])
+def test_missing_mask_matches_membership(existing):
+    candidates = minutes(*range(-5, 1010))
+    expected = [timestamp not in set(existing.tolist()) for timestamp in candidates.tolist()]
+    np.testing.assert_array_equal(missing_mask(existing, candidates), expected)
@@ -0,0 +1,103 @@
+# tests/test_indicator_cache.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.indicator_cache import IndicatorCache
+from strategies.indicators import calculate_indicators
+
+INDICATOR_TYPES = ['SMA', 'EMA', 'WMA', 'RSI', 'MACD']
+
+
+def random_close(rows=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2022-01-01', periods=rows, freq='1min', tz='UTC')
+    return pd.Series(20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows))), index=index)
+
+
+def test_hits_and_misses_are_counted():
+    cache = IndicatorCache()
+    fingerprint = cache.fingerprint(random_close())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(10.0)
+
+    first = cache.get_or_compute(fingerprint, ('SMA', 5), compute)
+    second = cache.get_or_compute(fingerprint, ('SMA', 5), compute)
+
+    assert len(calls) == 1
+    assert second is first and not second.flags.writeable
+    assert cache.get(fingerprint, ('SMA', 6)) is None
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 0, 2)
+    assert stats['hit_rate'] == pytest.approx(1 / 3)
+
+
+def test_least_recently_used_entries_are_evicted_over_the_budget():
+    cache = IndicatorCache(max_memory_bytes=3 * 80)  # Three 10-value series
+    for window in range(3):
+        cache.put('data', ('SMA', window), np.full(10, float(window)))
+    cache.get('data', ('SMA', 0))  # Now the most recently used
+    cache.put('data', ('SMA', 3), np.zeros(10))
+
+    assert cache.stats()['memory_entries'] == 3
+    assert cache.stats()['memory_bytes'] == 240
+    assert cache.get('data', ('SMA', 1)) is None
+    assert cache.get('data', ('SMA', 0)) is not None
+    # Series larger than the whole budget are not kept in memory
+    cache.put('data', ('SMA', 99), np.zeros(100))
+    assert cache.get('data', ('SMA', 99)) is None
+
+
+def test_disk_entries_are_memory_mapped_in_a_new_cache(tmp_path):
+    values = np.random.default_rng(0).random(1000)
+    writer = IndicatorCache(str(tmp_path))
+    writer.put('data', ('EMA', 20), values)
+    writer.put('data', ('EMA', 20), values * 2)  # An existing file is kept
+
+    files = os.listdir(str(tmp_path))
+    assert files == ['data_EMA_20.npy']  # No temporary file is left behind by the atomic write
+
+    reader = IndicatorCache(str(tmp_path))
+    loaded = reader.get('data', ('EMA', 20))
+    assert isinstance(loaded, np.memmap) and not loaded.flags.writeable
+    np.testing.assert_array_equal(loaded, values)
+    assert reader.get('data', ('EMA', 20)) is loaded
+    assert (reader.disk_hits, reader.memory_hits) == (1, 1)
+
+
+def test_changed_data_gets_a_new_fingerprint(tmp_path):
+    close = random_close()
+    cache = IndicatorCache(str(tmp_path))
+    fast, _ = calculate_indicators(close, 'SMA', 10, 50, cache=cache)
+
+    changed = close.copy()
+    changed.iloc[-1] += 1
+    assert cache.fingerprint(changed) != cache.fingerprint(close)
+    shifted = pd.Series(close.to_numpy(), index=close.index + pd.Timedelta(minutes=1))
+    assert cache.fingerprint(shifted) != cache.fingerprint(close)
+
+    misses = cache.misses
+    changed_fast, _ = calculate_indicators(changed, 'SMA', 10, 50, cache=cache)
+    assert cache.misses == misses + 2
+    assert changed_fast.iloc[-1] != fast.iloc[-1]
+
+
+@pytest.mark.parametrize('indicator_type', INDICATOR_TYPES)
+def test_cached_indicators_are_bit_identical(tmp_path, indicator_type):
+    close = random_close(seed=1)
+    expected = calculate_indicators(close, indicator_type, 12, 48)
+
+    cache = IndicatorCache(str(tmp_path))
+    computed = calculate_indicators(close, indicator_type, 12, 48, cache=cache)
+    from_memory = calculate_indicators(close, indicator_type, 12, 48, cache=cache)
+    from_disk = calculate_indicators(close, indicator_type, 12, 48, cache=IndicatorCache(str(tmp_path)))
+
+    assert cache.hits > 0
+    for result in (computed, from_memory, from_disk):
+        for series, reference in zip(result, expected):
+            np.testing.assert_array_equal(series.to_numpy(), reference.to_numpy())
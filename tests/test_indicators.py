@@ -0,0 +1,38 @@
+# tests/test_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.indicators import weighted_moving_average
+
+
+def reference_wma(close, window):
+    """The rolling().apply WMA that weighted_moving_average replaces (oldest bar weight 1)."""
+    weights = np.arange(1, window + 1, dtype=np.float64)
+    return close.rolling(window=window, min_periods=1).apply(
+        lambda x: np.dot(x, weights[:len(x)]) / weights[:len(x)].sum(), raw=True
+    )
+
+
+def random_close(rows, seed=0):
+    return pd.Series(100 + np.cumsum(np.random.default_rng(seed).standard_normal(rows)))
+
+
+@pytest.mark.parametrize('window', [1, 2, 7, 50, 333])
+def test_wma_matches_rolling_apply(window):
+    close = random_close(2_000)
+    np.testing.assert_allclose(weighted_moving_average(close, window), reference_wma(close, window), rtol=1e-10)
+
+
+@pytest.mark.parametrize('window', [1, 5, 50])
+def test_wma_recovers_after_nan_leaves_the_window(window):
+    close = random_close(1_000)
+    close.iloc[[0, 3, 120, 121, 500]] = np.nan
+    close.iloc[700:710] = np.nan
+
+    result = weighted_moving_average(close, window)
+    expected = reference_wma(close, window)
+
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+    np.testing.assert_allclose(result, expected, rtol=1e-10)
+    assert np.isfinite(result.iloc[710 + window:]).all()
@@ -0,0 +1,141 @@
+# tests/test_ingestion_service.py
+import asyncio
+import os
+from types import SimpleNamespace
+
+import numpy as np
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import ingestion.service
+from ingestion.backfill import KLINES_PATH
+from ingestion.client import ExchangeClient
+from ingestion.rate_limiter import TokenBucket
+from ingestion.service import TICKER_PATH, IngestionService
+from storage.bar_log import BarLog
+from storage.candle_store import CandleStore
+from storage.gaps import MS_PER_MINUTE, find_gaps
+
+NOW = 1_641_038_400_000  # 2022-01-01 12:00 UTC, the minute the tests run in
+START = NOW - 600 * MS_PER_MINUTE
+BASE_PRICES = {'AAA': 100.0, 'BBB': 200.0}
+TICKER_OFFSET = 0.5  # Realtime bars are told apart from klines by this price offset
+
+
+class StandInExchange:
+    """Klines and 24h ticker endpoints with per-symbol prices."""
+
+    def __init__(self):
+        self.klines_requests = []  # (symbol, startTime, endTime)
+        self.ticker_requests = []  # symbol
+
+    async def klines(self, request):
+        symbol = request.query['symbol']
+        start, end, limit = (int(request.query[name]) for name in ('startTime', 'endTime', 'limit'))
+        self.klines_requests.append((symbol, start, end))
+        rows = []
+        for timestamp in range(start, end + 1, MS_PER_MINUTE)[:limit]:
+            close = BASE_PRICES[symbol] + (timestamp // MS_PER_MINUTE) % 50
+            rows.append([timestamp, str(close), str(close + 1), str(close - 1), str(close), '2', timestamp + 59_999, '3'])
+        await asyncio.sleep(0.001)
+        return web.json_response(rows)
+
+    async def ticker(self, request):
+        symbol = request.query['symbol']
+        self.ticker_requests.append(symbol)
+        price = str(BASE_PRICES[symbol] + TICKER_OFFSET)
+        return web.json_response({'lastPrice': price, 'openPrice': price, 'highPrice': price, 'lowPrice': price,
+                                  'volume': '1', 'quoteVolume': '1'})
+
+
+class CountingClient(ExchangeClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sessions = 0
+
+    def session(self):
+        self.sessions += 1
+        return super().session()
+
+
+def serve(exchange, test):
+    async def run():
+        app = web.Application()
+        app.router.add_get(KLINES_PATH, exchange.klines)
+        app.router.add_get(TICKER_PATH, exchange.ticker)
+        async with TestServer(app) as server:
+            return await test(CountingClient(str(server.make_url('')), rate_limiter=TokenBucket(10 ** 9)))
+    return asyncio.run(run())
+
+
+def make_service(tmp_path, client, symbols=('AAA', 'BBB')):
+    service = IngestionService(list(symbols), str(tmp_path / 'store'), str(tmp_path / 'wal'), START, client=client,
+                               max_in_flight=4)
+    service.backfiller.batch_limit = 100
+    return service
+
+
+def freeze_time(monkeypatch):
+    monkeypatch.setattr(ingestion.service, 'time', SimpleNamespace(time=lambda: (NOW + 30_000) / 1000))
+
+
+def test_symbols_share_one_session_and_keep_their_own_store_and_log(tmp_path, monkeypatch):
+    freeze_time(monkeypatch)
+    exchange = StandInExchange()
+
+    async def test(client):
+        service = make_service(tmp_path, client)
+        await service.run(iterations=1)
+        return service
+
+    service = serve(exchange, test)
+
+    assert service.client.sessions == 1
+    assert sorted(exchange.ticker_requests) == ['AAA', 'BBB']
+    assert {symbol for symbol, _, _ in exchange.klines_requests} == {'AAA', 'BBB'}
+    assert sorted(os.listdir(str(tmp_path / 'wal'))) == ['AAA', 'BBB']
+
+    store = CandleStore(str(tmp_path / 'store'))
+    assert store.symbols() == ['AAA', 'BBB']
+    for symbol, base in BASE_PRICES.items():
+        bars = store.read(symbol)
+        # Every minute from the start through the realtime minute, with this symbol's prices only
+        np.testing.assert_array_equal(bars['timestamp'], np.arange(START, NOW + 1, MS_PER_MINUTE))
+        assert np.all((bars['close'] >= base) & (bars['close'] < base + 50))
+        assert bars['close'][-1] == base + TICKER_OFFSET
+        assert not np.any(bars['close'][:-1] == base + TICKER_OFFSET)
+        assert len(service.bar_logs[symbol]) == 0
+
+
+def test_gap_fill_treats_logged_bars_as_present(tmp_path, monkeypatch):
+    freeze_time(monkeypatch)
+    exchange = StandInExchange()
+    pending = NOW - np.arange(30, 0, -1) * MS_PER_MINUTE
+    log = BarLog(str(tmp_path / 'wal' / 'AAA'))
+    for timestamp in pending.tolist():
+        price = BASE_PRICES['AAA'] + TICKER_OFFSET
+        log.append({'timestamp': timestamp, 'close': price, 'open': price, 'high': price, 'low': price,
+                    'volume': 1, 'quoteVolume': 1})
+
+    async def test(client):
+        service = make_service(tmp_path, client)
+        async with client.session() as session:
+            await asyncio.gather(service.fill_gaps(session, 'AAA'), service.fill_gaps(session, 'BBB'))
+        return service
+
+    service = serve(exchange, test)
+
+    # No klines request reaches into the logged minutes of AAA, while BBB is fetched up to the previous minute
+    for symbol, start, end in exchange.klines_requests:
+        if symbol == 'AAA':
+            assert not np.any((pending >= start) & (pending <= end))
+    store = service.store
+    np.testing.assert_array_equal(store.read('AAA')['timestamp'], np.arange(START, pending[0], MS_PER_MINUTE))
+    np.testing.assert_array_equal(store.read('BBB')['timestamp'], np.arange(START, NOW, MS_PER_MINUTE))
+    np.testing.assert_array_equal(service.bar_logs['AAA'].pending_timestamps(), pending)
+
+    service.compact()
+    bars = store.read('AAA')
+    np.testing.assert_array_equal(bars['timestamp'], np.arange(START, NOW, MS_PER_MINUTE))
+    assert not len(find_gaps(bars['timestamp'], start=START, end=NOW - MS_PER_MINUTE)[0])
+    np.testing.assert_array_equal(bars['close'][-30:], BASE_PRICES['AAA'] + TICKER_OFFSET)
@@ -0,0 +1,41 @@
+# tests/test_live_trading.py
+import numpy as np
+import pandas as pd
+
+from live_trading.live_trading import LiveTrading
+
+STRATEGY_CONFIG = dict(
+    initial_capital=10_000, trade_fee=0.001, profit_target=0.01, stop_loss=0.01, enable_stop_loss=True,
+    short_window=20, long_window=80, indicator_type='SMA', enable_close_long_on_downtrend=True,
+    enable_close_short_on_uptrend=True, enable_profit_target=True, enable_longing=True, enable_shorting=True
+)
+
+
+def random_bars(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows)))
+    index = pd.date_range('2022-01-01', periods=rows, freq='1min', tz='UTC')
+    return [{'timestamp': timestamp, 'open': value, 'high': value, 'low': value, 'close': value, 'volume': 1.0}
+            for timestamp, value in zip(index, close)]
+
+
+def test_actions_cover_the_bars_processed_live():
+    live = LiveTrading(api_client=None, strategy_config=STRATEGY_CONFIG)
+    bars = random_bars(3_000)
+    for bar in bars[:2_000]:
+        live.on_bar(bar)
+    strategy = live.strategy
+    assert len(strategy.ledger) > 10
+
+    actions = strategy.actions
+    assert len(actions) == 2_000
+    records = strategy.ledger.records
+    np.testing.assert_array_equal(np.flatnonzero(actions.notna()), np.unique(records['bar']))
+
+    # The cached column is rebuilt once further bars bring new trades
+    trades = len(strategy.ledger)
+    for bar in bars[2_000:]:
+        live.on_bar(bar)
+    assert len(strategy.ledger) > trades
+    assert len(strategy.actions) == 3_000
+    assert strategy.actions.notna().sum() == len(np.unique(strategy.ledger.records['bar']))
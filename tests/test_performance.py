@@ -0,0 +1,160 @@
+# tests/test_performance.py
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.performance import (
+    BARS_PER_YEAR_1M, PerformanceMetrics, curve_metrics, drawdowns, equity_curve, rolling_volatility, trade_statistics
+)
+from strategies.actions import ACTION_GO_LONG, ACTION_GO_SHORT
+from strategies.generic_strategy import GenericStrategy
+
+
+def random_candles(rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows)))
+    index = pd.date_range('2022-01-01', periods=rows, freq='1min', tz='UTC', name='timestamp')
+    return pd.DataFrame({'close': close}, index=index)
+
+
+def run_with_equity(df, trade_fee, **overrides):
+    """Run the PYTHON engine bar by bar and value the portfolio after every bar from the strategy state."""
+    settings = dict(
+        initial_capital=10_000, trade_fee=trade_fee, profit_target=0.01, stop_loss=0.01, enable_stop_loss=True,
+        short_window=20, long_window=80, indicator_type='SMA', enable_close_long_on_downtrend=True,
+        enable_close_short_on_uptrend=True, enable_profit_target=True, enable_longing=True, enable_shorting=True
+    )
+    settings.update(overrides)
+    strategy = GenericStrategy(data=df.copy(), **settings)
+    equity = [strategy.balance]
+    for i in range(1, len(df)):
+        strategy.process_bar(strategy.close[i], strategy.fast_ind[i], strategy.slow_ind[i], df.index[i], bar=i)
+        value = strategy.balance
+        if strategy.current_position:
+            value += strategy.assets * (strategy.entry_price + strategy.current_position
+                                        * (strategy.close[i] - strategy.entry_price) * (1 - 2 * trade_fee))
+        equity.append(value)
+    return strategy, np.array(equity)
+
+
+def reference_curve_metrics(equity, periods_per_year, risk_free_rate):
+    returns = [equity[i] / equity[i - 1] - 1 for i in range(1, len(equity))]
+    excess = [value - risk_free_rate / periods_per_year for value in returns]
+    mean = sum(returns) / len(returns)
+    deviation = math.sqrt(sum((value - mean) ** 2 for value in returns) / len(returns))
+    downside = math.sqrt(sum(min(value, 0.0) ** 2 for value in excess) / len(excess))
+    mean_excess = sum(excess) / len(excess)
+
+    peak, max_drawdown, underwater, longest = equity[0], 0.0, 0, 0
+    for value in equity:
+        peak = max(peak, value)
+        max_drawdown = min(max_drawdown, value / peak - 1)
+        underwater = underwater + 1 if value < peak else 0
+        longest = max(longest, underwater)
+    total_return = equity[-1] / equity[0] - 1
+    annual_return = (1 + total_return) ** (periods_per_year / (len(equity) - 1)) - 1
+    scale = math.sqrt(periods_per_year)
+    return {
+        'final_equity': equity[-1],
+        'total_return': total_return,
+        'annual_return': annual_return,
+        'annual_volatility': deviation * scale,
+        'sharpe_ratio': mean_excess / deviation * scale,
+        'sortino_ratio': mean_excess / downside * scale,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_bars': longest,
+        'calmar_ratio': annual_return / -max_drawdown,
+    }
+
+
+@pytest.mark.parametrize('trade_fee', [0.001, 0.0025])
+@pytest.mark.parametrize('direction', [dict(enable_shorting=False), dict(enable_longing=False), {}])
+def test_equity_curve_matches_the_bar_by_bar_valuation(trade_fee, direction):
+    df = random_candles()
+    strategy, expected = run_with_equity(df, trade_fee, **direction)
+    records = strategy.ledger.records
+    assert len(records) > 10
+
+    equity, position = equity_curve(strategy.close, records, 10_000, trade_fee)
+
+    np.testing.assert_allclose(equity, expected, rtol=1e-12)
+    sides = np.zeros(len(df), dtype=np.int8)
+    for record in records:
+        sides[record['bar']:] = {ACTION_GO_LONG: 1, ACTION_GO_SHORT: -1}.get(record['action'], 0)
+    np.testing.assert_array_equal(position, sides)
+    virtual = PerformanceMetrics.calculate_virtual_balance(
+        strategy.close[-1], strategy.balance, strategy.current_position, strategy.entry_price, strategy.assets,
+        trade_fee
+    )[0]
+    assert virtual == pytest.approx(expected[-1], rel=1e-12)
+
+
+def test_curve_metrics_match_loop_reference():
+    df = random_candles(seed=1)
+    equity = run_with_equity(df, 0.001)[1]
+    periods_per_year = BARS_PER_YEAR_1M / 10
+    sampled = equity[::10]
+
+    metrics = curve_metrics(sampled, periods_per_year=periods_per_year, risk_free_rate=0.02)
+    expected = reference_curve_metrics(sampled, periods_per_year, 0.02)
+
+    for name, value in expected.items():
+        assert metrics[name][0] == pytest.approx(value, rel=1e-9), name
+
+
+def test_drawdowns_and_rolling_volatility_match_pandas():
+    equity = run_with_equity(random_candles(5_000, seed=2), 0.001)[1]
+    drawdown, max_drawdown, _ = drawdowns(equity)
+    series = pd.Series(equity)
+    np.testing.assert_allclose(drawdown, series / series.cummax() - 1, atol=1e-15)
+    assert max_drawdown == drawdown.min()
+
+    returns = series.pct_change().to_numpy()[1:]
+    expected = pd.Series(returns).rolling(60).std().to_numpy() * math.sqrt(BARS_PER_YEAR_1M)
+    np.testing.assert_allclose(rolling_volatility(returns, 60, BARS_PER_YEAR_1M), expected, rtol=1e-6, atol=1e-12)
+
+
+def test_trade_statistics_match_loop_reference():
+    strategy = run_with_equity(random_candles(seed=3), 0.001)[0]
+    records = strategy.ledger.records
+
+    closed, holding, entry_bar = [], [], None
+    for record in records:
+        if record['action'] in (ACTION_GO_LONG, ACTION_GO_SHORT):
+            entry_bar = record['bar']
+        else:
+            closed.append(record['pnl'])
+            holding.append(record['bar'] - entry_bar)
+    wins = [pnl for pnl in closed if pnl > 0]
+    losses = [pnl for pnl in closed if pnl <= 0]
+
+    statistics = trade_statistics(records)
+    assert statistics['closed_trades'] == len(closed)
+    assert statistics['win_rate'] == pytest.approx(len(wins) / len(closed))
+    assert statistics['profit_factor'] == pytest.approx(sum(wins) / -sum(losses))
+    assert statistics['average_holding_bars'] == pytest.approx(sum(holding) / len(holding))
+    assert statistics['total_fees'] == pytest.approx(strategy.total_fees)
+
+
+@pytest.mark.parametrize('chunk_bytes', [1, 1024 ** 2])
+def test_batch_metrics_match_single_curve_metrics(chunk_bytes):
+    df = random_candles(5_000, seed=4)
+    runs = [run_with_equity(df, 0.001, **settings)[0] for settings in
+            (dict(enable_shorting=False), dict(enable_longing=False), {}, dict(profit_target=0.002, stop_loss=0.002))]
+    results = [PerformanceMetrics.calculate_risk_metrics(strategy.close, strategy.ledger.records, 10_000,
+                                                         risk_free_rate=0.02) for strategy in runs]
+    close = df['close'].to_numpy()
+
+    batch = PerformanceMetrics.calculate_batch_metrics(
+        np.stack([result.equity for result in results]), close[[0, -1]], 10_000, risk_free_rate=0.02,
+        chunk_bytes=chunk_bytes
+    )
+
+    assert len(batch) == len(results)
+    for row, result in zip(batch.to_dict('records'), results):
+        for name in ('final_equity', 'total_return', 'annual_return', 'annual_volatility', 'sharpe_ratio',
+                     'sortino_ratio', 'max_drawdown', 'max_drawdown_bars', 'calmar_ratio', 'benchmark_return'):
+            assert row[name] == pytest.approx(result.metrics[name], rel=1e-12), name
+        assert row['excess_return'] == pytest.approx(result.total_return - result.benchmark_return, rel=1e-12)
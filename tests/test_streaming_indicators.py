@@ -0,0 +1,55 @@
+# tests/test_streaming_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.indicators import calculate_indicators
+from strategies.streaming_indicators import StreamingIndicatorPair
+
+INDICATOR_TYPES = ['SMA', 'EMA', 'WMA', 'RSI', 'MACD']
+
+
+def random_close(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows))))
+
+
+@pytest.mark.parametrize('indicator_type', INDICATOR_TYPES)
+@pytest.mark.parametrize('short_window, long_window', [(5, 20), (50, 200)])
+def test_streaming_pair_matches_batch_indicators(indicator_type, short_window, long_window):
+    close = random_close(5_000)
+    expected_fast, expected_slow = calculate_indicators(close, indicator_type, short_window, long_window)
+
+    pair = StreamingIndicatorPair(indicator_type, short_window, long_window)
+    fast, slow = np.array([pair.update(value) for value in close.to_numpy()]).T
+
+    np.testing.assert_allclose(fast, expected_fast.to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(slow, expected_slow.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('indicator_type', INDICATOR_TYPES)
+def test_warm_up_continues_like_the_full_history(indicator_type):
+    close = random_close(3_000, seed=1)
+    expected_fast, expected_slow = calculate_indicators(close, indicator_type, 20, 80)
+
+    pair = StreamingIndicatorPair(indicator_type, 20, 80)
+    pair.warm_up(close.iloc[:2_000])
+    fast, slow = np.array([pair.update(value) for value in close.iloc[2_000:].to_numpy()]).T
+
+    np.testing.assert_allclose(fast, expected_fast.iloc[2_000:].to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(slow, expected_slow.iloc[2_000:].to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('indicator_type', INDICATOR_TYPES)
+def test_streaming_pair_matches_batch_indicators_with_nan_closes(indicator_type):
+    close = random_close(3_000, seed=2)
+    close.iloc[:3] = np.nan
+    close.iloc[[100, 101, 500, 1_777]] = np.nan
+    expected_fast, expected_slow = calculate_indicators(close, indicator_type, 10, 40)
+
+    pair = StreamingIndicatorPair(indicator_type, 10, 40)
+    fast, slow = np.array([pair.update(value) for value in close.to_numpy()]).T
+
+    np.testing.assert_allclose(fast, expected_fast.to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(slow, expected_slow.to_numpy(), rtol=1e-9, atol=1e-9)
+    assert np.isfinite(fast[-1]) and np.isfinite(slow[-1])
@@ -0,0 +1,62 @@
+# tests/test_sweep.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.performance import BARS_PER_YEAR_1M, curve_metrics, equity_curve
+from backtest.sweep import SWEEP_METRICS, ParameterSweep
+from strategies.engine import equity_sample_bars
+from strategies.generic_strategy import GenericStrategy
+
+BASE_CONFIG = {
+    'initial_capital': 10_000,
+    'trade_fee': 0.0025,
+    'enable_stop_loss': True,
+    'indicator_type': 'SMA',
+    'enable_close_long_on_downtrend': True,
+    'enable_close_short_on_uptrend': True,
+    'enable_profit_target': True,
+    'enable_longing': True,
+    'enable_shorting': True,
+}
+
+
+def random_candles(rows=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 20_000 * np.exp(np.cumsum(0.002 * rng.standard_normal(rows)))
+    index = pd.date_range('2022-01-01', periods=rows, freq='1min', tz='UTC', name='timestamp')
+    return pd.DataFrame({'close': close}, index=index)
+
+
+def test_sweep_results_match_single_backtests():
+    df = random_candles()
+    equity_every = 7
+    sweep = ParameterSweep(df, BASE_CONFIG, short_windows=[10, 30], long_windows=[60], profit_targets=[0.005, 0.02],
+                           stop_losses=[0.01], indicator_types=['SMA', 'EMA'], processes=1,
+                           equity_every=equity_every, risk_free_rate=0.02)
+    results = sweep.run()
+    assert len(results) == 8
+    samples = equity_sample_bars(len(df), equity_every)
+
+    for result in results.to_dict('records'):
+        strategy = GenericStrategy(
+            data=df.copy(), profit_target=result['profit_target'], stop_loss=result['stop_loss'],
+            short_window=result['short_window'], long_window=result['long_window'], engine='NUMBA',
+            **dict(BASE_CONFIG, indicator_type=result['indicator_type'])
+        )
+        strategy.run()
+        assert result['trades'] == len(strategy.ledger)
+        assert result['balance'] == pytest.approx(strategy.balance, rel=1e-12)
+
+        equity = equity_curve(strategy.close, strategy.ledger.records, 10_000, BASE_CONFIG['trade_fee'])[0]
+        assert result['virtual_balance'] == pytest.approx(equity[-1], rel=1e-12)
+        expected = curve_metrics(equity[samples], 10_000, BARS_PER_YEAR_1M / equity_every, 0.02)
+        # return_pct and the risk metrics come from the same valuation
+        assert result['return_pct'] == pytest.approx(expected['total_return'][0] * 100, rel=1e-9)
+        benchmark = strategy.close[-1] / strategy.close[0] - 1
+        expected['excess_return'] = expected['total_return'] - benchmark
+        expected['max_drawdown_bars'] = expected['max_drawdown_bars'] * equity_every
+        for name in SWEEP_METRICS:
+            assert result[name] == pytest.approx(expected[name][0], rel=1e-9), name
+    assert list(results['rank']) == list(range(1, 9))
+    assert results['virtual_balance'].is_monotonic_decreasing
@@ -0,0 +1,68 @@
+# tests/test_timeframes.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from storage.candle_store import CandleStore
+from storage.timeframes import ROLLUP_TIMEFRAMES, TIMEFRAME_MINUTES, resample_frame
+
+AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'quoteVolume': 'sum'}
+
+
+def random_minutes(rows, start='2022-01-30 22:00', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(rows))
+    index = pd.date_range(start, periods=rows, freq='1min', tz='UTC', name='timestamp')
+    df = pd.DataFrame({'open': close + 0.1, 'high': close + 1, 'low': close - 1, 'close': close,
+                       'volume': rng.random(rows), 'quoteVolume': rng.random(rows)}, index=index)
+    df.loc[df.index[rng.choice(rows, rows // 50, replace=False)], 'volume'] = np.nan
+    # Missing minutes, so some buckets are partial and some are empty
+    return df.drop(df.index[rng.choice(rows, rows // 10, replace=False)])
+
+
+def reference_rollup(df, timeframe):
+    resampled = df.resample(f"{TIMEFRAME_MINUTES[timeframe]}min", label='left', closed='left').agg(AGGREGATIONS)
+    return resampled[df['close'].resample(f"{TIMEFRAME_MINUTES[timeframe]}min").count() > 0]
+
+
+def write_frame(store, df):
+    arrays = {column: df[column].to_numpy() for column in df.columns}
+    arrays['timestamp'] = df.index.values.astype('datetime64[ms]').astype(np.int64)
+    store.write_bars('BTCUSDT', arrays)
+
+
+def assert_rollups_match(store, df):
+    for timeframe in ROLLUP_TIMEFRAMES:
+        expected = reference_rollup(df, timeframe)
+        actual = store.read_frame('BTCUSDT', timeframe=timeframe)
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False, check_index_type=False, rtol=1e-12)
+
+
+def test_rollups_follow_incremental_writes(tmp_path):
+    store = CandleStore(str(tmp_path))
+    df = random_minutes(3 * 1440)
+    # Out of order, overlapping chunks; the overlap rewrites bars with new values
+    chunks = [df.iloc[2000:], df.iloc[:1500], df.iloc[1000:2500] * 1.01]
+    for chunk in chunks:
+        write_frame(store, chunk)
+
+    expected = pd.concat(chunks)
+    expected = expected[~expected.index.duplicated(keep='last')].sort_index()
+    assert_rollups_match(store, expected)
+
+
+def test_missing_rollups_are_built_on_first_read(tmp_path):
+    df = random_minutes(2 * 1440, seed=1)
+    write_frame(CandleStore(str(tmp_path), timeframes=()), df)
+
+    store = CandleStore(str(tmp_path))
+    assert_rollups_match(store, df)
+    snapshot = store.snapshot('BTCUSDT', '1h')
+    np.testing.assert_array_equal(snapshot['close'], reference_rollup(df, '1h')['close'])
+
+
+@pytest.mark.parametrize('timeframe', ROLLUP_TIMEFRAMES)
+def test_resample_frame_matches_pandas(timeframe):
+    df = random_minutes(2 * 1440, seed=2)
+    pd.testing.assert_frame_equal(resample_frame(df, timeframe), reference_rollup(df, timeframe),
+                                  check_freq=False, check_index_type=False, rtol=1e-12)
@@ -1,10 +1,10 @@
 # utils/logger.py
+import atexit
 import logging
+import logging.handlers
 import os
-from config import LOG_FOLDER, LOG_FILE, LOG_LEVEL
-
-# Ensure the log folder exists
-os.makedirs(LOG_FOLDER, exist_ok=True)
+import queue
+from multiprocessing import util as multiprocessing_util
 
 # Map LOG_LEVEL string to actual logging level
 LOG_LEVEL_MAPPING = {
@@ -14,33 +14,156 @@ LOG_LEVEL_MAPPING = {
     'ERROR': logging.ERROR,
     'CRITICAL': logging.CRITICAL
 }
+LOG_FORMAT = '%(asctime)s [%(levelname)s]: %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that passes records as they are, so messages are formatted on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class SampleFilter(logging.Filter):
+    """Pass one in every `every` records (errors always pass)."""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(int(every), 1)
+        self.count = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        self.count += 1
+        return self.count % self.every == 1 or self.every == 1
 
-# Default to DEBUG if LOG_LEVEL is not valid
-log_level = LOG_LEVEL_MAPPING.get(LOG_LEVEL, logging.DEBUG)
 
-# Create the logger
+def _skip_caller_lookup(stack_info=False, stacklevel=1):
+    # LOG_FORMAT has no file, line or function, so the stack walk of Logger.findCaller is skipped
+    return '(unknown file)', 0, '(unknown function)', None
+
+
+# Create the logger; it has no handlers until setup_logging() is called by an entry point
 logger = logging.getLogger('TradingBotLogger')
 logger.setLevel(logging.DEBUG)  # Set the base level to DEBUG
 
-# File Handler (DEBUG logs written to file, overwrites each run)
-file_handler = logging.FileHandler(LOG_FILE, mode='w')
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter(
-    '%(asctime)s [%(levelname)s]: %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
-)
-file_handler.setFormatter(file_formatter)
-
-# Console Handler (INFO logs shown on console)
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_formatter = logging.Formatter(
-    '%(asctime)s [%(levelname)s]: %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
-)
-console_handler.setFormatter(console_formatter)
-
-# Add Handlers to Logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-
-# Initial Log Message
-logger.info(f"Logger initialized with file level: DEBUG and console level: INFO")
+# Per-trade and per-bar messages, can be sampled or switched off (see set_trade_log_mode)
+trade_logger = logger.getChild('trades')
+
+# Only for the bot's own loggers; other libraries keep their caller information
+logger.findCaller = _skip_caller_lookup
+trade_logger.findCaller = _skip_caller_lookup
+
+queue_handler = None
+listener = None
+_handlers = ()
+_hooks_registered = False
+
+
+def _start_listener():
+    # Also run in forked processes (e.g. sweep workers), which do not inherit the listener thread
+    global listener
+    if queue_handler is None:
+        return
+    queue_handler.queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(queue_handler.queue, *_handlers, respect_handler_level=True)
+    listener.start()
+
+
+def _stop_listener():
+    # Writes the records still queued
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
+def _register_hooks():
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    _hooks_registered = True
+    atexit.register(_stop_listener)
+    os.register_at_fork(after_in_child=_start_listener)
+
+
+def setup_logging(log_file, level='DEBUG', console_level='INFO', trade_mode='ALL', sample_every=100,
+                  lean_records=False):
+    """
+    Attach the file and console handlers to the logger (call once from the entry point).
+
+    The logger only enqueues records; a background thread formats them and writes them to
+    the file (overwritten on every run) and the console. Calling it again replaces the handlers.
+
+    Args:
+        log_file (str): Log file path, its folder is created if needed.
+        level (str): Level of the file handler (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+        console_level (str): Level of the console handler.
+        trade_mode (str): Per-trade messages: ALL, SAMPLED or OFF (see set_trade_log_mode).
+        sample_every (int): Sampling interval of the SAMPLED trade mode.
+        lean_records (bool): Stop filling the thread and process fields of log records. This is
+            process-wide (logging.logThreads, logProcesses, logMultiprocessing), so only entry
+            points whose formatters never show them should enable it.
+    """
+    global queue_handler, _handlers
+    _stop_listener()
+    if queue_handler is not None:
+        logger.removeHandler(queue_handler)
+        for handler in _handlers:
+            handler.close()
+
+    folder = os.path.dirname(log_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+    # File Handler (DEBUG logs written to file, overwrites each run)
+    file_handler = logging.FileHandler(log_file, mode='w')
+    file_handler.setLevel(LOG_LEVEL_MAPPING.get(level, logging.DEBUG))
+    file_handler.setFormatter(formatter)
+
+    # Console Handler (INFO logs shown on console)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(LOG_LEVEL_MAPPING.get(console_level, logging.INFO))
+    console_handler.setFormatter(formatter)
+
+    if lean_records:
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+    _handlers = (file_handler, console_handler)
+    queue_handler = LazyQueueHandler(queue.SimpleQueue())
+    logger.addHandler(queue_handler)
+    _start_listener()
+    _register_hooks()
+    # Pool workers exit through multiprocessing, which skips atexit handlers
+    multiprocessing_util.register_after_fork(
+        queue_handler, lambda handler: multiprocessing_util.Finalize(handler, _stop_listener, exitpriority=0)
+    )
+
+    set_trade_log_mode(trade_mode, sample_every)
+    logger.info(f"Logger initialized with file level: {level} and console level: {console_level}")
+
+
+def set_trade_log_mode(mode, sample_every=100):
+    """
+    Configure the per-trade messages of trade_logger.
+
+    Args:
+        mode (str): ALL (every message), SAMPLED (one in sample_every) or OFF.
+        sample_every (int): Sampling interval of the SAMPLED mode.
+    """
+    for log_filter in list(trade_logger.filters):
+        trade_logger.removeFilter(log_filter)
+    if mode == 'ALL':
+        trade_logger.setLevel(logging.NOTSET)
+    elif mode == 'SAMPLED':
+        trade_logger.setLevel(logging.NOTSET)
+        trade_logger.addFilter(SampleFilter(sample_every))
+    elif mode == 'OFF':
+        trade_logger.setLevel(logging.ERROR)
+    else:
+        raise ValueError(f"Trade log mode '{mode}' is not supported. Options: ALL, SAMPLED, OFF")
@@ -0,0 +1,200 @@
+# utils/profiling.py
+import cProfile
+import json
+import os
+import platform
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from utils.logger import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, None where it is not available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Bytes on macOS, kilobytes on Linux
+
+
+def git_revision(path='.'):
+    """Short commit hash of the working tree, None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=path, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Span:
+    def __init__(self, name, rows=None):
+        """
+        Measurements of one named stage.
+
+        Args:
+            name (str): Stage name, e.g. 'load'.
+            rows (int, optional): Rows processed by the stage, can also be set inside the span.
+        """
+        self.name = name
+        self.rows = rows
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.peak_rss_bytes = None
+        self.rss_growth_bytes = None
+        self.python_peak_bytes = None
+        self.profile_file = None
+
+    @property
+    def rows_per_second(self):
+        if self.rows is None or not self.wall_seconds:
+            return None
+        return self.rows / self.wall_seconds
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'rows': self.rows,
+            'rows_per_second': self.rows_per_second,
+            'peak_rss_bytes': self.peak_rss_bytes,
+            'rss_growth_bytes': self.rss_growth_bytes,
+            'python_peak_bytes': self.python_peak_bytes,
+            'profile_file': self.profile_file,
+        }
+
+
+class Profiler:
+    def __init__(self, enabled=True, profile_stages=(), trace_memory=False, output_dir='./logs/profiles'):
+        """
+        Stage-level timing for a pipeline run.
+
+        Every span records wall time, CPU time, the process peak RSS when it ends (and how much
+        the peak grew during the span) and rows per second. Selected stages can also be captured
+        with cProfile (a .prof file per stage) and tracemalloc (peak Python allocations).
+
+        Args:
+            enabled (bool): When False spans only run their body.
+            profile_stages (list): Stage names to capture with cProfile, or ['ALL'].
+            trace_memory (bool): Track the peak Python allocations of every span with tracemalloc.
+            output_dir (str): Folder of the .prof files.
+        """
+        self.enabled = enabled
+        self.profile_stages = set(profile_stages or ())
+        self.trace_memory = trace_memory
+        self.output_dir = output_dir
+        self.spans = []
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, rows=None):
+        """
+        Measure a stage.
+
+        Usage:
+            with profiler.span('run', rows=len(df)) as span:
+                ...
+
+        Args:
+            name (str): Stage name.
+            rows (int, optional): Rows processed by the stage (span.rows can be set inside the block).
+        """
+        span = Span(name, rows)
+        if not self.enabled:
+            yield span
+            return
+
+        profile = None
+        if name in self.profile_stages or 'ALL' in self.profile_stages:
+            profile = cProfile.Profile()
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        rss_before = peak_rss_bytes()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield span
+        finally:
+            if profile is not None:
+                profile.disable()
+            span.wall_seconds = time.perf_counter() - wall_start
+            span.cpu_seconds = time.process_time() - cpu_start
+            span.peak_rss_bytes = peak_rss_bytes()
+            if rss_before is not None:
+                span.rss_growth_bytes = span.peak_rss_bytes - rss_before
+            if self.trace_memory:
+                span.python_peak_bytes = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            if profile is not None:
+                os.makedirs(self.output_dir, exist_ok=True)
+                span.profile_file = os.path.join(self.output_dir, f"{name}.prof")
+                profile.dump_stats(span.profile_file)
+            self.spans.append(span)
+            logger.info(self.describe(span))
+
+    @staticmethod
+    def describe(span):
+        text = f"⏱️ {span.name}: {span.wall_seconds:.3f}s wall, {span.cpu_seconds:.3f}s CPU"
+        if span.rows_per_second is not None:
+            text += f", {span.rows_per_second:,.0f} rows/s"
+        if span.peak_rss_bytes is not None:
+            text += f", peak RSS {span.peak_rss_bytes / 1024 ** 2:.0f} MB"
+        if span.python_peak_bytes is not None:
+            text += f", Python peak {span.python_peak_bytes / 1024 ** 2:.1f} MB"
+        return text
+
+    def top_functions(self, span, limit=10):
+        """The functions with the most cumulative time in a span's cProfile capture."""
+        if span.profile_file is None:
+            return []
+        stats = pstats.Stats(span.profile_file)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [
+            {'function': f"{file}:{line}({function})", 'calls': calls, 'cumulative_seconds': cumulative}
+            for (file, line, function), (_, calls, _, cumulative, _) in rows
+        ]
+
+    def report(self, metadata=None):
+        """
+        Run report with every span, the environment and optional metadata (e.g. the configuration).
+
+        Returns:
+            dict: JSON-serializable report.
+        """
+        return {
+            'started': self.started.isoformat(),
+            'total_wall_seconds': time.perf_counter() - self._start,
+            'git_revision': git_revision(os.path.dirname(os.path.abspath(__file__))),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'metadata': metadata or {},
+            'spans': [dict(span.to_dict(), top_functions=self.top_functions(span)) for span in self.spans],
+        }
+
+    def write_report(self, path, metadata=None):
+        """Write report() as JSON to path."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(self.report(metadata), file, indent=2, default=str)
+        logger.info(f"⏱️ Profile report saved as {path}")
@@ -0,0 +1,185 @@
+# visualization/detail_tiles.py
+import base64
+import glob
+import json
+import os
+
+import numpy as np
+
+from visualization.downsample import downsample_indices
+
+TILE_FORMAT = 1
+
+# Runs after the chart is created: swaps finer tiles into the line traces when the x-axis is zoomed.
+# Tiles are <script> files that call window.tradingChartTile, so they load from file:// without a server.
+DETAIL_SCRIPT = """
+(function () {
+    var gd = document.getElementById('{plot_id}');
+    var manifest = __MANIFEST__;
+    var cache = {};
+    var waiting = {};
+    var overview = null;
+    var request = 0;
+
+    window.tradingChartTile = function (key, base, count, payload) {
+        var text = atob(payload);
+        var bytes = new Uint8Array(text.length);
+        for (var i = 0; i < text.length; i++) bytes[i] = text.charCodeAt(i);
+        var seconds = new Uint32Array(bytes.buffer, 0, count);
+        var x = new Float64Array(count);
+        for (var i = 0; i < count; i++) x[i] = (base + seconds[i]) * 1000;
+        var ys = [];
+        for (var s = 0; s < manifest.series; s++) ys.push(new Float32Array(bytes.buffer, 4 * count * (s + 1), count));
+        cache[key] = {x: x, ys: ys};
+        (waiting[key] || []).forEach(function (callback) { callback(); });
+        delete waiting[key];
+    };
+
+    function load(key, callback) {
+        if (cache[key]) return callback();
+        if (waiting[key]) return waiting[key].push(callback);
+        waiting[key] = [callback];
+        var script = document.createElement('script');
+        script.src = manifest.folder + '/' + key + '.js';
+        document.head.appendChild(script);
+    }
+
+    function toMs(value) {
+        if (typeof value === 'number') return value;
+        var text = String(value).trim().replace(' ', 'T');
+        if (text.indexOf('T') < 0) text += 'T00:00:00';
+        return Date.parse(text + 'Z');
+    }
+
+    function show(data) {
+        Plotly.restyle(gd, {x: data.map(function (d) { return d.x; }), y: data.map(function (d) { return d.y; })},
+                       manifest.traces);
+    }
+
+    function concat(parts, pick) {
+        var length = parts.reduce(function (total, part) { return total + pick(part).length; }, 0);
+        var out = new Float64Array(length);
+        var offset = 0;
+        parts.forEach(function (part) { out.set(pick(part), offset); offset += pick(part).length; });
+        return out;
+    }
+
+    function update() {
+        var range = gd.layout.xaxis.range;
+        var ticket = ++request;
+        if (overview === null) {
+            overview = manifest.traces.map(function (trace) { return {x: gd.data[trace].x, y: gd.data[trace].y}; });
+        }
+        var start = range ? toMs(range[0]) : manifest.start;
+        var end = range ? toMs(range[1]) : manifest.end;
+        var span = Math.max(end - start, 1);
+        var level = Math.ceil(Math.log2((manifest.end - manifest.start) / span));
+        level = Math.min(level, manifest.levels.length);
+        if (!range || gd.layout.xaxis.autorange || level < 1) return show(overview);
+
+        var starts = manifest.levels[level - 1];
+        var first = 0;
+        while (first + 1 < starts.length && starts[first + 1] <= start) first++;
+        var last = first;
+        while (last + 1 < starts.length && starts[last + 1] <= end) last++;
+        var keys = [];
+        for (var tile = first; tile <= last; tile++) keys.push('L' + level + '_T' + tile);
+
+        var pending = keys.length;
+        keys.forEach(function (key) {
+            load(key, function () {
+                if (--pending > 0 || ticket !== request) return;
+                var parts = keys.map(function (k) { return cache[k]; });
+                var x = concat(parts, function (part) { return part.x; });
+                show(manifest.traces.map(function (trace, s) {
+                    return {x: x, y: concat(parts, function (part) { return part.ys[s]; })};
+                }));
+            });
+        });
+    }
+
+    gd.on('plotly_relayout', function (event) {
+        if (Object.keys(event).some(function (key) { return key.indexOf('xaxis') === 0; })) update();
+    });
+})();
+"""
+
+
+def _naive_seconds(index):
+    # Plotly draws dates as wall-clock times, so the tiles use the wall clock of the index as well
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[s]').astype(np.int64)
+
+
+def _encode_tile(seconds, series, rows):
+    base = int(seconds[rows[0]])
+    payload = [(seconds[rows] - base).astype('<u4').tobytes()]
+    payload.extend(np.asarray(values[rows], dtype='<f4').tobytes() for values in series)
+    return base, base64.b64encode(b''.join(payload)).decode('ascii')
+
+
+def write_detail_tiles(html_file, index, series, resolution, method='MINMAX', keep=None):
+    """
+    Write the zoom levels of an interactive chart as sidecar tiles next to the HTML file.
+
+    Level k splits the bars into 2**k tiles and downsamples each tile to `resolution` pixels,
+    so any zoom shows about the same number of points. Levels are added until a tile has at
+    most 4 * resolution bars; that finest level is not downsampled and holds every bar.
+    Level 0 is the overview embedded in the HTML itself. Each tile is a small .js file with
+    the bar times (uint32 seconds from the tile start) and the series values (float32),
+    base64 encoded, which the page loads on demand with a <script> tag.
+
+    Args:
+        html_file (str): Path of the chart's HTML file; tiles go to '<name>_files/'.
+        index (pd.DatetimeIndex): Bar times.
+        series (list): Value arrays drawn as lines, in trace order.
+        resolution (int): Horizontal resolution in pixels.
+        method (str): Downsampling method (see downsample_indices).
+        keep (np.ndarray, optional): Rows kept at every level (e.g. trade bars).
+
+    Returns:
+        dict: Manifest used by DETAIL_SCRIPT (folder, tile start times per level, ...).
+    """
+    n = len(index)
+    folder = f"{os.path.splitext(html_file)[0]}_files"
+    os.makedirs(folder, exist_ok=True)
+    for stale in glob.glob(os.path.join(folder, 'L*_T*.js')):
+        os.remove(stale)
+
+    seconds = _naive_seconds(index)
+    keep = np.unique(np.asarray(keep, dtype=np.int64)) if keep is not None else np.empty(0, dtype=np.int64)
+    levels = []
+    level = 1
+    while n > 4 * resolution * 2 ** (level - 1):
+        tiles = 2 ** level
+        tile_rows = -(-n // tiles)
+        # The last level: its tiles are small enough to ship raw, whatever the downsampling method
+        tile_method = 'NONE' if tile_rows <= 4 * resolution else method
+        starts = []
+        for tile, first in enumerate(range(0, n, tile_rows)):
+            last = min(first + tile_rows, n)
+            tile_keep = keep[(keep >= first) & (keep < last)] - first
+            rows = first + downsample_indices([values[first:last] for values in series], resolution, tile_method,
+                                              keep=tile_keep)
+            base, payload = _encode_tile(seconds, series, rows)
+            with open(os.path.join(folder, f"L{level}_T{tile}.js"), 'w') as file:
+                file.write(f'window.tradingChartTile("L{level}_T{tile}", {base}, {len(rows)}, "{payload}");\n')
+            starts.append(int(seconds[first]) * 1000)
+        levels.append(starts)
+        level += 1
+
+    return {
+        'format': TILE_FORMAT,
+        'folder': os.path.basename(folder),
+        'series': len(series),
+        'traces': list(range(len(series))),
+        'start': int(seconds[0]) * 1000 if n else 0,
+        'end': int(seconds[-1]) * 1000 if n else 0,
+        'levels': levels,
+    }
+
+
+def detail_script(manifest):
+    """DETAIL_SCRIPT with the manifest filled in, for fig.write_html(post_script=...)."""
+    return DETAIL_SCRIPT.replace('__MANIFEST__', json.dumps(manifest))
@@ -0,0 +1,137 @@
+# visualization/downsample.py
+import numpy as np
+from numba import njit
+
+DOWNSAMPLE_METHODS = ['MINMAX', 'LTTB', 'NONE']
+
+
+def minmax_indices(values, buckets):
+    """
+    Rows that draw the same line as the full series at a width of `buckets` pixels.
+
+    Keeps the first, last, lowest and highest row of every bucket (M4 aggregation), so every
+    pixel column shows the full vertical range of its bars. NaN values are never picked as
+    the minimum or maximum.
+
+    Args:
+        values (np.ndarray): Series values.
+        buckets (int): Number of horizontal buckets (pixels).
+
+    Returns:
+        np.ndarray: Sorted int64 row numbers (all rows when the series is already small enough).
+    """
+    n = len(values)
+    if n <= 4 * buckets:
+        return np.arange(n, dtype=np.int64)
+    size = -(-n // buckets)
+    n_buckets = -(-n // size)
+    pad = n_buckets * size - n
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+
+    low = np.concatenate([np.where(missing, np.inf, values), np.full(pad, np.inf)]).reshape(n_buckets, size)
+    high = np.concatenate([np.where(missing, -np.inf, values), np.full(pad, -np.inf)]).reshape(n_buckets, size)
+    starts = np.arange(n_buckets, dtype=np.int64) * size
+    return np.unique(np.concatenate([
+        starts,
+        np.minimum(starts + size - 1, n - 1),
+        np.minimum(starts + low.argmin(axis=1), n - 1),
+        np.minimum(starts + high.argmax(axis=1), n - 1),
+    ]))
+
+
+@njit(cache=True)
+def _lttb(values, n_out):
+    n = values.shape[0]
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    previous = 0
+
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        # Average of the next bucket (the last point for the last bucket)
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        mean_x = 0.0
+        mean_y = 0.0
+        count = 0
+        for j in range(next_start, next_end):
+            if not np.isnan(values[j]):
+                mean_x += j
+                mean_y += values[j]
+                count += 1
+        if count:
+            mean_x /= count
+            mean_y /= count
+        else:
+            mean_x = (next_start + next_end - 1) / 2
+            mean_y = values[previous]
+
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((previous - mean_x) * (values[j] - values[previous])
+                       - (previous - j) * (mean_y - values[previous]))
+            if area > best_area:  # False for NaN areas, so NaN rows are only kept as a fallback
+                best_area = area
+                best = j
+        selected[i + 1] = best
+        previous = best
+    return selected
+
+
+def lttb_indices(values, buckets):
+    """
+    Rows picked by Largest-Triangle-Three-Buckets, about 2 * buckets points.
+
+    LTTB keeps the visual shape of the series with fewer points than MINMAX, but it can
+    skip short spikes.
+
+    Args:
+        values (np.ndarray): Series values.
+        buckets (int): Number of horizontal buckets (pixels).
+
+    Returns:
+        np.ndarray: Sorted int64 row numbers.
+    """
+    n_out = 2 * buckets
+    if len(values) <= n_out or n_out < 3:
+        return np.arange(len(values), dtype=np.int64)
+    return _lttb(np.asarray(values, dtype=np.float64), n_out)
+
+
+def downsample_indices(series, buckets, method='MINMAX', keep=None):
+    """
+    Rows to plot for several series that share an x-axis.
+
+    The rows selected for each series are merged, so every line is drawn from the same
+    rows, and the `keep` rows (e.g. trade bars) are always included.
+
+    Args:
+        series (list): Value arrays of equal length.
+        buckets (int): Horizontal resolution of the plot in pixels.
+        method (str): MINMAX (first/last/min/max per bucket), LTTB or NONE.
+        keep (np.ndarray, optional): Rows that must be kept.
+
+    Returns:
+        np.ndarray: Sorted int64 row numbers.
+    """
+    n = len(series[0]) if series else 0
+    if method == 'NONE':
+        return np.arange(n, dtype=np.int64)
+    if method == 'MINMAX':
+        select = minmax_indices
+    elif method == 'LTTB':
+        select = lttb_indices
+    else:
+        raise ValueError(f"Downsampling method '{method}' is not supported. Options: {', '.join(DOWNSAMPLE_METHODS)}")
+
+    parts = [select(values, buckets) for values in series]
+    if keep is not None and len(keep):
+        parts.append(np.asarray(keep, dtype=np.int64))
+    return np.unique(np.concatenate(parts)) if parts else np.arange(n, dtype=np.int64)
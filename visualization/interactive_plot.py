@@ -1,26 +1,48 @@
 # visualization/interactive_plot.py
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from strategies.trade_ledger import ACTION_CODES
 from utils.logger import logger
+from visualization.detail_tiles import detail_script, write_detail_tiles
+from visualization.downsample import downsample_indices
 
 
-def interactive_plot_results(df, output_file='trading_results.html'):
+def interactive_plot_results(df, trades=None, output_file='trading_results.html', downsample='MINMAX',
+                             resolution=2000, detail=True):
     """
     Create an interactive plot showing trading results, including all Long and Short transactions.
 
+    Traces use WebGL (Scattergl) so large point counts stay responsive in the browser. With
+    detail enabled the HTML only embeds the downsampled overview, and finer zoom levels are
+    written as sidecar files (see write_detail_tiles) that the page loads when zooming in.
+
     Args:
         df (pd.DataFrame): DataFrame containing trading data.
+        trades (np.ndarray, optional): Trade ledger records (strategy.ledger.records).
         output_file (str): Path to save the plot.
+        downsample (str): MINMAX, LTTB or NONE; trade bars are always kept.
+        resolution (int): Horizontal resolution in pixels the lines are downsampled for.
+        detail (bool): Write the zoom levels next to the HTML file, down to every bar.
     """
     logger.info("📊 Generating interactive trading results plot...")
 
     fig = make_subplots(rows=1, cols=1, shared_xaxes=True, subplot_titles=['Trading Strategy Performance'])
 
+    # Rows to draw, bounded by the resolution instead of the number of bars
+    columns = [col for col in ('close', 'FAST_IND', 'SLOW_IND') if col in df.columns]
+    rows = downsample_indices(
+        [df[col].to_numpy() for col in columns], resolution, downsample,
+        keep=trades['bar'] if trades is not None else None
+    )
+    index = df.index[rows]
+    if len(rows) < len(df):
+        logger.info(f"📉 Downsampled {len(df)} bars to {len(rows)} plotted rows ({downsample}).")
+
     # Plot Close Price
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['close'],
+        go.Scattergl(
+            x=index,
+            y=df['close'].to_numpy()[rows],
             mode='lines',
             name='Close Price',
             line=dict(color='gray', width=1)
@@ -36,9 +58,9 @@ def interactive_plot_results(df, output_file='trading_results.html'):
     for col, params in indicators.items():
         if col in df.columns:
             fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df[col],
+                go.Scattergl(
+                    x=index,
+                    y=df[col].to_numpy()[rows],
                     mode='lines',
                     name=params['name'],
                     line=dict(color=params['color'], dash=params['dash'])
@@ -46,7 +68,7 @@ def interactive_plot_results(df, output_file='trading_results.html'):
             )
 
     # Plot Long and Short Transactions
-    if 'Action' in df.columns:
+    if trades is not None:
         actions = [
             ('GO_LONG', 'triangle-up', 'green', 'Go Long'),
             ('CLOSE_LONG', 'triangle-down', 'lime', 'Close Long'),
@@ -56,12 +78,12 @@ def interactive_plot_results(df, output_file='trading_results.html'):
         ]
 
         for action, symbol, color, label in actions:
-            action_df = df[df['Action'] == action]
-            if not action_df.empty:
+            action_trades = trades[trades['action'] == ACTION_CODES[action]]
+            if len(action_trades):
                 fig.add_trace(
-                    go.Scatter(
-                        x=action_df.index,
-                        y=action_df['close'],
+                    go.Scattergl(
+                        x=df.index[action_trades['bar']],
+                        y=action_trades['price'],
                         mode='markers',
                         name=label,
                         marker=dict(symbol=symbol, color=color, size=10)
@@ -81,6 +103,16 @@ def interactive_plot_results(df, output_file='trading_results.html'):
         margin=dict(l=40, r=40, t=40, b=40)
     )
 
+    # Zoom levels loaded on demand by the page
+    post_script = None
+    if detail and downsample != 'NONE' and len(rows) < len(df):
+        manifest = write_detail_tiles(
+            output_file, df.index, [df[col].to_numpy() for col in columns], resolution, downsample,
+            keep=trades['bar'] if trades is not None else None
+        )
+        post_script = detail_script(manifest)
+        logger.info(f"🔍 Wrote {len(manifest['levels'])} zoom levels to {manifest['folder']}/")
+
     # Save as HTML
-    fig.write_html(output_file)
+    fig.write_html(output_file, post_script=post_script)
     logger.info(f"✅ Interactive plot saved as {output_file}")
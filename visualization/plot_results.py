@@ -1,22 +1,37 @@
 # visualization/plot_results.py
 import matplotlib.pyplot as plt
+from strategies.trade_ledger import ACTION_CODES
 from utils.logger import logger
+from visualization.downsample import downsample_indices
 
 
-def plot_results(df, output_file='trading_results.png'):
+def plot_results(df, trades=None, output_file='trading_results.png', downsample='MINMAX'):
     """
     Plot the trading results, including all Long and Short transactions, for any strategy.
 
     Args:
         df (pd.DataFrame): DataFrame containing trading data.
+        trades (np.ndarray, optional): Trade ledger records (strategy.ledger.records).
         output_file (str): Path to save the plot.
+        downsample (str): MINMAX, LTTB or NONE. The lines are reduced to a few points per pixel
+            column of the figure; trade bars are always kept.
     """
     logger.info("📊 Generating trading results plot...")
 
-    plt.figure(figsize=(16, 8))
-    
+    fig = plt.figure(figsize=(16, 8))
+
+    # Rows to draw, bounded by the figure width in pixels instead of the number of bars
+    columns = [col for col in ('close', 'FAST_IND', 'SLOW_IND') if col in df.columns]
+    rows = downsample_indices(
+        [df[col].to_numpy() for col in columns], int(fig.get_figwidth() * fig.dpi), downsample,
+        keep=trades['bar'] if trades is not None else None
+    )
+    index = df.index[rows]
+    if len(rows) < len(df):
+        logger.info(f"📉 Downsampled {len(df)} bars to {len(rows)} plotted rows ({downsample}).")
+
     # Plot Close Price
-    plt.plot(df.index, df['close'], label='Close Price', linewidth=1, color='gray')
+    plt.plot(index, df['close'].to_numpy()[rows], label='Close Price', linewidth=1, color='gray')
 
     # Plot Indicators (if available)
     indicators = {
@@ -27,8 +42,8 @@ def plot_results(df, output_file='trading_results.png'):
     for col, params in indicators.items():
         if col in df.columns:
             plt.plot(
-                df.index, 
-                df[col], 
+                index,
+                df[col].to_numpy()[rows],
                 label=params['label'], 
                 linestyle=params['style'], 
                 linewidth=1, 
@@ -36,7 +51,7 @@ def plot_results(df, output_file='trading_results.png'):
             )
     
     # Plot Long and Short Transactions
-    if 'Action' in df.columns:
+    if trades is not None:
         actions = [
             ('GO_LONG', '^', 'green', 'Go Long'),
             ('CLOSE_LONG', 'v', 'lime', 'Close Long'),
@@ -46,9 +61,10 @@ def plot_results(df, output_file='trading_results.png'):
         ]
         
         for action, marker, color, label in actions:
+            action_trades = trades[trades['action'] == ACTION_CODES[action]]
             plt.plot(
-                df.index[df['Action'] == action],
-                df['close'][df['Action'] == action],
+                df.index[action_trades['bar']],
+                action_trades['price'],
                 marker,
                 color=color,
                 markersize=8,